@@ -0,0 +1,135 @@
+"""
+차트 이미지 캐시 (내용 주소 기반)
+
+같은 분석으로 같은 차트를 다시 요청하면 렌더링하지 않고 기존 파일을 반환합니다.
+- 키: 차트를 결정하는 입력(데이터, 제목, 차트 타입, 메타데이터 컬럼, 모델, 스타일, dpi, 인코딩)의 SHA-256
+- 저장소: CHART_CACHE_DIR 아래 <키>.<확장자>, 전체 크기가 CHART_CACHE_MAX_MB를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+  (적중 시 파일 수정 시각을 갱신해 LRU 순서로 사용)
+- 같은 키를 동시에 요청하면 렌더링은 한 번만 수행
+"""
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import uuid
+
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", os.path.join(tempfile.gettempdir(), "ai_evaluation_charts"))
+CHART_CACHE_MAX_MB = float(os.getenv("CHART_CACHE_MAX_MB", 200))
+
+
+class ChartCache:
+    """크기 제한 LRU 디스크 캐시"""
+
+    def __init__(self, directory: str = CHART_CACHE_DIR, max_bytes: int = int(CHART_CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        os.makedirs(directory, exist_ok=True)
+        # 이전 실행에서 렌더링 도중 남은 임시 파일 정리
+        for name in os.listdir(directory):
+            if ".tmp-" in name:
+                os.remove(os.path.join(directory, name))
+        self.total_bytes = sum(size for _, _, size in self._entries())
+
+    @staticmethod
+    def make_key(**params) -> str:
+        """차트 입력 -> 캐시 키 (dict 키 순서와 무관)"""
+        encoded = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def path(self, key: str, extension: str = "png") -> str:
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def _entries(self):
+        """(경로, 마지막 사용 시각, 크기) 목록 (작성 중인 임시 파일 제외)"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if ".tmp-" in name:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def get(self, key: str, extension: str = "png") -> Optional[str]:
+        """캐시된 파일 경로 (없으면 None), 적중 시 LRU 순서 갱신"""
+        path = self.path(key, extension)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def _evict(self):
+        """최대 크기를 넘으면 가장 오래 쓰지 않은 파일부터 삭제"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self.total_bytes = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                self.total_bytes -= size
+            except FileNotFoundError:
+                pass
+
+    async def get_or_create(
+        self,
+        key: str,
+        render: Callable[[str], Awaitable[Any]],
+        extension: str = "png"
+    ) -> Tuple[str, bool]:
+        """캐시 조회 후 없으면 render(임시 경로)로 만들어 저장 -> (최종 경로, 캐시 적중 여부)"""
+        cached = self.get(key, extension)
+        if cached:
+            self.hits += 1
+            return cached, True
+        if key in self._inflight:
+            self.hits += 1
+            return await asyncio.shield(self._inflight[key]), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        final_path = self.path(key, extension)
+        # 확장자로 저장 형식을 판단하므로 임시 파일도 같은 확장자 유지
+        temp_path = os.path.join(self.directory, f"{key}.tmp-{uuid.uuid4().hex[:8]}.{extension}")
+        try:
+            await render(temp_path)
+            # 렌더링이 끝난 파일만 캐시 경로에 나타나도록 원자적으로 교체
+            os.replace(temp_path, final_path)
+            self.total_bytes += os.path.getsize(final_path)
+            self._evict()
+            future.set_result(final_path)
+            return final_path, False
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # 기다리는 요청이 없으면 예외를 조회한 것으로 처리 (경고 로그 방지)
+                future.exception()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "files": len(self._entries()),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
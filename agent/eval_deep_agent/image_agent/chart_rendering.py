@@ -0,0 +1,278 @@
+"""
+차트 렌더링 프로세스 풀
+
+pandas/seaborn 플로팅과 savefig는 CPU를 수백 ms씩 사용하므로 MCP 서버의 이벤트 루프에서
+실행하면 그동안 다른 도구 호출이 모두 멈춥니다. 렌더링을 별도 프로세스 풀에서 실행합니다.
+- 워커는 시작 시 Agg 백엔드, matplotlib/seaborn import, 폰트/스타일 설정을 미리 끝내 둠 (첫 차트 지연 제거)
+- 대기 중인 렌더링 수를 제한해 요청이 몰리면 바로 거절 (메모리와 대기 시간이 끝없이 늘지 않도록)
+- 렌더링마다 시간 제한, 시간을 넘긴 렌더링이 실행 중이면 워커를 종료하고 풀을 다시 만듦
+  (대기 수는 워커에서 작업이 실제로 끝날 때 줄어듦)
+- 워커가 비정상 종료되면 풀을 다시 만듦 (유휴 워커가 죽어 제출이 실패하면 새 풀에 한 번 다시 제출)
+- 최초 풀은 서버 스레드가 생기기 전에 fork로 만들고, 서버 실행 중 재생성은 spawn 사용
+  (다중 스레드 프로세스를 fork하면 다른 스레드가 잡고 있던 잠금이 자식에 복제되어 교착될 수 있음)
+- 출력 프로파일: 에이전트가 바로 보는 저해상도 미리보기(팔레트 PNG 또는 WebP)와 보고서용 고해상도 PNG
+
+메인 프로세스는 이 모듈을 import해도 matplotlib을 불러오지 않습니다.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger(__name__)
+
+# 렌더링 워커 수 (기본: CPU 수 - 1, 최대 4)
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", max(1, min(4, (os.cpu_count() or 2) - 1))))
+# 실행 중 + 대기 중인 렌더링 최대 개수
+CHART_MAX_PENDING = int(os.getenv("CHART_MAX_PENDING", CHART_WORKERS * 4))
+# 렌더링 하나의 최대 시간(초)
+CHART_TIMEOUT = float(os.getenv("CHART_TIMEOUT", 60))
+# 서버 실행 중 풀을 다시 만들 때의 워커 시작 방식
+# (워커마다 MCP 서버 스크립트를 다시 import하지만 재생성은 장애 시에만 일어남)
+RESTART_START_METHOD = "spawn"
+
+# 차트 스타일 (render_chart의 모양을 바꾸면 버전을 올려 캐시된 차트를 무효화)
+RENDER_STYLE = "seaborn-v0_8+whitegrid/v1"
+
+# 출력 프로파일별 해상도와 인코딩
+# - png: matplotlib 기본 PNG (트루컬러)
+# - png-palette: 256색 팔레트 PNG (단색 면 위주의 바 차트는 눈에 띄는 손실 없이 수 배 작아짐)
+# - webp: 손실 WebP (Pillow의 WebP 지원 필요)
+CHART_PROFILES = {
+    "preview": {"dpi": 80, "encoding": os.getenv("CHART_PREVIEW_ENCODING", "png-palette")},
+    "report": {"dpi": 300, "encoding": "png"}
+}
+DEFAULT_CHART_PROFILE = "preview"
+
+# 인코딩 -> (파일 확장자, MIME 타입)
+ENCODING_FORMATS = {
+    "png": ("png", "image/png"),
+    "png-palette": ("png", "image/png"),
+    "webp": ("webp", "image/webp")
+}
+
+
+class ChartQueueFull(Exception):
+    """렌더링 대기열이 가득 참"""
+
+
+def init_worker():
+    """워커 프로세스 초기화: Agg 백엔드와 시각화 라이브러리 로드, 폰트/스타일 설정"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import pandas  # noqa: F401 (첫 렌더링에서 import 시간이 들지 않도록 미리 로드)
+
+    # 한글 폰트 설정
+    plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'sans-serif']
+    plt.rcParams['axes.unicode_minus'] = False
+
+    # 시각화 스타일 설정
+    sns.set_style("whitegrid")
+    plt.style.use('seaborn-v0_8')
+
+    # 폰트 캐시와 렌더러 초기화를 미리 수행
+    fig, _ = plt.subplots(figsize=(1, 1))
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def warm_up() -> int:
+    """워커 기동 확인용 빈 작업"""
+    return os.getpid()
+
+
+def render_chart(
+    data: List[Dict[str, Any]],
+    title: str,
+    filepath: str,
+    metadata_columns: Optional[List[str]] = None,
+    models: Optional[List[str]] = None,
+    chart_type: str = "performance",
+    dpi: int = 300,
+    encoding: str = "png"
+) -> str:
+    """워커에서 바 차트를 그려 filepath에 지정한 인코딩으로 저장하고 경로 반환"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import pandas as pd
+
+    # 데이터프레임 생성
+    df = pd.DataFrame(data)
+
+    # 차트 크기 설정
+    if metadata_columns and len(metadata_columns) == 2:
+        fig, ax = plt.subplots(figsize=(14, 8))
+    elif metadata_columns and len(metadata_columns) == 1:
+        fig, ax = plt.subplots(figsize=(12, 6))
+    else:
+        fig, ax = plt.subplots(figsize=(10, 6))
+
+    try:
+        if chart_type == "comparison" and models and len(models) > 1:
+            # 다중 모델 비교 차트
+            if metadata_columns and len(metadata_columns) >= 1:
+                # 메타데이터별 모델 비교
+                x_col = metadata_columns[0]
+                if len(metadata_columns) == 2:
+                    hue_col = metadata_columns[1]
+                    # 2차원 메타데이터: x축은 첫 번째, hue는 두 번째
+                    sns.barplot(data=df, x=x_col, y='avg_match_score', hue=hue_col, ax=ax, palette='viridis')
+                else:
+                    # 1차원 메타데이터: x축은 메타데이터, hue는 모델
+                    sns.barplot(data=df, x=x_col, y='avg_match_score', hue='model', ax=ax, palette='Set2')
+            else:
+                # 메타데이터 없이 모델별 직접 비교
+                sns.barplot(data=df, x='model', y='avg_match_score', ax=ax, palette='Set1')
+
+        elif metadata_columns:
+            # 메타데이터 기반 단일 모델 분석
+            if len(metadata_columns) == 2:
+                # 2차원 메타데이터: 첫 번째를 x축, 두 번째를 hue로
+                x_col, hue_col = metadata_columns[0], metadata_columns[1]
+                sns.barplot(data=df, x=x_col, y='avg_match_score', hue=hue_col, ax=ax, palette='viridis')
+                ax.legend(title=hue_col.title(), bbox_to_anchor=(1.05, 1), loc='upper left')
+            else:
+                # 1차원 메타데이터
+                x_col = metadata_columns[0]
+                sns.barplot(data=df, x=x_col, y='avg_match_score', ax=ax, palette='viridis')
+
+            # x축 레이블 회전 (메타데이터 값이 긴 경우)
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+
+        else:
+            # 단순 성능 바 차트 (메타데이터 없음)
+            if 'model' in df.columns:
+                sns.barplot(data=df, x='model', y='avg_match_score', ax=ax, palette='Set1')
+            else:
+                # 단일 모델인 경우
+                ax.bar(['Score'], [df['avg_match_score'].iloc[0] if len(df) > 0 else 0], color='skyblue')
+
+        # 차트 꾸미기
+        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+        ax.set_ylabel('Average Match Score', fontsize=12)
+        ax.set_xlabel(ax.get_xlabel(), fontsize=12)
+
+        # y축 범위 설정 (0부터 최대값의 110%까지)
+        if len(df) > 0 and 'avg_match_score' in df.columns:
+            max_score = df['avg_match_score'].max()
+            ax.set_ylim(0, max_score * 1.1)
+
+            # 값 표시
+            for container in ax.containers:
+                ax.bar_label(container, fmt='%.3f', fontsize=10)
+
+        # 레이아웃 조정 후 저장
+        fig.tight_layout()
+        if encoding == "png":
+            fig.savefig(filepath, dpi=dpi, bbox_inches='tight', facecolor='white')
+        else:
+            _save_compressed(fig, filepath, dpi, encoding)
+        return filepath
+    finally:
+        plt.close(fig)
+
+
+def _save_compressed(fig, filepath: str, dpi: int, encoding: str):
+    """빠른 무압축에 가까운 PNG로 래스터화한 뒤 Pillow로 팔레트 PNG/WebP 인코딩"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight', facecolor='white', pil_kwargs={"compress_level": 1})
+    buffer.seek(0)
+    image = Image.open(buffer).convert("RGB")
+    if encoding == "png-palette":
+        image.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(filepath, format="PNG", optimize=True)
+    elif encoding == "webp":
+        image.save(filepath, format="WEBP", quality=80, method=4)
+    else:
+        raise ValueError(f"지원하지 않는 차트 인코딩: {encoding}")
+
+
+class ChartRenderPool:
+    """렌더링 프로세스 풀 (대기열 상한 + 시간 제한 + 비정상 종료 시 재생성)"""
+
+    def __init__(self, workers: int = CHART_WORKERS, max_pending: int = CHART_MAX_PENDING, timeout: float = CHART_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.pending = 0
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def _create(self, method: str):
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context(method), initializer=init_worker
+        )
+
+    def start(self):
+        """풀 생성 후 모든 워커를 띄워 초기화까지 마침 (MCP 서버 시작 전에 호출, 블로킹)"""
+        if self.executor is not None:
+            return
+        # 아직 단일 스레드이므로 fork 사용 (spawn은 워커마다 MCP 서버 스크립트 전체를 다시 import함)
+        self._create("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        pids = {future.result() for future in [self.executor.submit(warm_up) for _ in range(self.workers)]}
+        logger.info(f"차트 렌더링 워커 {len(pids)}개 준비 완료")
+
+    async def render(self, **kwargs) -> str:
+        """render_chart를 워커에서 실행 (대기열이 가득 차면 ChartQueueFull, 시간 초과 시 asyncio.TimeoutError)"""
+        if self.pending >= self.max_pending:
+            raise ChartQueueFull(f"차트 렌더링 대기열이 가득 찼습니다 ({self.max_pending}개)")
+        future, executor = self._submit(kwargs)
+        # 시간 초과로 응답을 포기해도 워커에서 작업이 끝날 때까지는 대기 수에 포함
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._finished))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            # 시작 전 작업은 wait_for가 취소함, 이미 실행 중이면 취소되지 않으므로 워커를 종료
+            if not future.done():
+                logger.warning(f"차트 렌더링이 {self.timeout:.0f}초를 넘어 워커를 종료하고 풀을 다시 만듭니다")
+                self._terminate(executor)
+            raise
+        except BrokenProcessPool:
+            logger.warning("차트 렌더링 워커가 비정상 종료되어 다음 요청에서 풀을 다시 만듭니다")
+            self._retire(executor)
+            raise
+
+    def _submit(self, kwargs: Dict[str, Any]):
+        """현재 풀에 제출 (깨진 풀이면 분리하고 새 풀에 한 번 다시 제출)"""
+        for attempt in range(2):
+            if self.executor is None:
+                # 예열하지 않은 경우(또는 재생성 후)에는 첫 작업과 함께 워커가 초기화됨
+                self._create(RESTART_START_METHOD)
+            executor = self.executor
+            try:
+                return executor.submit(render_chart, **kwargs), executor
+            except BrokenProcessPool:
+                # 유휴 워커가 죽으면 실행 중인 작업이 없어도 풀이 깨진 상태로 남음
+                self._retire(executor)
+                if attempt:
+                    raise
+                logger.warning("차트 렌더링 워커가 비정상 종료되어 풀을 다시 만듭니다")
+
+    def _finished(self):
+        self.pending -= 1
+
+    def _retire(self, executor: ProcessPoolExecutor):
+        """현재 풀이면 다음 요청에서 새로 만들도록 분리 (이미 교체된 풀이면 그대로 둠)"""
+        if self.executor is executor:
+            self.executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _terminate(self, executor: ProcessPoolExecutor):
+        """워커 프로세스를 강제 종료 (같은 풀에서 실행 중이던 다른 렌더링은 BrokenProcessPool로 실패)"""
+        # ProcessPoolExecutor에는 실행 중인 작업을 멈추는 공개 API가 없음 (Python 3.14의 terminate_workers)
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        self._retire(executor)
+        for process in processes:
+            process.terminate()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self._retire(self.executor)
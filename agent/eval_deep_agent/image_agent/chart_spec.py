@@ -0,0 +1,126 @@
+"""
+선언형 차트 사양 (Vega-Lite)
+
+대시보드처럼 클라이언트가 직접 차트를 그리는 경우에는 래스터 이미지가 필요 없습니다.
+render_chart와 같은 규칙(차트 타입/메타데이터 컬럼 수에 따른 x축, 색 구분)으로 Vega-Lite v5 JSON 사양을 만들어
+렌더링을 클라이언트에 맡깁니다. matplotlib/pandas를 사용하지 않으므로 렌더링 워커 없이 이벤트 루프에서 바로 실행합니다.
+- 데이터는 차트에 쓰는 필드만 사양 안에 인라인으로 포함
+- 같은 x(와 색) 값에 행이 여러 개면 seaborn barplot처럼 평균을 막대 높이로 사용
+"""
+from typing import List, Dict, Any, Optional
+import json
+
+# 차트 프로파일 이름 (chart_rendering.CHART_PROFILES의 래스터 프로파일과 함께 선택)
+SPEC_PROFILE = "vega-lite"
+VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+SCORE_FIELD = "avg_match_score"
+
+# render_chart에서 쓰는 seaborn 팔레트에 대응하는 Vega 색 구성표
+PALETTE_SCHEMES = {"viridis": "viridis", "Set1": "set1", "Set2": "set2"}
+
+
+def _layout(
+    columns: List[str],
+    metadata_columns: Optional[List[str]],
+    models: Optional[List[str]],
+    chart_type: str
+) -> Dict[str, Any]:
+    """render_chart와 같은 규칙으로 x축/색 구분 필드와 팔레트 결정"""
+    metadata_columns = metadata_columns or []
+    if chart_type == "comparison" and models and len(models) > 1:
+        if len(metadata_columns) == 2:
+            return {"x": metadata_columns[0], "color": metadata_columns[1], "palette": "viridis"}
+        if metadata_columns:
+            return {"x": metadata_columns[0], "color": "model", "palette": "Set2"}
+        return {"x": "model", "color": None, "palette": "Set1"}
+    if metadata_columns:
+        return {
+            "x": metadata_columns[0],
+            "color": metadata_columns[1] if len(metadata_columns) == 2 else None,
+            "palette": "viridis",
+            "rotate_labels": True
+        }
+    if "model" in columns:
+        return {"x": "model", "color": None, "palette": "Set1"}
+    # 단일 모델인 경우 (render_chart의 'Score' 막대 하나)
+    return {"x": None, "color": None, "palette": None}
+
+
+def build_vega_lite_spec(
+    data: List[Dict[str, Any]],
+    title: str,
+    metadata_columns: Optional[List[str]] = None,
+    models: Optional[List[str]] = None,
+    chart_type: str = "performance"
+) -> Dict[str, Any]:
+    """분석 데이터 -> Vega-Lite 바 차트 사양 (막대 위에 소수점 3자리 값 표시)"""
+    columns = sorted({key for row in data for key in row})
+    layout = _layout(columns, metadata_columns, models, chart_type)
+
+    if layout["x"] is None:
+        fields = [SCORE_FIELD]
+        values = [{SCORE_FIELD: data[0].get(SCORE_FIELD, 0)}] if data else []
+        x_encoding: Dict[str, Any] = {"datum": "Score", "type": "nominal", "title": None}
+    else:
+        fields = [field for field in (layout["x"], layout["color"], SCORE_FIELD) if field]
+        values = [{field: row.get(field) for field in fields} for row in data]
+        # 막대 순서는 데이터에 처음 나온 순서 유지 (seaborn과 동일)
+        x_encoding = {"field": layout["x"], "type": "nominal", "sort": None, "title": layout["x"]}
+        if layout.get("rotate_labels"):
+            x_encoding["axis"] = {"labelAngle": -45}
+
+    scores = [row[SCORE_FIELD] for row in values if row.get(SCORE_FIELD) is not None]
+    y_encoding: Dict[str, Any] = {
+        "field": SCORE_FIELD,
+        "type": "quantitative",
+        "aggregate": "mean",
+        "title": "Average Match Score"
+    }
+    if scores:
+        y_encoding["scale"] = {"domain": [0, max(scores) * 1.1]}
+
+    encoding: Dict[str, Any] = {"x": x_encoding, "y": y_encoding}
+    if layout["color"]:
+        encoding["color"] = {
+            "field": layout["color"],
+            "type": "nominal",
+            "sort": None,
+            "scale": {"scheme": PALETTE_SCHEMES[layout["palette"]]},
+            "title": layout["color"].title()
+        }
+        encoding["xOffset"] = {"field": layout["color"], "sort": None}
+    elif layout["palette"]:
+        encoding["color"] = {
+            "field": layout["x"],
+            "type": "nominal",
+            "sort": None,
+            "scale": {"scheme": PALETTE_SCHEMES[layout["palette"]]},
+            "legend": None
+        }
+    else:
+        encoding["color"] = {"value": "skyblue"}
+
+    return {
+        "$schema": VEGA_LITE_SCHEMA,
+        "title": {"text": title, "fontSize": 16},
+        "width": {"step": 40} if layout["color"] else {"step": 60},
+        "height": 360,
+        "data": {"values": values},
+        "encoding": encoding,
+        "layer": [
+            {"mark": {"type": "bar"}},
+            {
+                "mark": {"type": "text", "dy": -6, "fontSize": 10},
+                "encoding": {
+                    "text": {"field": SCORE_FIELD, "aggregate": "mean", "type": "quantitative", "format": ".3f"},
+                    "color": {"value": "black"}
+                }
+            }
+        ]
+    }
+
+
+def dump_spec(spec: Dict[str, Any]) -> str:
+    """사양 -> 공백 없는 JSON 문자열"""
+    return json.dumps(spec, ensure_ascii=False, separators=(",", ":"), default=str)
@@ -7,20 +7,27 @@ FastAPI 백엔드와 연동하여 AI 모델들의 벤치마크 성능을 분석
 
 import asyncio
 import os
-import tempfile
-from typing import List, Dict, Any, Optional, Union
-import httpx
+import sys
+from typing import List, Dict, Any, Optional, Union, Tuple
 from fastmcp import FastMCP
+from fastmcp.utilities.types import Image
 
-# 시각화 라이브러리
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import numpy as np
+# 공용 HTTP 클라이언트와 출력 형식 변환 (backend/mcp-server/eval_client.py, rendering.py)
+MCP_SERVER_DIR = os.getenv(
+    "MCP_SERVER_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "backend", "mcp-server")
+)
+sys.path.append(os.path.abspath(MCP_SERVER_DIR))
+from eval_client import ResilientClient
+# 도구 출력 형식 (압축 형식은 짧은 키와 고정 소수점 자릿수 사용: m=모델, b=벤치마크, s=점수, n=문항 수)
+from rendering import FORMAT_MARKDOWN, CompactTable, check_output_format, render_compact
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'sans-serif']
-plt.rcParams['axes.unicode_minus'] = False
+# 시각화 (matplotlib/seaborn은 렌더링 워커 프로세스에서만 로드)
+from chart_cache import ChartCache
+from chart_spec import SPEC_PROFILE, build_vega_lite_spec, dump_spec
+from chart_rendering import (
+    CHART_PROFILES, DEFAULT_CHART_PROFILE, ENCODING_FORMATS, RENDER_STYLE, ChartQueueFull, ChartRenderPool
+)
 
 # MCP 서버 초기화
 mcp = FastMCP("ai-evaluation-server")
@@ -33,7 +40,7 @@ class AIEvaluationClient:
     
     def __init__(self, base_url: str = BACKEND_URL):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+        self.client = ResilientClient(self.base_url)
     
     async def get_models(self) -> List[str]:
         """사용 가능한 모델 목록 조회"""
@@ -66,7 +73,7 @@ class AIEvaluationClient:
             "metadata_level": metadata_level or []
         }
         
-        response = await self.client.post("/analysis", json=payload)
+        response = await self.client.post("/analysis", json=payload, idempotent=True, hedge=True)
         response.raise_for_status()
         return response.json()
     
@@ -79,16 +86,41 @@ class AIEvaluationClient:
 # 클라이언트 인스턴스
 client = AIEvaluationClient()
 
+# 차트 렌더링 프로세스 풀과 렌더링 결과 캐시
+chart_pool = ChartRenderPool()
+chart_cache = ChartCache()
+
+def check_chart_profile(chart_profile: str) -> Optional[str]:
+    """지원하지 않는 차트 프로파일이면 오류 메시지"""
+    if chart_profile in CHART_PROFILES or chart_profile == SPEC_PROFILE:
+        return None
+    return f"오류: chart_profile은 {', '.join([*CHART_PROFILES, SPEC_PROFILE])} 중 하나여야 합니다."
+
+def with_chart(text: str, chart_image: Optional[Union[str, Image]]) -> Union[str, List[Union[str, Image]]]:
+    """차트 이미지(또는 Vega-Lite 사양)가 있으면 텍스트 뒤에 별도 콘텐츠로 덧붙여 반환"""
+    if chart_image is None:
+        return text
+    return [text, chart_image]
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
 async def generate_visualization(
     data: List[Dict], 
     title: str,
     metadata_columns: Optional[List[str]] = None,
     models: Optional[List[str]] = None,
     benchmark_name: Optional[str] = None,
-    chart_type: str = "performance"
-) -> str:
+    chart_type: str = "performance",
+    profile: str = DEFAULT_CHART_PROFILE
+) -> Tuple[str, Optional[Union[str, Image]]]:
     """
     데이터를 바탕으로 바 차트 시각화를 생성합니다.
+    렌더링은 프로세스 풀에서 실행되므로 그동안 다른 도구 호출이 멈추지 않으며,
+    같은 입력의 차트는 다시 그리지 않고 캐시된 파일을 반환합니다.
+    이미지 바이트는 MCP 이미지 콘텐츠로 함께 반환되어 에이전트가 차트를 직접 볼 수 있습니다.
+    "vega-lite" 프로파일은 래스터 렌더링 없이 Vega-Lite JSON 사양만 만들어 반환합니다 (클라이언트에서 렌더링).
     
     Args:
         data: 분석 결과 데이터
@@ -97,99 +129,54 @@ async def generate_visualization(
         models: 모델 리스트 (다중 모델 비교용)
         benchmark_name: 벤치마크 이름
         chart_type: 차트 타입 ("performance", "comparison", "metadata")
+        profile: 출력 프로파일 ("preview": 저해상도 압축 이미지, "report": 300dpi PNG, "vega-lite": JSON 사양)
         
     Returns:
-        생성된 이미지 파일의 경로
+        (결과 메시지와 파일 경로, 이미지 콘텐츠 또는 Vega-Lite 사양 문자열, 실패 시 None)
     """
     try:
         if not data:
-            return "데이터가 없어 차트를 생성할 수 없습니다."
+            return "데이터가 없어 차트를 생성할 수 없습니다.", None
         
-        # 시각화 스타일 설정
-        sns.set_style("whitegrid")
-        plt.style.use('seaborn-v0_8')
+        if profile == SPEC_PROFILE:
+            # 사양 생성은 수 ms 이내이므로 렌더링 워커와 캐시를 거치지 않음
+            spec = dump_spec(build_vega_lite_spec(data, title, metadata_columns, models, chart_type))
+            return f"차트 사양이 생성되었습니다 [{SPEC_PROFILE}, {len(spec) / 1024:.1f}KB]", spec
         
-        # 데이터프레임 생성
-        df = pd.DataFrame(data)
+        settings = CHART_PROFILES[profile]
+        extension, mime_type = ENCODING_FORMATS[settings["encoding"]]
         
-        # 차트 크기 설정
-        if metadata_columns and len(metadata_columns) == 2:
-            fig, ax = plt.subplots(figsize=(14, 8))
-        elif metadata_columns and len(metadata_columns) == 1:
-            fig, ax = plt.subplots(figsize=(12, 6))
-        else:
-            fig, ax = plt.subplots(figsize=(10, 6))
-        
-        if chart_type == "comparison" and models and len(models) > 1:
-            # 다중 모델 비교 차트
-            if metadata_columns and len(metadata_columns) >= 1:
-                # 메타데이터별 모델 비교
-                x_col = metadata_columns[0]
-                if len(metadata_columns) == 2:
-                    hue_col = metadata_columns[1]
-                    # 2차원 메타데이터: x축은 첫 번째, hue는 두 번째
-                    sns.barplot(data=df, x=x_col, y='avg_match_score', hue=hue_col, ax=ax, palette='viridis')
-                else:
-                    # 1차원 메타데이터: x축은 메타데이터, hue는 모델
-                    sns.barplot(data=df, x=x_col, y='avg_match_score', hue='model', ax=ax, palette='Set2')
-            else:
-                # 메타데이터 없이 모델별 직접 비교
-                sns.barplot(data=df, x='model', y='avg_match_score', ax=ax, palette='Set1')
-                
-        elif metadata_columns:
-            # 메타데이터 기반 단일 모델 분석
-            if len(metadata_columns) == 2:
-                # 2차원 메타데이터: 첫 번째를 x축, 두 번째를 hue로
-                x_col, hue_col = metadata_columns[0], metadata_columns[1]
-                sns.barplot(data=df, x=x_col, y='avg_match_score', hue=hue_col, ax=ax, palette='viridis')
-                ax.legend(title=hue_col.title(), bbox_to_anchor=(1.05, 1), loc='upper left')
-            else:
-                # 1차원 메타데이터
-                x_col = metadata_columns[0]
-                sns.barplot(data=df, x=x_col, y='avg_match_score', ax=ax, palette='viridis')
-                
-            # x축 레이블 회전 (메타데이터 값이 긴 경우)
-            plt.xticks(rotation=45, ha='right')
-            
-        else:
-            # 단순 성능 바 차트 (메타데이터 없음)
-            if 'model' in df.columns:
-                sns.barplot(data=df, x='model', y='avg_match_score', ax=ax, palette='Set1')
-            else:
-                # 단일 모델인 경우
-                ax.bar(['Score'], [df['avg_match_score'].iloc[0] if len(df) > 0 else 0], color='skyblue')
-        
-        # 차트 꾸미기
-        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Average Match Score', fontsize=12)
-        ax.set_xlabel(ax.get_xlabel(), fontsize=12)
-        
-        # y축 범위 설정 (0부터 최대값의 110%까지)
-        if len(df) > 0 and 'avg_match_score' in df.columns:
-            max_score = df['avg_match_score'].max()
-            ax.set_ylim(0, max_score * 1.1)
-            
-            # 값 표시
-            for container in ax.containers:
-                ax.bar_label(container, fmt='%.3f', fontsize=10)
-        
-        # 레이아웃 조정
-        plt.tight_layout()
+        # 차트 모양을 결정하는 입력 전체로 캐시 키 생성
+        key = chart_cache.make_key(
+            data=data, title=title, chart_type=chart_type, metadata_columns=metadata_columns,
+            models=models, style=RENDER_STYLE, dpi=settings["dpi"], encoding=settings["encoding"]
+        )
         
-        # 임시 파일로 저장
-        temp_dir = tempfile.gettempdir()
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"ai_evaluation_chart_{timestamp}.png"
-        filepath = os.path.join(temp_dir, filename)
+        async def render(filepath: str):
+            await chart_pool.render(
+                data=data,
+                title=title,
+                filepath=filepath,
+                metadata_columns=metadata_columns,
+                models=models,
+                chart_type=chart_type,
+                dpi=settings["dpi"],
+                encoding=settings["encoding"]
+            )
         
-        plt.savefig(filepath, dpi=300, bbox_inches='tight', facecolor='white')
-        plt.close()
+        filepath, cached = await chart_cache.get_or_create(key, render, extension=extension)
+        payload = await asyncio.to_thread(_read_bytes, filepath)
+        image = Image(data=payload, format=extension)
         
-        return f"차트가 생성되었습니다: {filepath}"
+        message = f"차트가 생성되었습니다{' (캐시)' if cached else ''} [{profile}, {len(payload) / 1024:.0f}KB]: {filepath}"
+        return message, image
         
+    except ChartQueueFull as e:
+        return f"차트 생성 실패: {str(e)}. 잠시 후 다시 시도하세요.", None
+    except asyncio.TimeoutError:
+        return f"차트 생성 실패: 렌더링 시간 초과 ({chart_pool.timeout:.0f}초)", None
     except Exception as e:
-        plt.close()  # 오류 시에도 figure 정리
-        return f"차트 생성 실패: {str(e)}"
+        return f"차트 생성 실패: {str(e)}", None
 
 @mcp.tool()
 async def get_available_models() -> str:
@@ -244,8 +231,10 @@ async def analyze_single_model(
     model: str,
     benchmarks: List[str],
     metadata_level: Optional[List[str]] = None,
-    generate_chart: bool = False
-) -> str:
+    generate_chart: bool = False,
+    output_format: str = FORMAT_MARKDOWN,
+    chart_profile: str = DEFAULT_CHART_PROFILE
+) -> Union[str, List[Union[str, Image]]]:
     """
     단일 모델에 대해 하나 이상의 벤치마크에서 성능을 분석합니다.
     
@@ -254,6 +243,9 @@ async def analyze_single_model(
         benchmarks: 분석할 벤치마크 리스트 (예: ["mmlu-redux", "hellaswag"])
         metadata_level: 분류 기준 리스트 (예: ["category", "subject"])
         generate_chart: 차트 생성 여부 (기본값: False)
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        chart_profile: 차트 프로파일 - "preview"(기본, 저해상도 압축 이미지), "report"(300dpi PNG, 보고서용),
+            "vega-lite"(이미지 대신 Vega-Lite JSON 사양, 대시보드 등 클라이언트 렌더링용)
         
     Returns:
         모델의 벤치마크별 성능 분석 결과를 포맷된 문자열로 반환
@@ -261,6 +253,12 @@ async def analyze_single_model(
     try:
         if not benchmarks:
             return "오류: 최소 하나의 벤치마크를 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        profile_error = check_chart_profile(chart_profile)
+        if profile_error:
+            return profile_error
         
         # 성능 분석 요청
         results = await client.analyze_performance(
@@ -283,6 +281,8 @@ async def analyze_single_model(
         
         # 차트 생성을 위한 데이터 수집
         chart_data = []
+        # 압축 형식 출력용 표
+        compact_tables = []
         
         # 각 벤치마크별 결과 처리
         for benchmark_result in results["benchmark_results"]:
@@ -299,6 +299,10 @@ async def analyze_single_model(
                     result = benchmark_data[0]
                     output.append(f"전체 평균 점수: {result['avg_match_score']:.4f}")
                     output.append(f"총 문제 수: {result['total_questions']:,}개")
+                    compact_tables.append(CompactTable(
+                        name=benchmark_name, columns=["s", "n"],
+                        rows=[[result['avg_match_score'], result['total_questions']]]
+                    ))
                     
                     # 차트 데이터 추가
                     chart_data.append({
@@ -319,6 +323,13 @@ async def analyze_single_model(
                 if benchmark_data:
                     # 성능순 정렬
                     sorted_results = sorted(benchmark_data, key=lambda x: x['avg_match_score'], reverse=True)
+                    compact_tables.append(CompactTable(
+                        name=benchmark_name, columns=metadata_level + ["s", "n"],
+                        rows=[
+                            [result.get(col) for col in metadata_level] + [result['avg_match_score'], result['total_questions']]
+                            for result in sorted_results
+                        ]
+                    ))
                     
                     # 마크다운 테이블 헤더 생성
                     headers = []
@@ -367,21 +378,30 @@ async def analyze_single_model(
         output.append(f"  분석 유형: {summary['analysis_type']}")
         
         # 차트 생성
+        chart_result = None
+        chart_image = None
         if generate_chart and chart_data:
             chart_title = f"{model} - Performance Analysis"
             if len(benchmarks) == 1:
                 chart_title += f" ({benchmarks[0]})"
             
-            chart_result = await generate_visualization(
+            chart_result, chart_image = await generate_visualization(
                 data=chart_data,
                 title=chart_title,
                 metadata_columns=metadata_level[:2] if metadata_level else None,  # 최대 2개까지
                 models=[model],
-                chart_type="performance"
+                chart_type="performance",
+                profile=chart_profile
             )
             output.append(f"\n{chart_result}")
         
-        return "\n".join(output)
+        if output_format != FORMAT_MARKDOWN:
+            return with_chart(
+                render_compact({"m": model, "lv": metadata_level, "chart": chart_result}, compact_tables, output_format),
+                chart_image
+            )
+        
+        return with_chart("\n".join(output), chart_image)
         
     except Exception as e:
         return f"성능 분석 실패: {str(e)}"
@@ -391,8 +411,10 @@ async def analyze_single_model_with_metadata(
     model: str,
     benchmark: str,
     metadata_columns: List[str],
-    generate_chart: bool = False
-) -> str:
+    generate_chart: bool = False,
+    output_format: str = FORMAT_MARKDOWN,
+    chart_profile: str = DEFAULT_CHART_PROFILE
+) -> Union[str, List[Union[str, Image]]]:
     """
     단일 모델에 대해 특정 벤치마크에서 메타데이터별 세부 성능을 분석합니다.
     
@@ -401,6 +423,9 @@ async def analyze_single_model_with_metadata(
         benchmark: 분석할 벤치마크 (단일)
         metadata_columns: 세부 분석할 메타데이터 컬럼들
         generate_chart: 차트 생성 여부 (기본값: False)
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        chart_profile: 차트 프로파일 - "preview"(기본, 저해상도 압축 이미지), "report"(300dpi PNG, 보고서용),
+            "vega-lite"(이미지 대신 Vega-Lite JSON 사양, 대시보드 등 클라이언트 렌더링용)
         
     Returns:
         메타데이터별 세부 성능 분석 결과
@@ -408,6 +433,12 @@ async def analyze_single_model_with_metadata(
     try:
         if not metadata_columns:
             return "오류: 최소 하나의 메타데이터 컬럼을 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        profile_error = check_chart_profile(chart_profile)
+        if profile_error:
+            return profile_error
         
         results = await client.analyze_performance(
             models=[model],
@@ -537,19 +568,37 @@ async def analyze_single_model_with_metadata(
             output.append("데이터 없음")
         
         # 차트 생성
+        chart_result = None
+        chart_image = None
         if generate_chart and chart_data:
             chart_title = f"{model} - {benchmark} Metadata Analysis"
-            chart_result = await generate_visualization(
+            chart_result, chart_image = await generate_visualization(
                 data=chart_data,
                 title=chart_title,
                 metadata_columns=metadata_columns[:2],  # 최대 2개까지
                 models=[model],
                 benchmark_name=benchmark,
-                chart_type="metadata"
+                chart_type="metadata",
+                profile=chart_profile
             )
             output.append(f"\n{chart_result}")
         
-        return "\n".join(output)
+        if output_format != FORMAT_MARKDOWN:
+            meta = {
+                "m": model, "b": benchmark, "lv": metadata_columns, "g": benchmark_summary['total_groups'],
+                "avg": benchmark_summary['avg_score'], "min": benchmark_summary['min_score'],
+                "max": benchmark_summary['max_score'], "n": benchmark_summary['total_questions'], "chart": chart_result
+            }
+            table = CompactTable(
+                columns=metadata_columns + ["s", "n"],
+                rows=[
+                    [result.get(col) for col in metadata_columns] + [result['avg_match_score'], result['total_questions']]
+                    for result in sorted_results
+                ]
+            )
+            return with_chart(render_compact(meta, [table], output_format), chart_image)
+        
+        return with_chart("\n".join(output), chart_image)
         
     except Exception as e:
         return f"메타데이터별 분석 실패: {str(e)}"
@@ -560,8 +609,10 @@ async def compare_models_multi_benchmark(
     models: List[str],
     benchmarks: List[str],
     metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None,
-    generate_chart: bool = False
-) -> str:
+    generate_chart: bool = False,
+    output_format: str = FORMAT_MARKDOWN,
+    chart_profile: str = DEFAULT_CHART_PROFILE
+) -> Union[str, List[Union[str, Image]]]:
     """
     여러 모델을 여러 벤치마크에서 비교 분석합니다.
     
@@ -570,6 +621,9 @@ async def compare_models_multi_benchmark(
         benchmarks: 분석할 벤치마크들의 리스트  
         metadata_level: 벤치마크별 메타데이터 설정 (Dict) 또는 공통 메타데이터 (List)
         generate_chart: 차트 생성 여부 (기본값: False)
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        chart_profile: 차트 프로파일 - "preview"(기본, 저해상도 압축 이미지), "report"(300dpi PNG, 보고서용),
+            "vega-lite"(이미지 대신 Vega-Lite JSON 사양, 대시보드 등 클라이언트 렌더링용)
         
     Returns:
         다중 벤치마크에서의 모델 비교 결과
@@ -579,6 +633,12 @@ async def compare_models_multi_benchmark(
             return "오류: 최소 하나의 모델을 지정해야 합니다."
         if not benchmarks:
             return "오류: 최소 하나의 벤치마크를 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        profile_error = check_chart_profile(chart_profile)
+        if profile_error:
+            return profile_error
         
         results = await client.analyze_performance(
             models=models,
@@ -597,6 +657,8 @@ async def compare_models_multi_benchmark(
         # 전체 벤치마크 요약을 위한 데이터 저장
         benchmark_summaries = {}
         chart_data = []
+        # 압축 형식 출력용 표
+        compact_tables = []
         
         for benchmark_result in results["benchmark_results"]:
             benchmark_name = benchmark_result["benchmark"]
@@ -626,6 +688,10 @@ async def compare_models_multi_benchmark(
                     
                     # 점수순으로 정렬
                     sorted_models = sorted(model_scores.items(), key=lambda x: x[1]['score'], reverse=True)
+                    compact_tables.append(CompactTable(
+                        name=benchmark_name, columns=["model", "s", "n"],
+                        rows=[[model, data['score'], data['questions']] for model, data in sorted_models]
+                    ))
                     for model, data in sorted_models:
                         output.append(f"| {model} | {data['score']:.4f} | {data['questions']:,} |")
                         
@@ -709,6 +775,16 @@ async def compare_models_multi_benchmark(
                                 return sum(scores) / len(scores) if scores else 0
                             
                             sorted_pivot_data = sorted(pivot_data.items(), key=get_avg_score, reverse=True)
+                            compact_tables.append(CompactTable(
+                                name=benchmark_name, columns=list(current_metadata_cols) + list(models),
+                                rows=[
+                                    list(metadata_key) + [
+                                        model_data[model]['score'] if model in model_data else None
+                                        for model in models
+                                    ]
+                                    for metadata_key, model_data in sorted_pivot_data
+                                ]
+                            ))
                             
                             # 데이터 행 생성
                             for metadata_key, model_data in sorted_pivot_data:
@@ -776,6 +852,13 @@ async def compare_models_multi_benchmark(
                     # 테이블 헤더 생성
                     headers = ["Rank", "Model", "Average"]
                     headers.extend(benchmarks)
+                    compact_tables.append(CompactTable(
+                        name="overall", columns=["model", "avg"] + list(benchmarks),
+                        rows=[
+                            [model, avg_score] + [model_detailed_scores[model].get(name) for name in benchmarks]
+                            for model, avg_score in sorted_models
+                        ]
+                    ))
                     
                     output.append("| " + " | ".join(headers) + " |")
                     output.append("|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|")
@@ -804,6 +887,8 @@ async def compare_models_multi_benchmark(
         output.append(f"  총 분석 그룹: {summary['total_result_groups']}개")
         
         # 차트 생성
+        chart_result = None
+        chart_image = None
         if generate_chart and chart_data:
             chart_title = f"Multi-Model Multi-Benchmark Comparison"
             
@@ -817,16 +902,23 @@ async def compare_models_multi_benchmark(
             else:
                 metadata_cols = None
             
-            chart_result = await generate_visualization(
+            chart_result, chart_image = await generate_visualization(
                 data=chart_data,
                 title=chart_title,
                 metadata_columns=metadata_cols,
                 models=models,
-                chart_type="comparison"
+                chart_type="comparison",
+                profile=chart_profile
             )
             output.append(f"\n{chart_result}")
         
-        return "\n".join(output)
+        if output_format != FORMAT_MARKDOWN:
+            meta = {"m": models, "b": benchmarks, "chart": chart_result}
+            if isinstance(metadata_level, list):
+                meta["lv"] = metadata_level
+            return with_chart(render_compact(meta, compact_tables, output_format), chart_image)
+        
+        return with_chart("\n".join(output), chart_image)
         
     except Exception as e:
         return f"다중 벤치마크 비교 분석 실패: {str(e)}"
@@ -874,5 +966,10 @@ async def get_data_overview() -> str:
         return f"데이터 현황 조회 실패: {str(e)}"
 
 if __name__ == "__main__":
-    # MCP 서버 실행
-    mcp.run()
\ No newline at end of file
+    # 차트 렌더링 워커 예열 (서버가 스레드를 만들기 전에 fork)
+    chart_pool.start()
+    try:
+        # MCP 서버 실행
+        mcp.run()
+    finally:
+        chart_pool.shutdown()
\ No newline at end of file
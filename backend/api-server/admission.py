@@ -0,0 +1,203 @@
+"""
+요청 수용(admission) 제어 모듈
+
+DB 연결 풀 크기만큼만 분석 요청을 동시에 실행하고, 나머지는 우선순위 대기열에서
+제한된 시간 동안 기다리게 합니다. 대기열이 가득 차거나 대기 시간이 지나면 429와
+Retry-After로 거절해 병렬 에이전트의 요청 폭주가 500 오류 대신 점진적으로 느려지도록 합니다.
+
+요청 비용은 벤치마크 수 x 모델 수 x 그룹 수(메타데이터 조합의 카디널리티)로 추정하며,
+비용이 작은 요청이 먼저 실행되고 무거운 요청은 동시 실행 수가 따로 제한됩니다.
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
+import itertools
+import math
+import threading
+import time
+
+from profiling import record_phase
+
+# 우선순위 (작을수록 먼저 실행)
+PRIORITY_LIGHT = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HEAVY = 2
+
+# 비용 구간 경계
+LIGHT_COST_LIMIT = 200
+NORMAL_COST_LIMIT = 5000
+
+# 관측값이 없을 때 사용하는 메타데이터 컬럼별 고유값 수 추정치
+DEFAULT_CARDINALITY: Dict[str, int] = {
+    'difficulty': 5, 'category': 4, 'level': 5, 'proof_required': 2, 'interdisciplinary': 2,
+    'is_refusal': 2, 'resps_extracted': 2, 'response_length_bucket': 5, 'consensus_level': 5,
+    'complexity': 5, 'business_category': 10, 'subject': 60, 'problem_number': 15
+}
+DEFAULT_COLUMN_CARDINALITY = 10
+
+
+class AdmissionRejected(Exception):
+    """과부하로 요청 거절 (429)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class GroupCardinalityEstimator:
+    """(벤치마크, 메타데이터 조합)별 그룹 수 추정 (분석 결과로 관측값 갱신)"""
+
+    def __init__(self):
+        self._observed: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, benchmark: str, columns: List[str]) -> int:
+        key = (benchmark, tuple(sorted(columns)))
+        with self._lock:
+            observed = self._observed.get(key)
+        if observed is not None:
+            return max(observed, 1)
+        return math.prod(DEFAULT_CARDINALITY.get(col, DEFAULT_COLUMN_CARDINALITY) for col in columns)
+
+    def record(self, benchmark: str, columns: List[str], group_count: int):
+        with self._lock:
+            self._observed[(benchmark, tuple(sorted(columns)))] = group_count
+
+
+cardinality_estimator = GroupCardinalityEstimator()
+
+
+def estimate_analysis_cost(benchmark_columns: Dict[str, List[str]], model_count: int) -> int:
+    """분석 요청 비용: 벤치마크별 (모델 수 x 예상 그룹 수)의 합"""
+    return sum(
+        model_count * cardinality_estimator.estimate(benchmark, columns)
+        for benchmark, columns in benchmark_columns.items()
+    )
+
+
+def classify_cost(cost: int) -> int:
+    """비용 -> 우선순위"""
+    if cost <= LIGHT_COST_LIMIT:
+        return PRIORITY_LIGHT
+    if cost <= NORMAL_COST_LIMIT:
+        return PRIORITY_NORMAL
+    return PRIORITY_HEAVY
+
+
+class AdmissionController:
+    """동시 실행 슬롯 + 우선순위 대기열 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, name: str, slots: int, max_heavy: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.slots = slots
+        self.max_heavy = max(1, min(max_heavy, slots))
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self.active = 0
+        self.active_heavy = 0
+        self._waiters: List[List[Any]] = []  # [priority, seq, future]
+        self._seq = itertools.count()
+
+        # 통계
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.avg_service_time = 1.0
+
+    def _can_run(self, priority: int) -> bool:
+        if self.active >= self.slots:
+            return False
+        return priority < PRIORITY_HEAVY or self.active_heavy < self.max_heavy
+
+    def _grant(self, priority: int):
+        self.active += 1
+        if priority == PRIORITY_HEAVY:
+            self.active_heavy += 1
+
+    def _dispatch(self):
+        """빈 슬롯을 우선순위 순으로 대기 요청에 배정 (무거운 요청 제한에 걸린 요청은 건너뜀)"""
+        self._waiters = [w for w in self._waiters if not w[2].done()]
+        for waiter in sorted(self._waiters, key=lambda w: (w[0], w[1])):
+            if self.active >= self.slots:
+                break
+            if self._can_run(waiter[0]):
+                self._grant(waiter[0])
+                waiter[2].set_result(True)
+        self._waiters = [w for w in self._waiters if not w[2].done()]
+
+    def retry_after(self) -> int:
+        """대기열 길이와 평균 처리 시간으로 재시도 권장 시간(초) 추정"""
+        return max(1, math.ceil(self.avg_service_time * (len(self._waiters) + 1) / self.slots))
+
+    def _reject(self, reason: str):
+        self.rejected += 1
+        raise AdmissionRejected(f"[{self.name}] {reason}", self.retry_after())
+
+    async def _acquire(self, priority: int):
+        if not self._waiters and self._can_run(priority):
+            self._grant(priority)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("요청이 많아 대기열이 가득 찼습니다")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append([priority, next(self._seq), future])
+        # 대기 중 슬롯이 비어 있을 수 있으므로 즉시 한 번 배정 시도
+        self._dispatch()
+
+        try:
+            await asyncio.wait({future}, timeout=self.max_wait)
+        except asyncio.CancelledError:
+            # 대기 중 클라이언트 연결이 끊긴 경우: 대기열에서 빼고, 이미 배정된 슬롯은 반납
+            self._waiters = [w for w in self._waiters if w[2] is not future]
+            if future.done() and not future.cancelled():
+                self._release(priority)
+            else:
+                future.cancel()
+            raise
+        if not future.done():
+            future.cancel()
+            self._waiters = [w for w in self._waiters if w[2] is not future]
+            self._reject(f"{self.max_wait:.0f}초 안에 실행 슬롯을 받지 못했습니다")
+
+    def _release(self, priority: int, service_time: Optional[float] = None):
+        """슬롯 반납 (service_time이 없으면 실행하지 않고 반납한 경우로 보고 평균에 반영하지 않음)"""
+        self.active -= 1
+        if priority == PRIORITY_HEAVY:
+            self.active_heavy -= 1
+        if service_time is not None:
+            # 처리 시간 지수 이동 평균 (Retry-After 추정용)
+            self.avg_service_time = 0.8 * self.avg_service_time + 0.2 * service_time
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, cost: int = 1):
+        """비용에 따른 우선순위로 슬롯을 받아 실행 (과부하 시 AdmissionRejected)"""
+        priority = classify_cost(cost)
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        started_at = time.monotonic()
+        self.admitted += 1
+        self.total_wait += started_at - queued_at
+        record_phase('admission_wait', started_at - queued_at)
+        try:
+            yield
+        finally:
+            self._release(priority, time.monotonic() - started_at)
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 상태/누적 통계"""
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "max_heavy": self.max_heavy,
+            "active": self.active,
+            "active_heavy": self.active_heavy,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_seconds": round(self.total_wait / self.admitted, 4) if self.admitted else 0.0,
+            "avg_service_seconds": round(self.avg_service_time, 4)
+        }
@@ -0,0 +1,119 @@
+"""
+부트스트랩 신뢰구간 분석 모듈
+
+문항을 복원 추출해 모델별 평균 점수의 신뢰구간과 "최고 모델일 확률"을 계산합니다.
+재표본을 인덱스 배열로 만드는 대신 다항분포 가중치 행렬(재표본 수 x 문항 수)과
+점수 행렬(문항 수 x 모델 수)의 행렬 곱으로 합계를 구하고, 메모리 사용량을 제한하기 위해
+재표본을 블록 단위로 처리합니다. 전 모델 x 전 벤치마크 요청은 수십 초가 걸릴 수 있어
+작업(job) API로 실행하는 것을 전제로 합니다.
+"""
+from typing import List, Dict, Any, Optional, Callable
+import numpy as np
+
+from config import Config
+
+# 한 번에 생성하는 재표본 수 (가중치 행렬 크기 제한)
+RESAMPLE_BLOCK = 100
+
+
+def load_score_matrix(connection, benchmark: str, models: List[str]) -> np.ndarray:
+    """(문항 수, 모델 수) 점수 행렬 조회 (평가되지 않은 칸은 NaN)"""
+    model_placeholders = ', '.join(['%s'] * len(models))
+    query = f"""
+    SELECT data_id, model_name, match_score
+    FROM {Config.get_table_name(benchmark)}
+    WHERE model_name IN ({model_placeholders})
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, list(models))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    model_index = {model: i for i, model in enumerate(models)}
+    question_index: Dict[Any, int] = {}
+    for data_id, _, _ in rows:
+        question_index.setdefault(data_id, len(question_index))
+
+    matrix = np.full((len(question_index), len(models)), np.nan)
+    for data_id, model_name, match_score in rows:
+        matrix[question_index[data_id], model_index[model_name]] = float(match_score)
+    return matrix
+
+
+def bootstrap_model_scores(
+    scores: np.ndarray,
+    models: List[str],
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """점수 행렬에 대한 모델별 부트스트랩 신뢰구간"""
+    n_questions = scores.shape[0]
+    if n_questions == 0:
+        return {"question_count": 0, "models": []}
+
+    rng = np.random.default_rng(seed)
+    evaluated = (~np.isnan(scores)).astype(np.float64)
+    filled = np.nan_to_num(scores, nan=0.0)
+    probabilities = np.full(n_questions, 1.0 / n_questions)
+
+    resampled_means = np.empty((n_resamples, len(models)))
+    for start in range(0, n_resamples, RESAMPLE_BLOCK):
+        size = min(RESAMPLE_BLOCK, n_resamples - start)
+        weights = rng.multinomial(n_questions, probabilities, size=size).astype(np.float64)
+        totals = weights @ filled
+        counts = weights @ evaluated
+        with np.errstate(invalid='ignore', divide='ignore'):
+            resampled_means[start:start + size] = totals / counts
+
+    alpha = (1 - confidence) / 2
+    lower, upper = np.nanquantile(resampled_means, [alpha, 1 - alpha], axis=0)
+
+    # 재표본마다 가장 높은 모델 (평가 문항이 없는 모델은 제외)
+    best = np.argmax(np.nan_to_num(resampled_means, nan=-np.inf), axis=1)
+    best_probability = np.bincount(best, minlength=len(models)) / n_resamples
+
+    results = []
+    for i, model in enumerate(models):
+        question_count = int(evaluated[:, i].sum())
+        if question_count == 0:
+            continue
+        results.append({
+            "model_name": model,
+            "question_count": question_count,
+            "mean_score": round(float(np.nanmean(scores[:, i])), 4),
+            "ci_lower": round(float(lower[i]), 4),
+            "ci_upper": round(float(upper[i]), 4),
+            "std_error": round(float(np.nanstd(resampled_means[:, i])), 4),
+            "prob_best": round(float(best_probability[i]), 4)
+        })
+
+    results.sort(key=lambda x: x["mean_score"], reverse=True)
+    return {"question_count": n_questions, "models": results}
+
+
+def execute_bootstrap_analysis(
+    connection,
+    benchmarks: List[str],
+    models: List[str],
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    progress: Optional[Callable[[float, str], None]] = None
+) -> Dict[str, Any]:
+    """벤치마크별 부트스트랩 신뢰구간 분석"""
+    results = []
+    for i, benchmark in enumerate(benchmarks):
+        if progress:
+            progress(i / len(benchmarks), f"[{benchmark}] 부트스트랩 중")
+        scores = load_score_matrix(connection, benchmark, models)
+        result = bootstrap_model_scores(scores, models, n_resamples, confidence, seed)
+        results.append({"benchmark": benchmark, **result})
+
+    return {
+        "n_resamples": n_resamples,
+        "confidence": confidence,
+        "benchmark_results": results
+    }
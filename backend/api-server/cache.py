@@ -0,0 +1,76 @@
+"""
+프로세스 내 TTL + LRU 캐시
+
+같은 요청이 반복될 때(에이전트 재시도, 동일 쿼리 재실행) DB를 다시 조회하지 않도록
+결과를 일정 시간 보관합니다. 여러 워커 스레드에서 동시에 사용할 수 있습니다.
+"""
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+# 캐시 미스 구분용 (None도 값으로 저장할 수 있도록)
+_MISSING = object()
+
+# 생성된 캐시 목록 (지표 수집용)
+_caches: List["TTLCache"] = []
+
+
+class TTLCache:
+    """최대 크기(LRU 제거)와 만료 시간이 있는 캐시"""
+
+    def __init__(self, name: str, maxsize: int = 256, ttl: float = 300.0):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값 조회 (만료된 항목은 제거 후 미스 처리)"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값 저장 (가득 차면 가장 오래 사용하지 않은 항목 제거)"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """전체 비우기"""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률 등 캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0
+            }
+
+
+def get_all_caches() -> List[TTLCache]:
+    """프로세스에서 생성된 모든 캐시"""
+    return list(_caches)
@@ -0,0 +1,126 @@
+"""
+선택지 응답 편향 분석 모듈
+
+적재 시점에 누적된 answer_choice_counts(모델 x 메타데이터 x 정답 x 선택 응답 개수)로부터
+선택지 위치 편향, 카이제곱 통계량 등을 계산합니다. 결과 테이블의 TEXT/CHAR 컬럼을
+요청마다 스캔하지 않습니다.
+"""
+from typing import List, Dict, Any, Tuple
+import math
+
+from config import Config
+
+
+def build_choice_counts_query(benchmark: str, models: List[str], metadata_column: str) -> Tuple[str, List[str]]:
+    """선택지 집계 테이블 조회 쿼리 생성"""
+    model_placeholders = ', '.join(['%s'] * len(models))
+    query = f"""
+    SELECT model_name, metadata_value, answer, chosen, cnt
+    FROM {Config.CHOICE_COUNTS_TABLE}
+    WHERE benchmark = %s AND metadata_column = %s AND model_name IN ({model_placeholders})
+    """
+    return query, [benchmark, metadata_column] + list(models)
+
+
+def chi_square_p_value(statistic: float, dof: int) -> float:
+    """카이제곱 상단 꼬리 확률 (Wilson-Hilferty 근사)"""
+    if dof <= 0:
+        return 1.0
+    if statistic <= 0:
+        return 1.0
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compute_bias_statistics(counts: Dict[Tuple[str, str], int]) -> Dict[str, Any]:
+    """(정답, 선택) 개수로부터 편향 통계 계산
+
+    - position_bias: 선택 비율 - 정답 비율 (양수면 해당 선택지를 과도하게 고름)
+    - chi_square: 선택 분포가 정답 분포와 같다는 귀무가설에 대한 적합도 검정
+    """
+    total = sum(counts.values())
+    extracted = sum(cnt for (answer, chosen), cnt in counts.items() if chosen != '-')
+    correct = sum(cnt for (answer, chosen), cnt in counts.items() if answer == chosen)
+
+    letters = sorted({answer for answer, _ in counts} | {chosen for _, chosen in counts if chosen != '-'})
+    answer_counts = {letter: 0 for letter in letters}
+    chosen_counts = {letter: 0 for letter in letters}
+    for (answer, chosen), cnt in counts.items():
+        answer_counts[answer] += cnt
+        if chosen != '-':
+            chosen_counts[chosen] += cnt
+
+    answered_total = sum(answer_counts.values())
+    chosen_total = sum(chosen_counts.values())
+
+    answer_distribution = {
+        letter: round(answer_counts[letter] / answered_total, 4) if answered_total else 0 for letter in letters
+    }
+    chosen_distribution = {
+        letter: round(chosen_counts[letter] / chosen_total, 4) if chosen_total else 0 for letter in letters
+    }
+    position_bias = {
+        letter: round(chosen_distribution[letter] - answer_distribution[letter], 4) for letter in letters
+    }
+
+    # 기대 빈도가 0인 선택지는 검정에서 제외
+    chi_square = 0.0
+    dof = -1
+    for letter in letters:
+        expected = chosen_total * (answer_counts[letter] / answered_total) if answered_total else 0
+        if expected > 0:
+            chi_square += (chosen_counts[letter] - expected) ** 2 / expected
+            dof += 1
+    dof = max(dof, 0)
+
+    cramers_v = math.sqrt(chi_square / (chosen_total * dof)) if chosen_total and dof else 0.0
+    most_over_chosen = max(position_bias, key=position_bias.get) if position_bias else None
+    if most_over_chosen is not None and position_bias[most_over_chosen] <= 0:
+        most_over_chosen = None
+
+    return {
+        "total_questions": total,
+        "accuracy": round(correct / total, 4) if total else 0,
+        "extraction_failure_rate": round((total - extracted) / total, 4) if total else 0,
+        "answer_distribution": answer_distribution,
+        "chosen_distribution": chosen_distribution,
+        "position_bias": position_bias,
+        "most_over_chosen": most_over_chosen,
+        "chi_square": round(chi_square, 4),
+        "dof": dof,
+        "p_value": round(chi_square_p_value(chi_square, dof), 6),
+        "cramers_v": round(cramers_v, 4)
+    }
+
+
+def execute_choice_bias_analysis(connection, benchmark: str, models: List[str], metadata_column: str = '') -> Dict[str, Any]:
+    """모델(및 메타데이터 그룹)별 선택지 편향 통계 조회"""
+    cursor = connection.cursor(dictionary=True)
+
+    try:
+        query, params = build_choice_counts_query(benchmark, models, metadata_column)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    grouped: Dict[Tuple[str, str], Dict[Tuple[str, str], int]] = {}
+    for row in rows:
+        key = (row["model_name"], row["metadata_value"])
+        grouped.setdefault(key, {})[(row["answer"], row["chosen"])] = int(row["cnt"])
+
+    results = []
+    for (model_name, metadata_value), counts in grouped.items():
+        item = {"model_name": model_name}
+        if metadata_column:
+            item[metadata_column] = metadata_value
+        item.update(compute_bias_statistics(counts))
+        results.append(item)
+
+    results.sort(key=lambda x: (x["model_name"], str(x.get(metadata_column, ''))))
+
+    return {
+        "benchmark": benchmark,
+        "metadata_column": metadata_column or None,
+        "results": results
+    }
@@ -3,7 +3,7 @@ AI 평가 시스템 설정 파일
 
 이 모듈은 지원되는 모델, 벤치마크, 그리고 각 벤치마크별 메타데이터 구조를 정의합니다.
 """
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 import os
@@ -20,6 +20,11 @@ class MySQLConfig:
     password: str
     database: str
     charset: str = 'utf8mb4'
+    connect_timeout: int = 10
+    # Connection Pool 설정
+    pool_size: int = 10
+    pool_reset_session: bool = True
+    pool_timeout: float = 5.0  # 풀이 가득 찼을 때 연결을 기다리는 최대 시간(초)
     
     @classmethod
     def from_env(cls) -> 'MySQLConfig':
@@ -29,7 +34,50 @@ class MySQLConfig:
             port=int(os.getenv('MYSQL_PORT', 3306)),
             user=os.getenv('MYSQL_USER', 'root'),
             password=os.getenv('MYSQL_PASSWORD', ''),
-            database=os.getenv('MYSQL_DATABASE', 'ai_evaluation')
+            database=os.getenv('MYSQL_DATABASE', 'ai_evaluation'),
+            connect_timeout=int(os.getenv('MYSQL_CONNECT_TIMEOUT', 10)),
+            pool_size=int(os.getenv('MYSQL_POOL_SIZE', 10)),
+            pool_reset_session=os.getenv('MYSQL_POOL_RESET_SESSION', 'true').lower() in ('1', 'true', 'yes'),
+            pool_timeout=float(os.getenv('MYSQL_POOL_TIMEOUT', 5.0))
+        )
+    
+    @classmethod
+    def replica_from_env(cls, primary: 'MySQLConfig') -> Optional['MySQLConfig']:
+        """읽기 전용 복제본 설정 (MYSQL_REPLICA_HOST가 없으면 None, 나머지는 주 DB 설정을 기본값으로 사용)"""
+        host = os.getenv('MYSQL_REPLICA_HOST')
+        if not host:
+            return None
+        return cls(
+            host=host,
+            port=int(os.getenv('MYSQL_REPLICA_PORT', primary.port)),
+            user=os.getenv('MYSQL_REPLICA_USER', primary.user),
+            password=os.getenv('MYSQL_REPLICA_PASSWORD', primary.password),
+            database=os.getenv('MYSQL_REPLICA_DATABASE', primary.database),
+            charset=primary.charset,
+            connect_timeout=primary.connect_timeout,
+            pool_size=int(os.getenv('MYSQL_REPLICA_POOL_SIZE', primary.pool_size)),
+            pool_reset_session=primary.pool_reset_session,
+            pool_timeout=primary.pool_timeout
+        )
+    
+    @classmethod
+    def sql_agent_from_env(cls, primary: 'MySQLConfig') -> 'MySQLConfig':
+        """SQL 에이전트 전용 계정 설정 (결과 테이블 SELECT 권한만 가진 계정, 접속 정보는 주 DB 기본값)
+
+        에이전트 쿼리는 sql_guard 검증을 통과하더라도 주 DB 계정(기본 root)으로 실행하지 않습니다.
+        계정은 database/mysql-connector/sql_agent_user.sql로 생성합니다.
+        """
+        return cls(
+            host=os.getenv('MYSQL_SQL_HOST', primary.host),
+            port=int(os.getenv('MYSQL_SQL_PORT', primary.port)),
+            user=os.getenv('MYSQL_SQL_USER', 'ai_eval_sql_reader'),
+            password=os.getenv('MYSQL_SQL_PASSWORD', ''),
+            database=primary.database,
+            charset=primary.charset,
+            connect_timeout=primary.connect_timeout,
+            pool_size=primary.pool_size,
+            pool_reset_session=primary.pool_reset_session,
+            pool_timeout=primary.pool_timeout
         )
     
     def to_dict(self) -> dict:
@@ -40,7 +88,8 @@ class MySQLConfig:
             'user': self.user,
             'password': self.password,
             'database': self.database,
-            'charset': self.charset
+            'charset': self.charset,
+            'connection_timeout': self.connect_timeout
         }
 
 
@@ -129,6 +178,108 @@ class Config:
         ]
     }
     
+    # 결과 테이블별 단일 컬럼 인덱스 (init.sql 기준) - 필터 조건 순서와 인덱스 힌트 결정에 사용
+    TABLE_INDEXES: Dict[str, Dict[str, str]] = {
+        'aime_results': {
+            'model_name': 'idx_model', 'difficulty': 'idx_difficulty', 'data_id': 'idx_data_id',
+            'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'mmlu_results': {
+            'model_name': 'idx_model', 'subject': 'idx_subject', 'category': 'idx_category',
+            'knowledge_source': 'idx_knowledge_source', 'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'mmlu_redux_results': {
+            'model_name': 'idx_model', 'cultural_context': 'idx_cultural_context',
+            'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'mmlu_pro_results': {
+            'model_name': 'idx_model', 'interdisciplinary': 'idx_interdisciplinary', 'complexity': 'idx_complexity',
+            'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'math500_results': {
+            'model_name': 'idx_model', 'topic': 'idx_topic', 'level': 'idx_level',
+            'proof_required': 'idx_proof_required', 'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'ds_mmlu_results': {
+            'model_name': 'idx_model', 'subject': 'idx_subject', 'industry_relevance': 'idx_industry_relevance',
+            'response_length_bucket': 'idx_response_length_bucket'
+        },
+        'hle_results': {
+            'model_name': 'idx_model', 'category': 'idx_category', 'philosophical_domain': 'idx_philosophical_domain',
+            'consensus_level': 'idx_consensus_level', 'response_length_bucket': 'idx_response_length_bucket'
+        }
+    }
+    
+    # 적재 시점에 계산되는 응답 텍스트 통계 컬럼 (모든 벤치마크 공통, TEXT 컬럼 조회 불필요)
+    RESPONSE_STAT_DIMENSIONS: List[str] = ['response_length_bucket', 'is_refusal', 'resps_extracted']
+    RESPONSE_STAT_METRICS: List[str] = [
+        'response_chars', 'response_tokens', 'response_lines', 'reasoning_steps', 'is_refusal', 'resps_extracted'
+    ]
+    
+    # 선택지 응답 편향 집계 테이블 (적재 시점에 누적)
+    CHOICE_COUNTS_TABLE: str = 'answer_choice_counts'
+    
+    # 선택지(A~J) 기반 객관식 벤치마크
+    MULTIPLE_CHOICE_BENCHMARKS: List[str] = [
+        SupportedBenchmarks.MMLU.value,
+        SupportedBenchmarks.MMLU_REDUX.value,
+        SupportedBenchmarks.MMLU_PRO.value,
+        SupportedBenchmarks.DS_MMLU.value,
+        SupportedBenchmarks.HLE.value
+    ]
+
+    # 벤치마크별 선택지 컬럼 (의미 검색 색인에서 문제와 함께 임베딩)
+    BENCHMARK_CHOICE_COLUMNS: Dict[str, List[str]] = {
+        SupportedBenchmarks.MMLU.value: ['choice_a', 'choice_b', 'choice_c', 'choice_d'],
+        SupportedBenchmarks.MMLU_REDUX.value: ['choice_a', 'choice_b', 'choice_c', 'choice_d'],
+        SupportedBenchmarks.MMLU_PRO.value: ['choice_a', 'choice_b', 'choice_c', 'choice_d'],
+        SupportedBenchmarks.MATH500.value: ['choice_a', 'choice_b', 'choice_c', 'choice_d'],
+        SupportedBenchmarks.DS_MMLU.value: ['choice_a', 'choice_b', 'choice_c', 'choice_d'],
+        SupportedBenchmarks.HLE.value: [f'choice_{letter}' for letter in 'abcdefghij']
+    }
+
+    # 오프라인 생성 검색 색인 저장 경로 (text_index.py, vector_index.py)
+    INDEX_DIR: str = os.getenv('INDEX_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indexes'))
+
+    # 모든 결과 테이블 공통 컬럼 (init.sql 기준, 메타데이터/선택지/응답 통계 컬럼 제외)
+    RESULT_BASE_COLUMNS: List[str] = [
+        'id', 'data_id', 'model_name', 'question', 'answer', 'response', 'filtered_resps', 'match_score',
+        'user_prompt0', 'created_at'
+    ]
+
+    # BENCHMARK_METADATA에 없는 벤치마크별 추가 컬럼
+    BENCHMARK_EXTRA_COLUMNS: Dict[str, List[str]] = {
+        SupportedBenchmarks.HLE.value: ['complexity_breakdown']
+    }
+
+    # SQL 에이전트용 읽기 전용 쿼리 실행 설정
+    SQL_POOL_SIZE: int = int(os.getenv('SQL_POOL_SIZE', 3))
+    SQL_MAX_ROWS: int = int(os.getenv('SQL_MAX_ROWS', 1000))
+    SQL_MAX_EXECUTION_MS: int = int(os.getenv('SQL_MAX_EXECUTION_MS', 5000))
+    SQL_CACHE_SIZE: int = int(os.getenv('SQL_CACHE_SIZE', 256))
+    SQL_CACHE_TTL: int = int(os.getenv('SQL_CACHE_TTL', 300))
+
+    # 비동기 작업(job) 설정 (jobs.py)
+    JOBS_DIR: str = os.getenv('JOBS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs'))
+    JOB_WORKERS: int = int(os.getenv('JOB_WORKERS', 2))
+    JOB_RESULT_TTL: int = int(os.getenv('JOB_RESULT_TTL', 24 * 3600))
+
+    # 복제본 연결 실패 후 다시 시도하기까지의 시간(초) (그동안 읽기 쿼리는 주 DB 사용)
+    REPLICA_RETRY_INTERVAL: float = float(os.getenv('REPLICA_RETRY_INTERVAL', 30))
+    # 복제본 풀이 가득 찼을 때 주 DB로 대체하기 전까지 기다리는 시간(초)
+    REPLICA_POOL_TIMEOUT: float = float(os.getenv('REPLICA_POOL_TIMEOUT', 0.2))
+
+    # 요청 단위 프로파일링 설정 (profiling.py, 꺼져 있으면 미들웨어를 등록하지 않음)
+    PROFILING_ENABLED: bool = os.getenv('PROFILING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PROFILE_DIR: str = os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles'))
+    PROFILE_TOP_FUNCTIONS: int = int(os.getenv('PROFILE_TOP_FUNCTIONS', 25))
+    PROFILE_MAX_STORED: int = int(os.getenv('PROFILE_MAX_STORED', 200))
+
+    # 요청 수용(admission) 제어 설정 (admission.py)
+    ADMISSION_MAX_QUEUE: int = int(os.getenv('ADMISSION_MAX_QUEUE', 50))
+    ADMISSION_MAX_WAIT: float = float(os.getenv('ADMISSION_MAX_WAIT', 15))
+    ADMISSION_HEAVY_SLOTS: int = int(os.getenv('ADMISSION_HEAVY_SLOTS', 3))
+
     @classmethod
     def get_table_name(cls, benchmark: str) -> str:
         """벤치마크명으로 테이블명 조회"""
@@ -139,6 +290,32 @@ class Config:
         """벤치마크의 사용 가능한 모든 메타데이터 반환"""
         return cls.BENCHMARK_METADATA.get(benchmark, [])
     
+    @classmethod
+    def get_group_columns(cls, benchmark: str) -> List[str]:
+        """/analysis 그룹화/필터에 쓸 수 있는 컬럼 (메타데이터 + 응답 통계 차원)"""
+        if benchmark not in cls.BENCHMARK_METADATA:
+            return []
+        return cls.BENCHMARK_METADATA[benchmark] + cls.RESPONSE_STAT_DIMENSIONS
+    
+    @classmethod
+    def get_table_indexes(cls, benchmark: str) -> Dict[str, str]:
+        """벤치마크 테이블의 컬럼별 단일 컬럼 인덱스명 반환"""
+        return cls.TABLE_INDEXES.get(cls.get_table_name(benchmark), {})
+    
+    @classmethod
+    def get_table_columns(cls, benchmark: str) -> List[str]:
+        """벤치마크 결과 테이블의 전체 컬럼 반환"""
+        if benchmark not in cls.BENCHMARK_METADATA:
+            return []
+        return (
+            cls.RESULT_BASE_COLUMNS
+            + cls.BENCHMARK_CHOICE_COLUMNS.get(benchmark, [])
+            + cls.BENCHMARK_METADATA[benchmark]
+            + cls.BENCHMARK_EXTRA_COLUMNS.get(benchmark, [])
+            + cls.RESPONSE_STAT_METRICS
+            + ['response_length_bucket']
+        )
+
     @classmethod
     def get_remaining_metadata(cls, benchmark: str, selected_metadata: List[str]) -> List[str]:
         """선택된 메타데이터를 제외한 나머지 메타데이터 반환"""
@@ -159,10 +336,27 @@ class Config:
     def is_valid_metadata(cls, benchmark: str, metadata: str) -> bool:
         """특정 벤치마크에서 유효한 메타데이터인지 확인"""
         return metadata in cls.get_available_metadata(benchmark)
+    
+    @classmethod
+    def is_valid_group_column(cls, benchmark: str, column: str) -> bool:
+        """/analysis 그룹화/필터에 쓸 수 있는 컬럼인지 확인 (응답 통계 차원 포함)"""
+        return column in cls.get_group_columns(benchmark)
+    
+    @classmethod
+    def is_valid_metric(cls, metric: str) -> bool:
+        """집계 가능한 응답 통계 지표인지 확인"""
+        return metric in cls.RESPONSE_STAT_METRICS
+    
+    @classmethod
+    def is_multiple_choice(cls, benchmark: str) -> bool:
+        """선택지 기반 객관식 벤치마크인지 확인"""
+        return benchmark in cls.MULTIPLE_CHOICE_BENCHMARKS
 
 
 # 전역 설정 인스턴스
 mysql_config = MySQLConfig.from_env()
+replica_mysql_config = MySQLConfig.replica_from_env(mysql_config)
+sql_agent_mysql_config = MySQLConfig.sql_agent_from_env(mysql_config)
 
 # 하위 호환성을 위한 기존 변수들 (deprecated)
 MODELS = Config.MODELS
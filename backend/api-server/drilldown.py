@@ -0,0 +1,123 @@
+"""
+문항 단위 드릴다운 모듈
+
+그룹 집계를 구성하는 개별 문항 행을 (data_id, model_name, id) 키셋 페이지네이션으로 조회합니다.
+(data_id, model_name)은 유일하지 않으므로 기본 키 id를 마지막 정렬 키로 씁니다.
+OFFSET을 쓰지 않으므로 뒤쪽 페이지도 idx_data_model 인덱스 범위 스캔으로 첫 페이지와 같은
+비용이 듭니다. (InnoDB 보조 인덱스는 기본 키를 포함하므로 id를 더해도 같은 인덱스 순서) 큰 TEXT 컬럼(response, user_prompt0 등)은 요청한 경우에만 읽습니다.
+"""
+from typing import List, Dict, Any, Tuple, Optional
+from decimal import Decimal
+import base64
+import json
+
+from config import Config
+from query_planner import plan_filters
+
+# 항상 조회하는 좁은 컬럼
+BASE_COLUMNS = ['data_id', 'model_name', 'answer', 'filtered_resps', 'match_score']
+
+# 요청 시에만 조회하는 TEXT 컬럼
+TEXT_COLUMNS = ['question', 'response', 'user_prompt0']
+
+
+def encode_cursor(data_id: Any, model_name: str, row_id: int) -> str:
+    """마지막 행의 키를 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps([data_id, model_name, row_id], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str, int]:
+    """커서 문자열을 (data_id, model_name, id)로 디코딩"""
+    try:
+        data_id, model_name, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"잘못된 커서입니다: {cursor}") from e
+    if not isinstance(row_id, int):
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+    return data_id, model_name, row_id
+
+
+def build_drilldown_query(
+    benchmark: str,
+    models: List[str],
+    filters: List[Any],
+    extra_columns: List[str],
+    text_columns: List[str],
+    limit: int,
+    after: Optional[Tuple[Any, str, int]] = None
+) -> Tuple[str, List[Any]]:
+    """키셋 페이지네이션 드릴다운 쿼리 생성"""
+    table_name = Config.get_table_name(benchmark)
+
+    # 필터 조건만 사용하고 인덱스 힌트는 쓰지 않음 (정렬 키 인덱스를 타야 하므로)
+    where_conditions, params, _ = plan_filters(benchmark, filters)
+
+    model_placeholders = ', '.join(['%s'] * len(models))
+    where_conditions.append(f"model_name IN ({model_placeholders})")
+    params.extend(models)
+
+    if after is not None:
+        last_data_id, last_model, last_id = after
+        where_conditions.append(
+            "(data_id > %s OR (data_id = %s AND (model_name > %s OR (model_name = %s AND id > %s))))"
+        )
+        params.extend([last_data_id, last_data_id, last_model, last_model, last_id])
+
+    # id는 커서용으로만 조회 (응답 행에서는 제외)
+    select_columns = ['id'] + BASE_COLUMNS + [col for col in extra_columns if col not in BASE_COLUMNS] + text_columns
+
+    # 다음 페이지 존재 여부 확인을 위해 limit + 1개 조회
+    query = f"""
+    SELECT {', '.join(select_columns)}
+    FROM {table_name}
+    WHERE {' AND '.join(where_conditions)}
+    ORDER BY data_id, model_name, id
+    LIMIT %s
+    """
+    params.append(limit + 1)
+
+    return query, params
+
+
+def execute_drilldown(
+    connection,
+    benchmark: str,
+    models: List[str],
+    filters: List[Any],
+    extra_columns: List[str],
+    text_columns: List[str],
+    limit: int,
+    cursor_token: Optional[str] = None
+) -> Dict[str, Any]:
+    """드릴다운 쿼리 실행 및 다음 페이지 커서 생성"""
+    after = decode_cursor(cursor_token) if cursor_token else None
+    query, params = build_drilldown_query(benchmark, models, filters, extra_columns, text_columns, limit, after)
+
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last_id = rows[-1]['id'] if rows else None
+
+    for row in rows:
+        del row['id']
+        for key, value in row.items():
+            if isinstance(value, Decimal):
+                row[key] = float(value)
+
+    next_cursor = encode_cursor(rows[-1]['data_id'], rows[-1]['model_name'], last_id) if has_more and rows else None
+
+    return {
+        "benchmark": benchmark,
+        "columns": list(rows[0].keys()) if rows else [],
+        "rows": rows,
+        "count": len(rows),
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    }
@@ -0,0 +1,211 @@
+"""
+비동기 작업(job) 모듈
+
+MCP 서버의 HTTP 타임아웃(30초)을 넘길 수 있는 무거운 분석(전 모델 x 전 벤치마크
+부트스트랩 등)을 작업으로 등록하고, 제한된 워커 풀에서 실행합니다. 클라이언트는 작업 ID로
+진행률을 폴링하고 완료 후 결과를 조회합니다.
+
+- 같은 종류/파라미터의 작업은 진행 중이거나 결과가 남아 있으면 기존 작업을 반환 (중복 제거)
+- 작업 상태와 결과는 JOBS_DIR에 JSON으로 저장되어 서버 재시작 후에도 조회 가능
+- 끝난 지 result_ttl이 지난 작업은 시작 시와 작업 등록 시 목록과 파일에서 삭제
+"""
+from typing import Dict, Any, Callable, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+
+# 실행 함수: (파라미터, 진행률 보고 함수) -> 결과
+JobRunner = Callable[[Dict[str, Any], Callable[[float, str], None]], Dict[str, Any]]
+
+
+@dataclass
+class Job:
+    """작업 상태"""
+    job_id: str
+    kind: str
+    params: Dict[str, Any]
+    dedup_key: str
+    status: str = QUEUED
+    progress: float = 0.0
+    message: str = ''
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 (실행 시간 포함)"""
+        data = asdict(self)
+        end = self.finished_at or (time.time() if self.started_at else None)
+        data["elapsed_seconds"] = round(end - self.started_at, 2) if self.started_at and end else None
+        return data
+
+
+class JobManager:
+    """작업 등록/실행/조회 관리"""
+
+    def __init__(self, jobs_dir: str, max_workers: int = 2, result_ttl: float = 24 * 3600):
+        self.jobs_dir = jobs_dir
+        self.result_ttl = result_ttl
+        self.runners: Dict[str, JobRunner] = {}
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load_jobs()
+
+    def register(self, kind: str, runner: JobRunner):
+        """작업 종류별 실행 함수 등록"""
+        self.runners[kind] = runner
+
+    @staticmethod
+    def make_dedup_key(kind: str, params: Dict[str, Any]) -> str:
+        """종류 + 정규화된 파라미터 해시"""
+        payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.meta.json")
+
+    def _result_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.result.json")
+
+    def _save(self, job: Job):
+        """작업 상태 저장 (임시 파일 후 rename)"""
+        path = self._meta_path(job.job_id)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(asdict(job), f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def _load_jobs(self):
+        """저장된 작업 복원 (재시작으로 중단된 작업은 실패 처리)"""
+        for filename in os.listdir(self.jobs_dir):
+            if not filename.endswith('.meta.json'):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, filename), 'r', encoding='utf-8') as f:
+                    job = Job(**json.load(f))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"작업 상태 파일 로드 실패: {filename} ({e})")
+                continue
+            if job.status in (QUEUED, RUNNING):
+                job.status = FAILED
+                job.error = "서버 재시작으로 중단되었습니다"
+                job.finished_at = time.time()
+                self._save(job)
+            self.jobs[job.job_id] = job
+        self._purge_expired()
+
+    def _purge_expired(self):
+        """끝난 지 result_ttl이 지난 작업을 목록에서 빼고 상태/결과 파일 삭제"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            # 상태가 바뀐 뒤 finished_at이 기록되기 전인 작업은 제외
+            if job.status in (SUCCEEDED, FAILED) and job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+            for path in (self._result_path(job_id), self._meta_path(job_id)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"만료된 작업 파일 삭제 실패: {path} ({e})")
+        if expired:
+            logger.info(f"만료된 작업 {len(expired)}개 삭제")
+
+    def _find_duplicate(self, dedup_key: str) -> Optional[Job]:
+        """재사용 가능한 동일 작업 (진행 중이거나 만료되지 않은 성공 작업)"""
+        now = time.time()
+        for job in self.jobs.values():
+            if job.dedup_key != dedup_key:
+                continue
+            if job.status in (QUEUED, RUNNING):
+                return job
+            if job.status == SUCCEEDED and now - (job.finished_at or 0) < self.result_ttl \
+                    and os.path.exists(self._result_path(job.job_id)):
+                return job
+        return None
+
+    def submit(self, kind: str, params: Dict[str, Any]) -> Tuple[Job, bool]:
+        """작업 등록. (작업, 기존 작업 재사용 여부) 반환"""
+        if kind not in self.runners:
+            raise ValueError(f"지원하지 않는 작업 종류: {kind}")
+
+        dedup_key = self.make_dedup_key(kind, params)
+        with self._lock:
+            self._purge_expired()
+            existing = self._find_duplicate(dedup_key)
+            if existing:
+                return existing, True
+
+            job = Job(job_id=uuid.uuid4().hex, kind=kind, params=params, dedup_key=dedup_key)
+            self.jobs[job.job_id] = job
+            self._save(job)
+
+        self._executor.submit(self._run, job)
+        logger.info(f"작업 등록: {job.job_id} ({kind})")
+        return job, False
+
+    def _run(self, job: Job):
+        """워커 스레드에서 작업 실행"""
+        def report(progress: float, message: str = ''):
+            job.progress = round(min(max(progress, 0.0), 1.0), 4)
+            job.message = message
+            self._save(job)
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        self._save(job)
+
+        try:
+            result = self.runners[job.kind](job.params, report)
+            path = self._result_path(job.job_id)
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, default=str)
+            os.replace(f"{path}.tmp", path)
+
+            job.status = SUCCEEDED
+            job.progress = 1.0
+            job.message = '완료'
+            logger.info(f"작업 완료: {job.job_id} ({job.kind})")
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+            logger.error(f"작업 실패: {job.job_id} ({job.kind}) - {e}")
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """작업 조회"""
+        return self.jobs.get(job_id)
+
+    def list_jobs(self, limit: int = 50) -> List[Job]:
+        """최근 작업 목록"""
+        return sorted(self.jobs.values(), key=lambda j: j.created_at, reverse=True)[:limit]
+
+    def load_result(self, job_id: str) -> Dict[str, Any]:
+        """저장된 작업 결과 로드"""
+        with open(self._result_path(job_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def shutdown(self):
+        """워커 풀 종료 (진행 중인 작업은 끝까지 실행)"""
+        self._executor.shutdown(wait=False)
@@ -1,41 +1,137 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Tuple, Union
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from typing import List, Dict, Any, Tuple, Union, Optional, Literal, Callable
 import mysql.connector
 from mysql.connector import Error, pooling
-from contextlib import contextmanager
+from mysql.connector.errors import PoolError
+from contextlib import contextmanager, asynccontextmanager
 import logging
 import atexit
+import hashlib
+import json
+import os
+import threading
+import time
 
 # Config 모듈 import
-from config import Config, SupportedModels, SupportedBenchmarks, mysql_config
+from config import (
+    Config, SupportedModels, SupportedBenchmarks, MySQLConfig, mysql_config, replica_mysql_config,
+    sql_agent_mysql_config
+)
+from outliers import execute_outlier_analysis
+from choice_bias import execute_choice_bias_analysis
+from query_planner import plan_filters
+from drilldown import execute_drilldown, TEXT_COLUMNS
+from text_index import search_with_scores
+from vector_index import semantic_search, multi_query_search_with_scores
+from sql_guard import execute_readonly_query, get_allowed_tables, SQLValidationError
+from bootstrap import execute_bootstrap_analysis
+from jobs import JobManager, SUCCEEDED, FAILED
+from admission import AdmissionController, AdmissionRejected, cardinality_estimator, estimate_analysis_cost
+from cache import get_all_caches
+from serialization import FORMAT_COLUMNAR, benchmark_result_to_columnar
+from profiling import ProfileStore, ProfilingMiddleware, run_blocking, record_phase
+from metrics import (
+    registry, MetricsMiddleware, InstrumentedJSONResponse, InstrumentedConnection,
+    register_cache_metrics, get_query_fingerprints
+)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Connection Pool 설정
+class PoolMetrics:
+    """연결 풀 사용 지표 (체크아웃 대기 시간, 사용 중 연결 수, 타임아웃, 재연결)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+        self.reconnects = 0
+        self.errors = 0
+    
+    def record_checkout(self, wait: float, waited: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            if waited:
+                self.waits += 1
+    
+    def record_release(self):
+        with self._lock:
+            self.in_use -= 1
+    
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+    
+    def record_reconnect(self):
+        with self._lock:
+            self.reconnects += 1
+    
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+                "waited_checkouts": self.waits,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "timeouts": self.timeouts,
+                "reconnects": self.reconnects,
+                "errors": self.errors
+            }
+
 class DatabaseManager:
     """데이터베이스 연결 풀 관리"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        pool_name: str = 'ai_evaluation_pool',
+        pool_size: Optional[int] = None,
+        db_config: MySQLConfig = mysql_config,
+        query_label: Optional[str] = None
+    ):
+        self.pool_name = pool_name
+        self.db_config = db_config
+        self.pool_size = pool_size or db_config.pool_size
+        # 쿼리 지표 레이블 (None이면 쿼리 지문별)
+        self.query_label = query_label
         self.pool = None
+        self.metrics = PoolMetrics()
+        # 풀 내 물리 연결별 마지막 connection_id (바뀌면 재연결된 것)
+        self._connection_ids: Dict[int, int] = {}
         self.setup_pool()
     
     def setup_pool(self):
         """Connection Pool 설정"""
         try:
-            pool_config = mysql_config.to_dict()
+            pool_config = self.db_config.to_dict()
             pool_config.update({
-                'pool_name': 'ai_evaluation_pool',
-                'pool_size': 10,
-                'pool_reset_session': True,
+                'pool_name': self.pool_name,
+                'pool_size': self.pool_size,
+                'pool_reset_session': self.db_config.pool_reset_session,
                 'autocommit': True
             })
             
             self.pool = pooling.MySQLConnectionPool(**pool_config)
-            logger.info("데이터베이스 Connection Pool 생성 완료")
+            logger.info(f"데이터베이스 Connection Pool 생성 완료: {self.pool_name} ({self.db_config.host}, size={self.pool_size})")
             
             atexit.register(self.close_pool)
             
@@ -43,35 +139,233 @@ class DatabaseManager:
             logger.error(f"Connection Pool 생성 실패: {e}")
             raise RuntimeError(f"데이터베이스 풀 설정 실패: {str(e)}")
     
+    def acquire(self, timeout: Optional[float] = None):
+        """풀에서 연결 획득 (가득 찼으면 timeout(기본 pool_timeout)까지 대기, 초과 시 PoolError)
+
+        대기 중 스레드를 재우므로 이벤트 루프에서 직접 호출하지 말고 checkout()을 사용합니다.
+        """
+        started = time.monotonic()
+        deadline = started + (self.db_config.pool_timeout if timeout is None else timeout)
+        delay = 0.005
+        waited = False
+        while True:
+            try:
+                connection = self.pool.get_connection()
+                break
+            except PoolError as e:
+                # 풀 고갈 외의 PoolError(재연결 실패 등)는 그대로 전달
+                if 'exhausted' not in str(e):
+                    self.metrics.record_error()
+                    raise
+                if time.monotonic() >= deadline:
+                    self.metrics.record_timeout()
+                    raise
+                waited = True
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+            except Error:
+                self.metrics.record_error()
+                raise
+        
+        self.metrics.record_checkout(time.monotonic() - started, waited)
+        record_phase('pool_wait', time.monotonic() - started)
+        self._track_reconnect(connection)
+        # 쿼리 지문별 실행 시간/반환 행 수 기록
+        return InstrumentedConnection(connection, self.query_label)
+    
+    def _track_reconnect(self, connection):
+        """풀이 체크아웃 시 끊어진 연결을 다시 연결했는지 connection_id 변화로 집계"""
+        raw = getattr(connection, '_cnx', connection)
+        connection_id = getattr(raw, 'connection_id', None)
+        previous = self._connection_ids.get(id(raw))
+        if previous is not None and connection_id is not None and previous != connection_id:
+            self.metrics.record_reconnect()
+        self._connection_ids[id(raw)] = connection_id
+    
+    def release(self, connection):
+        """연결 반환 (끊어진 연결도 풀에 돌려보내 다음 체크아웃 때 재연결되도록 함)"""
+        try:
+            connection.close()
+        except Error as e:
+            logger.warning(f"연결 반환 중 오류: {e}")
+        finally:
+            self.metrics.record_release()
+    
     @contextmanager
     def get_connection(self):
         """Context Manager로 연결 관리"""
-        connection = None
         try:
-            connection = self.pool.get_connection()
-            yield connection
+            connection = self.acquire()
+        except PoolError as e:
+            logger.error(f"[{self.pool_name}] 연결 풀 대기 시간 초과: {e}")
+            raise HTTPException(status_code=503, detail=f"데이터베이스 연결을 얻지 못했습니다: {str(e)}")
         except Error as e:
             logger.error(f"데이터베이스 연결 오류: {e}")
             raise HTTPException(status_code=500, detail=f"데이터베이스 연결 실패: {str(e)}")
+        
+        try:
+            yield connection
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            self.release(connection)
+    
+    def stats(self) -> Dict[str, Any]:
+        """풀 설정과 사용 지표"""
+        return {
+            "pool_name": self.pool_name,
+            "host": self.db_config.host,
+            "pool_size": self.pool_size,
+            "pool_reset_session": self.db_config.pool_reset_session,
+            **self.metrics.snapshot()
+        }
     
     def close_pool(self):
         """Connection Pool 종료"""
         if self.pool:
             logger.info("데이터베이스 Connection Pool 종료")
 
-# 전역 DB 매니저
+class ReadRouter:
+    """읽기 전용 분석 쿼리를 복제본 풀로 보내고, 복제본 장애 시 주 DB 풀로 대체"""
+    
+    def __init__(
+        self,
+        primary: DatabaseManager,
+        replica: Optional[DatabaseManager] = None,
+        retry_interval: float = 30.0,
+        replica_timeout: float = 0.2
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.retry_interval = retry_interval
+        # 복제본 풀이 바쁠 때 주 DB로 넘어가기 전까지 기다리는 시간 (전체 pool_timeout을 기다리지 않음)
+        self.replica_timeout = replica_timeout
+        self.replica_down_until = 0.0
+        self.fallbacks = 0
+    
+    @property
+    def pool_size(self) -> int:
+        return self.replica.pool_size if self.replica else self.primary.pool_size
+    
+    def _acquire(self) -> Tuple[DatabaseManager, Any]:
+        if self.replica and time.monotonic() >= self.replica_down_until:
+            try:
+                return self.replica, self.replica.acquire(timeout=self.replica_timeout)
+            except PoolError as e:
+                # 복제본 풀이 바쁜 경우는 장애로 보지 않고 이번 요청만 주 DB 사용
+                self.fallbacks += 1
+                logger.warning(f"복제본 풀 사용 불가, 주 DB로 대체: {e}")
+            except Error as e:
+                self.fallbacks += 1
+                self.replica_down_until = time.monotonic() + self.retry_interval
+                logger.warning(f"복제본 연결 실패, {self.retry_interval:.0f}초 동안 주 DB 사용: {e}")
+        return self.primary, self.primary.acquire()
+    
+    @contextmanager
+    def get_connection(self):
+        """Context Manager로 읽기 연결 관리"""
+        try:
+            manager, connection = self._acquire()
+        except PoolError as e:
+            logger.error(f"연결 풀 대기 시간 초과: {e}")
+            raise HTTPException(status_code=503, detail=f"데이터베이스 연결을 얻지 못했습니다: {str(e)}")
+        except Error as e:
+            logger.error(f"데이터베이스 연결 오류: {e}")
+            raise HTTPException(status_code=500, detail=f"데이터베이스 연결 실패: {str(e)}")
+        
+        try:
+            yield connection
+        finally:
+            manager.release(connection)
+    
+    def stats(self) -> Dict[str, Any]:
+        """라우팅 상태"""
+        return {
+            "replica_configured": self.replica is not None,
+            "replica_available": self.replica is not None and time.monotonic() >= self.replica_down_until,
+            "fallbacks": self.fallbacks
+        }
+
+# 전역 DB 매니저 (주 DB: 적재와 공유)
 db_manager = DatabaseManager()
 
+# 읽기 전용 복제본 풀 (설정된 경우)
+replica_db_manager: Optional[DatabaseManager] = None
+if replica_mysql_config:
+    try:
+        replica_db_manager = DatabaseManager(pool_name='ai_evaluation_replica_pool', db_config=replica_mysql_config)
+    except RuntimeError as e:
+        logger.warning(f"복제본 풀 생성 실패, 주 DB만 사용합니다: {e}")
+
+# 분석 쿼리 라우터 (복제본 우선, 장애 시 주 DB)
+read_db = ReadRouter(db_manager, replica_db_manager, Config.REPLICA_RETRY_INTERVAL, Config.REPLICA_POOL_TIMEOUT)
+
+# SQL 에이전트 쿼리 전용 소규모 풀 (임의 쿼리가 분석 API의 연결을 점유하지 않도록 분리)
+# 결과 테이블 SELECT 권한만 있는 별도 계정으로 접속하며, 계정이 없으면 /sql을 비활성화
+# 에이전트 쿼리는 형태가 매번 달라 지문별 시계열이 끝없이 늘어나므로 하나의 레이블로 집계
+sql_db_manager: Optional[DatabaseManager] = None
+try:
+    sql_db_manager = DatabaseManager(
+        pool_name='ai_evaluation_sql_pool', pool_size=Config.SQL_POOL_SIZE,
+        db_config=sql_agent_mysql_config, query_label='sql_agent'
+    )
+except RuntimeError as e:
+    logger.warning(f"SQL 에이전트 풀 생성 실패, /sql을 비활성화합니다 ({sql_agent_mysql_config.user}): {e}")
+
+# 풀 크기만큼만 동시 실행하고 나머지는 비용 우선순위 대기열에서 대기 (초과 시 429)
+# 비동기 작업 워커도 같은 읽기 풀에서 연결을 가져가므로 JOB_WORKERS개는 작업용으로 남겨 둠
+if read_db.pool_size <= Config.JOB_WORKERS:
+    logger.warning(f"읽기 풀 크기({read_db.pool_size})가 JOB_WORKERS({Config.JOB_WORKERS}) 이하라 작업과 요청이 연결을 두고 경합할 수 있습니다")
+analysis_admission = AdmissionController(
+    'analysis',
+    slots=max(1, read_db.pool_size - Config.JOB_WORKERS),
+    max_heavy=Config.ADMISSION_HEAVY_SLOTS,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    max_wait=Config.ADMISSION_MAX_WAIT
+)
+sql_admission = AdmissionController(
+    'sql',
+    slots=Config.SQL_POOL_SIZE,
+    max_heavy=Config.ADMISSION_HEAVY_SLOTS,
+    max_queue=Config.ADMISSION_MAX_QUEUE,
+    max_wait=Config.ADMISSION_MAX_WAIT
+)
+
+# 수집 시점에 읽는 풀/수용 제어/캐시 지표
+def _pool_gauge(key: str):
+    def collect():
+        managers = [db_manager, replica_db_manager, sql_db_manager]
+        return [((m.pool_name,), m.metrics.snapshot()[key]) for m in managers if m is not None]
+    return collect
+
+def _admission_gauge(key: str):
+    return lambda: [((c.name,), c.stats()[key]) for c in (analysis_admission, sql_admission)]
+
+registry.gauge_callback('ai_eval_db_pool_in_use', '사용 중인 연결 수', ('pool',), _pool_gauge('in_use'))
+registry.gauge_callback('ai_eval_db_pool_checkouts', '누적 연결 체크아웃 수', ('pool',), _pool_gauge('checkouts'))
+registry.gauge_callback('ai_eval_db_pool_max_wait_ms', '최대 체크아웃 대기 시간(ms)', ('pool',), _pool_gauge('max_wait_ms'))
+registry.gauge_callback('ai_eval_db_pool_timeouts', '누적 체크아웃 타임아웃 수', ('pool',), _pool_gauge('timeouts'))
+registry.gauge_callback('ai_eval_db_pool_reconnects', '누적 재연결 수', ('pool',), _pool_gauge('reconnects'))
+registry.gauge_callback('ai_eval_admission_active', '실행 중인 요청 수', ('controller',), _admission_gauge('active'))
+registry.gauge_callback('ai_eval_admission_queued', '대기 중인 요청 수', ('controller',), _admission_gauge('queued'))
+registry.gauge_callback('ai_eval_admission_rejected', '누적 거절(429) 수', ('controller',), _admission_gauge('rejected'))
+register_cache_metrics(get_all_caches)
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="AI 평가 데이터 분석 API",
     description="AI 모델의 벤치마크 성능 분석을 위한 API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=InstrumentedJSONResponse
 )
 
+# 라우트별 응답 시간 지표
+app.add_middleware(MetricsMiddleware)
+
+# 요청 단위 프로파일링 (X-Profile 헤더 또는 ?profile=, 활성화된 경우에만 등록)
+profile_store: Optional[ProfileStore] = None
+if Config.PROFILING_ENABLED:
+    profile_store = ProfileStore(Config.PROFILE_DIR, Config.PROFILE_MAX_STORED)
+    app.add_middleware(ProfilingMiddleware, store=profile_store, top_functions=Config.PROFILE_TOP_FUNCTIONS)
+
 # CORS 미들웨어 추가
 app.add_middleware(
     CORSMiddleware,
@@ -81,7 +375,32 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """과부하 거절 -> 429 + Retry-After"""
+    logger.warning(f"요청 거절 ({request.url.path}): {exc}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc), "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Pydantic 모델들
+class MetadataFilter(BaseModel):
+    """메타데이터 필터 조건 (예: difficulty IN ('Hard', 'Extreme'))"""
+    column: str = Field(..., description="필터링할 메타데이터 컬럼")
+    op: Literal['eq', 'ne', 'in', 'not_in', 'gte', 'lte'] = Field(default='in', description="비교 연산자")
+    values: List[Union[bool, int, float, str]] = Field(..., description="비교 값 리스트")
+    
+    @model_validator(mode='after')
+    def check_values(self) -> 'MetadataFilter':
+        """연산자별 값 개수 검증"""
+        if not self.values:
+            raise ValueError(f"필터 '{self.column}'에 최소 하나의 값이 필요합니다.")
+        if self.op in ('eq', 'ne', 'gte', 'lte') and len(self.values) != 1:
+            raise ValueError(f"'{self.op}' 연산자는 하나의 값만 허용합니다.")
+        return self
+
 class AnalysisRequest(BaseModel):
     """성능 분석 요청 모델 - 다중 벤치마크 지원"""
     models: List[SupportedModels] = Field(..., description="분석할 모델 리스트")
@@ -90,6 +409,18 @@ class AnalysisRequest(BaseModel):
         default=[], 
         description="메타데이터 레벨 설정. 벤치마크가 1개면 List[str], 2개 이상이면 Dict[benchmark_name, List[str]]"
     )
+    metrics: List[str] = Field(
+        default=[],
+        description="추가로 집계할 응답 통계 지표 (예: response_tokens, reasoning_steps, is_refusal)"
+    )
+    filters: Union[List[MetadataFilter], Dict[str, List[MetadataFilter]]] = Field(
+        default=[],
+        description="메타데이터 필터. 모든 벤치마크 공통이면 List, 벤치마크별이면 Dict[benchmark_name, List]"
+    )
+    response_format: Literal['rows', 'columnar'] = Field(
+        default='rows',
+        description="결과 형태. rows: 그룹별 dict 리스트, columnar: 필드/모델별 배열 (대용량 피벗 결과용)"
+    )
     
     def get_metadata_for_benchmark(self, benchmark: str) -> List[str]:
         """특정 벤치마크의 메타데이터 레벨 반환"""
@@ -100,6 +431,75 @@ class AnalysisRequest(BaseModel):
             return self.metadata_level
         else:
             return []
+    
+    def get_filters_for_benchmark(self, benchmark: str) -> List[MetadataFilter]:
+        """특정 벤치마크의 필터 조건 반환"""
+        if isinstance(self.filters, dict):
+            return self.filters.get(benchmark, [])
+        return self.filters
+
+class OutlierRequest(BaseModel):
+    """특이 경향(이상치) 탐지 요청 모델"""
+    benchmark: SupportedBenchmarks = Field(..., description="분석할 벤치마크")
+    models: List[SupportedModels] = Field(default=[], description="분석할 모델 리스트 (비어 있으면 전체 모델)")
+    metadata_columns: List[str] = Field(default=[], description="분석할 메타데이터 컬럼 (비어 있으면 벤치마크의 전체 메타데이터)")
+    top_k: int = Field(default=10, ge=1, le=100, description="반환할 이상치 개수")
+    min_questions: int = Field(default=5, ge=1, description="셀(그룹, 모델)당 최소 문제 수")
+
+class BootstrapRequest(BaseModel):
+    """부트스트랩 신뢰구간 분석 요청 모델"""
+    benchmarks: List[SupportedBenchmarks] = Field(default=[], description="분석할 벤치마크 (비어 있으면 전체)")
+    models: List[SupportedModels] = Field(default=[], description="분석할 모델 (비어 있으면 전체)")
+    n_resamples: int = Field(default=1000, ge=100, le=20000, description="재표본 수")
+    confidence: float = Field(default=0.95, gt=0.5, lt=1.0, description="신뢰수준")
+    seed: Optional[int] = Field(default=0, description="난수 시드 (같은 시드면 같은 결과)")
+
+class JobRequest(BaseModel):
+    """비동기 작업 등록 요청 모델"""
+    kind: Literal['analysis', 'outliers', 'bootstrap'] = Field(..., description="작업 종류")
+    params: Dict[str, Any] = Field(default={}, description="작업 종류별 요청 본문 (/analysis, /analysis/outliers, /analysis/bootstrap과 동일)")
+
+class DrillDownRequest(BaseModel):
+    """문항 단위 드릴다운 요청 모델 (키셋 페이지네이션)"""
+    benchmark: SupportedBenchmarks = Field(..., description="조회할 벤치마크")
+    models: List[SupportedModels] = Field(default=[], description="조회할 모델 리스트 (비어 있으면 전체 모델)")
+    filters: List[MetadataFilter] = Field(default=[], description="메타데이터 필터")
+    columns: List[str] = Field(default=[], description="추가로 조회할 메타데이터/응답 통계 컬럼")
+    include_text: List[Literal['question', 'response', 'user_prompt0']] = Field(
+        default=['question'],
+        description="조회할 TEXT 컬럼 (response, user_prompt0는 크므로 필요할 때만 지정)"
+    )
+    limit: int = Field(default=50, ge=1, le=500, description="페이지 크기")
+    cursor: Optional[str] = Field(default=None, description="이전 응답의 next_cursor (첫 페이지는 생략)")
+
+class TextSearchRequest(BaseModel):
+    """전문 검색 요청 모델 (로컬 역색인 + 점수 결합)"""
+    benchmark: SupportedBenchmarks = Field(..., description="검색할 벤치마크")
+    query: str = Field(..., min_length=1, description="검색어 (모든 단어를 포함하는 문항 검색)")
+    field: Literal['question', 'response'] = Field(default='question', description="검색 대상 컬럼")
+    models: List[SupportedModels] = Field(default=[], description="점수를 집계할 모델 리스트 (비어 있으면 전체 모델)")
+    min_models_correct: Optional[int] = Field(default=None, ge=0, description="정답 모델 수 하한")
+    max_models_correct: Optional[int] = Field(default=None, ge=0, description="정답 모델 수 상한")
+    limit: int = Field(default=100, ge=1, le=1000, description="최대 결과 수")
+
+class SemanticSearchRequest(BaseModel):
+    """의미 검색 요청 모델 (오프라인 벡터 색인)"""
+    benchmark: SupportedBenchmarks = Field(..., description="검색할 벤치마크")
+    query: str = Field(..., min_length=1, description="검색 질의 (문제 형태의 자연어)")
+    top_k: int = Field(default=100, ge=1, le=1000, description="반환할 유사 문항 수")
+
+class MultiQuerySearchRequest(BaseModel):
+    """다중 질의 의미 검색 요청 모델 (고유 문항 top_n개 + 모델별 성능)"""
+    benchmark: SupportedBenchmarks = Field(..., description="검색할 벤치마크")
+    queries: List[str] = Field(..., min_length=1, max_length=50, description="검색 질의 리스트 (예: 재작성된 유사 질문 10개)")
+    top_n: int = Field(default=100, ge=1, le=1000, description="중복 제거 후 반환할 고유 문항 수")
+    models: List[SupportedModels] = Field(default=[], description="성능을 집계할 모델 리스트 (비어 있으면 전체 모델)")
+
+class SQLQueryRequest(BaseModel):
+    """읽기 전용 SQL 실행 요청 모델 (SQL 에이전트용)"""
+    query: str = Field(..., min_length=1, max_length=20000, description="SELECT 문 (허용된 *_results 테이블/컬럼만)")
+    max_rows: int = Field(default=Config.SQL_MAX_ROWS, ge=1, le=10000, description="최대 반환 행 수")
+    use_cache: bool = Field(default=True, description="같은 쿼리의 캐시된 결과 사용 여부")
 
 class MetadataInfo(BaseModel):
     """메타데이터 정보 모델"""
@@ -117,18 +517,60 @@ class BenchmarkAnalysisResult(BaseModel):
     results: List[Dict[str, Any]]
     summary: Dict[str, Any]
 
+@asynccontextmanager
+async def checkout(source: Union[DatabaseManager, ReadRouter]):
+    """연결 획득/반환을 스레드 풀에서 실행 (async with로 사용)
+
+    풀이 가득 차면 획득이 pool_timeout까지 대기하므로, 이벤트 루프에서 획득하면 수용 제어를 거치지 않는
+    요청(작업, 요약, 헬스 체크)이 풀을 채웠을 때 서버 전체가 멈춥니다.
+    """
+    context = source.get_connection()
+    connection = await run_blocking(context.__enter__)
+    try:
+        yield connection
+    finally:
+        await run_blocking(context.__exit__, None, None, None)
+
 # 의존성 함수
 def get_db():
-    """FastAPI Dependency로 DB 연결 제공"""
-    return db_manager.get_connection()
+    """FastAPI Dependency로 DB 연결 제공 (읽기 전용 분석: 복제본 우선, async with로 사용)"""
+    return checkout(read_db)
+
+def get_sql_db():
+    """SQL 에이전트 쿼리용 DB 연결 제공 (별도 풀, async with로 사용)"""
+    if sql_db_manager is None:
+        raise HTTPException(status_code=503, detail="SQL 에이전트 계정이 설정되지 않아 SQL 조회를 사용할 수 없습니다")
+    return checkout(sql_db_manager)
+
 
+def validate_metadata_columns(benchmark: str, columns: List[str], include_response_stats: bool = False):
+    """벤치마크에서 허용된 메타데이터 컬럼인지 검증 (동적 SQL에 들어가므로 필수)
 
-def build_analysis_query(benchmark: str, models: List[str], metadata_columns: List[str]) -> Tuple[str, List[str]]:
+    include_response_stats가 True이면 /analysis 그룹화용 응답 통계 차원도 허용
+    """
+    is_valid = Config.is_valid_group_column if include_response_stats else Config.is_valid_metadata
+    invalid_columns = [col for col in columns if not is_valid(benchmark, col)]
+    if invalid_columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"[{benchmark}] 유효하지 않은 메타데이터: {invalid_columns}"
+        )
+
+def build_analysis_query(
+    benchmark: str,
+    models: List[str],
+    metadata_columns: List[str],
+    metrics: Optional[List[str]] = None,
+    filters: Optional[List[MetadataFilter]] = None
+) -> Tuple[str, List[str]]:
     """단일 벤치마크에 대한 동적 SQL 쿼리 생성 - 모델별 개별 점수 지원"""
     table_name = Config.get_table_name(benchmark)
     
-    where_conditions = []
-    params = []
+    # 메타데이터 필터 - 인덱스를 탈 수 있는 선택적 조건이 앞에 오도록 계획
+    where_conditions, params, index_hint = plan_filters(benchmark, filters or [])
+    
+    # 응답 통계 지표 (적재 시 계산된 좁은 컬럼의 평균)
+    metric_columns = [f"AVG({metric}) as avg_{metric}" for metric in (metrics or [])]
     
     # 모델 필터
     model_placeholders = ', '.join(['%s'] * len(models))
@@ -141,7 +583,7 @@ def build_analysis_query(benchmark: str, models: List[str], metadata_columns: Li
             "model_name",  # 모델명 추가
             "AVG(match_score) as avg_match_score",
             "COUNT(*) as total_questions"
-        ]
+        ] + metric_columns
         
         # NULL 값 제외
         for column in metadata_columns:
@@ -152,18 +594,22 @@ def build_analysis_query(benchmark: str, models: List[str], metadata_columns: Li
         
         query = f"""
         SELECT {', '.join(select_columns)}
-        FROM {table_name}
+        FROM {table_name} {index_hint}
         WHERE {' AND '.join(where_conditions)}
         GROUP BY {', '.join(group_by_columns)}
         ORDER BY {', '.join(metadata_columns)}, avg_match_score DESC
         """
     else:
         # 메타데이터 그룹화 없이 모델별 평균
+        select_columns = [
+            "model_name",
+            "AVG(match_score) as avg_match_score",
+            "COUNT(*) as total_questions"
+        ] + metric_columns
+        
         query = f"""
-        SELECT model_name,
-            AVG(match_score) as avg_match_score,
-            COUNT(*) as total_questions
-        FROM {table_name}
+        SELECT {', '.join(select_columns)}
+        FROM {table_name} {index_hint}
         WHERE {' AND '.join(where_conditions)}
         GROUP BY model_name
         ORDER BY avg_match_score DESC
@@ -171,13 +617,29 @@ def build_analysis_query(benchmark: str, models: List[str], metadata_columns: Li
     
     return query, params
 
-def execute_benchmark_analysis(connection, benchmark: str, models: List[str], metadata_columns: List[str]) -> Dict[str, Any]:
+def extract_metric_values(row: Dict[str, Any], metrics: List[str]) -> Dict[str, Optional[float]]:
+    """쿼리 결과 행에서 응답 통계 지표 평균값 추출"""
+    values = {}
+    for metric in metrics:
+        value = row.get(f"avg_{metric}")
+        values[f"avg_{metric}"] = round(float(value), 4) if value is not None else None
+    return values
+
+def execute_benchmark_analysis(
+    connection,
+    benchmark: str,
+    models: List[str],
+    metadata_columns: List[str],
+    metrics: Optional[List[str]] = None,
+    filters: Optional[List[MetadataFilter]] = None
+) -> Dict[str, Any]:
     """단일 벤치마크 분석 실행 - 모델별 개별 결과 처리"""
     cursor = connection.cursor(dictionary=True)
+    metrics = metrics or []
     
     try:
         # 쿼리 생성 및 실행
-        query, params = build_analysis_query(benchmark, models, metadata_columns)
+        query, params = build_analysis_query(benchmark, models, metadata_columns, metrics, filters)
         logger.info(f"[{benchmark}] 실행할 쿼리: {query}")
         
         cursor.execute(query, params)
@@ -194,6 +656,7 @@ def execute_benchmark_analysis(connection, benchmark: str, models: List[str], me
                     "models": [row["model_name"]],  # 단일 모델
                     "benchmark": benchmark
                 }
+                result_item.update(extract_metric_values(row, metrics))
                 processed_results.append(result_item)
             
             # 요약 통계 계산
@@ -234,7 +697,8 @@ def execute_benchmark_analysis(connection, benchmark: str, models: List[str], me
                 model_name = row["model_name"]
                 metadata_groups[metadata_key]['models'][model_name] = {
                     'score': round(float(row["avg_match_score"]), 4),
-                    'questions': row["total_questions"]
+                    'questions': row["total_questions"],
+                    **extract_metric_values(row, metrics)
                 }
                 metadata_groups[metadata_key]['total_questions'] += row["total_questions"]
             
@@ -256,6 +720,16 @@ def execute_benchmark_analysis(connection, benchmark: str, models: List[str], me
                 result_item['avg_match_score'] = round(sum(scores) / len(scores), 4)
                 result_item['total_questions'] = group_data['total_questions'] // len(group_data['models'])  # 중복 제거
                 
+                # 응답 통계 지표의 모델 간 평균
+                for metric in metrics:
+                    metric_values = [
+                        model_data[f"avg_{metric}"] for model_data in group_data['models'].values()
+                        if model_data[f"avg_{metric}"] is not None
+                    ]
+                    result_item[f"avg_{metric}"] = (
+                        round(sum(metric_values) / len(metric_values), 4) if metric_values else None
+                    )
+                
                 # 참여 모델 리스트
                 result_item['models'] = list(group_data['models'].keys())
                 result_item['benchmark'] = benchmark
@@ -284,6 +758,8 @@ def execute_benchmark_analysis(connection, benchmark: str, models: List[str], me
         return {
             "benchmark": benchmark,
             "metadata_columns": metadata_columns,
+            "filters": [f.model_dump() for f in (filters or [])],
+            "metrics": metrics,
             "results": processed_results,
             "summary": summary
         }
@@ -301,8 +777,31 @@ async def root():
         "message": "AI 평가 데이터 분석 API",
         "version": "1.0.0",
         "status": "running",
-        "features": ["connection_pool", "multi_benchmark_support", "dynamic_metadata", "pandas_style_groupby"]
+        "features": ["connection_pool", "multi_benchmark_support", "dynamic_metadata", "pandas_style_groupby", "outlier_detection", "choice_bias", "text_search", "semantic_search", "readonly_sql", "async_jobs", "admission_control", "read_replica_routing", "prometheus_metrics", "request_profiling"]
+    }
+
+def build_catalog() -> Dict[str, Any]:
+    """모델/벤치마크/메타데이터 카탈로그 (Config 기준 정적 데이터, 내용 해시를 버전으로 사용)"""
+    catalog = {
+        "models": Config.MODELS,
+        "benchmarks": Config.BENCHMARKS,
+        "metadata": {benchmark: Config.get_available_metadata(benchmark) for benchmark in Config.BENCHMARKS},
+        # /analysis 그룹화에만 쓸 수 있는 응답 통계 차원 (모든 벤치마크 공통)
+        "response_stat_dimensions": Config.RESPONSE_STAT_DIMENSIONS,
+        "metrics": Config.RESPONSE_STAT_METRICS
     }
+    version = hashlib.sha256(json.dumps(catalog, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return {"version": version, **catalog}
+
+CATALOG = build_catalog()
+
+@app.get("/catalog")
+async def get_catalog(request: Request):
+    """카탈로그 전체 (클라이언트 캐시용, If-None-Match가 현재 버전이면 304)"""
+    etag = f'"{CATALOG["version"]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return InstrumentedJSONResponse(CATALOG, headers={"ETag": etag})
 
 @app.get("/models", response_model=List[str])
 async def get_models():
@@ -335,111 +834,426 @@ async def get_metadata_options(benchmark: str, level1_selected: List[str]):
         level2_options=level2_options
     )
 
+@app.get("/benchmarks/{benchmark}/choice-bias")
+async def get_choice_bias(
+    benchmark: str,
+    models: List[SupportedModels] = Query(default=[], description="분석할 모델 리스트 (비어 있으면 전체 모델)"),
+    metadata_column: str = Query(default='', description="그룹화할 메타데이터 컬럼 (비어 있으면 모델별 전체)"),
+    db_conn=Depends(get_db)
+):
+    """적재 시점에 집계된 선택지 응답 분포로 위치 편향/카이제곱 통계 반환"""
+    if not Config.is_valid_benchmark(benchmark):
+        raise HTTPException(status_code=404, detail=f"벤치마크를 찾을 수 없습니다: {benchmark}")
+    if not Config.is_multiple_choice(benchmark):
+        raise HTTPException(status_code=400, detail=f"선택지 기반 벤치마크가 아닙니다: {benchmark}")
+    if metadata_column and not Config.is_valid_metadata(benchmark, metadata_column):
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 메타데이터: {metadata_column}")
+
+    model_names = [model.value for model in models] or Config.MODELS
+
+    cost = estimate_analysis_cost({benchmark: [metadata_column] if metadata_column else []}, len(model_names))
+    async with analysis_admission.admit(cost):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(execute_choice_bias_analysis, connection, benchmark, model_names, metadata_column))
+            except Exception as e:
+                logger.error(f"선택지 편향 분석 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"선택지 편향 분석 중 오류가 발생했습니다: {str(e)}")
+
+def validate_analysis_request(request: AnalysisRequest):
+    """분석 요청의 지표/메타데이터/필터 컬럼 검증"""
+    invalid_metrics = [metric for metric in request.metrics if not Config.is_valid_metric(metric)]
+    if invalid_metrics:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 지표: {invalid_metrics}")
+
+    for benchmark in request.benchmarks:
+        validate_metadata_columns(
+            benchmark.value, request.get_metadata_for_benchmark(benchmark.value), include_response_stats=True
+        )
+        validate_metadata_columns(
+            benchmark.value,
+            [f.column for f in request.get_filters_for_benchmark(benchmark.value)],
+            include_response_stats=True
+        )
+
+def run_analysis(connection, request: AnalysisRequest, progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+    """다중 벤치마크 분석 실행 (엔드포인트와 비동기 작업에서 공통 사용)"""
+    model_names = [model.value for model in request.models]
+    results = []
+
+    # 각 벤치마크별로 분석 실행
+    for i, benchmark in enumerate(request.benchmarks):
+        benchmark_name = benchmark.value
+        metadata_columns = request.get_metadata_for_benchmark(benchmark_name)
+        filters = request.get_filters_for_benchmark(benchmark_name)
+    
+        if progress:
+            progress(i / len(request.benchmarks), f"[{benchmark_name}] 분석 중")
+        logger.info(f"[{benchmark_name}] 분석 시작 - 메타데이터: {metadata_columns}, 필터: {len(filters)}개")
+    
+        # 개별 벤치마크 분석
+        benchmark_result = execute_benchmark_analysis(
+            connection, 
+            benchmark_name, 
+            model_names, 
+            metadata_columns,
+            request.metrics,
+            filters
+        )
+    
+        if request.response_format == FORMAT_COLUMNAR:
+            benchmark_result = benchmark_result_to_columnar(benchmark_result)
+        results.append(benchmark_result)
+        if not filters:
+            # 다음 요청의 비용 추정을 위해 실제 그룹 수 기록
+            cardinality_estimator.record(benchmark_name, metadata_columns, benchmark_result["summary"]["total_groups"])
+        logger.info(f"[{benchmark_name}] 분석 완료 - {benchmark_result['summary']['total_groups']}개 그룹")
+
+    # 전체 요약 정보 생성
+    total_summary = {
+        "total_benchmarks": len(request.benchmarks),
+        "benchmarks_analyzed": [r["benchmark"] for r in results],
+        "total_result_groups": sum(r["summary"]["total_groups"] for r in results),
+        "models_analyzed": model_names,
+        "analysis_type": "multi_benchmark" if len(request.benchmarks) > 1 else "single_benchmark"
+    }
+
+    return {
+        "summary": total_summary,
+        "benchmark_results": results
+    }
+
+def estimate_analysis_request_cost(request: AnalysisRequest) -> int:
+    """분석 요청 비용 (벤치마크별 모델 수 x 예상 그룹 수)"""
+    return estimate_analysis_cost(
+        {b.value: request.get_metadata_for_benchmark(b.value) for b in request.benchmarks},
+        len(request.models)
+    )
+
+def estimate_outlier_request_cost(request: OutlierRequest) -> int:
+    """이상치 탐지 비용 (메타데이터 컬럼마다 그룹별 집계)"""
+    benchmark_name, model_names, metadata_columns = prepare_outlier_request(request)
+    return sum(estimate_analysis_cost({benchmark_name: [col]}, len(model_names)) for col in metadata_columns)
+
+def estimate_bootstrap_request_cost(request: BootstrapRequest) -> int:
+    """부트스트랩 비용 (벤치마크 수 x 모델 수 x 재표본 블록 수)"""
+    benchmark_count = len(request.benchmarks) or len(Config.BENCHMARKS)
+    model_count = len(request.models) or len(Config.MODELS)
+    return benchmark_count * model_count * max(1, request.n_resamples // 100)
+
+def prepare_outlier_request(request: OutlierRequest) -> Tuple[str, List[str], List[str]]:
+    """이상치 탐지 요청 검증 후 (벤치마크, 모델, 메타데이터 컬럼) 반환"""
+    benchmark_name = request.benchmark.value
+    model_names = [model.value for model in request.models] or Config.MODELS
+    if len(model_names) < 2:
+        raise HTTPException(status_code=400, detail="이상치 탐지에는 최소 두 개의 모델이 필요합니다.")
+
+    metadata_columns = request.metadata_columns or Config.get_available_metadata(benchmark_name)
+    validate_metadata_columns(benchmark_name, metadata_columns)
+    return benchmark_name, model_names, metadata_columns
+
+def run_outlier_analysis(connection, request: OutlierRequest) -> Dict[str, Any]:
+    """이상치 탐지 실행 (엔드포인트와 비동기 작업에서 공통 사용)"""
+    benchmark_name, model_names, metadata_columns = prepare_outlier_request(request)
+    logger.info(f"[{benchmark_name}] 이상치 탐지 시작 - 메타데이터: {metadata_columns}")
+    result = execute_outlier_analysis(
+        connection,
+        benchmark_name,
+        model_names,
+        metadata_columns,
+        top_k=request.top_k,
+        min_questions=request.min_questions
+    )
+    logger.info(f"[{benchmark_name}] 이상치 탐지 완료 - 가장 특이한 모델: {result['most_unusual_model']}")
+    return result
+
+def run_bootstrap_analysis(connection, request: BootstrapRequest, progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+    """부트스트랩 신뢰구간 분석 실행 (엔드포인트와 비동기 작업에서 공통 사용)"""
+    return execute_bootstrap_analysis(
+        connection,
+        [benchmark.value for benchmark in request.benchmarks] or Config.BENCHMARKS,
+        [model.value for model in request.models] or Config.MODELS,
+        request.n_resamples,
+        request.confidence,
+        request.seed,
+        progress
+    )
+
 @app.post("/analysis")
 async def analyze_performance(request: AnalysisRequest, db_conn=Depends(get_db)):
     """다중 벤치마크 메타데이터별 성능 분석"""
+    validate_analysis_request(request)
     
+    async with analysis_admission.admit(estimate_analysis_request_cost(request)):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(run_analysis, connection, request))
+            
+            except Exception as e:
+                logger.error(f"분석 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"분석 실행 중 오류가 발생했습니다: {str(e)}")
 
-    model_names = [model.value for model in request.models]
-    results = []
+@app.post("/analysis/outliers")
+async def analyze_outliers(request: OutlierRequest, db_conn=Depends(get_db)):
+    """메타데이터 그룹별 교차 모델 기대값 대비 특이 경향 상위 K개 탐지"""
+    async with analysis_admission.admit(estimate_outlier_request_cost(request)):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(run_outlier_analysis, connection, request))
+
+            except Exception as e:
+                logger.error(f"이상치 탐지 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"이상치 탐지 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/analysis/bootstrap")
+async def analyze_bootstrap(request: BootstrapRequest, db_conn=Depends(get_db)):
+    """모델별 평균 점수의 부트스트랩 신뢰구간 (규모가 크면 /jobs 사용 권장)"""
+    async with analysis_admission.admit(estimate_bootstrap_request_cost(request)):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(run_bootstrap_analysis, connection, request))
+
+            except Exception as e:
+                logger.error(f"부트스트랩 분석 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"부트스트랩 분석 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/analysis/questions")
+async def drill_down_questions(request: DrillDownRequest, db_conn=Depends(get_db)):
+    """그룹을 구성하는 문항 행을 (data_id, model_name) 키셋 페이지네이션으로 조회"""
+    benchmark_name = request.benchmark.value
+    model_names = [model.value for model in request.models] or Config.MODELS
+
+    # /analysis 그룹의 문항을 조회하므로 그룹화와 같은 컬럼 허용
+    validate_metadata_columns(benchmark_name, [f.column for f in request.filters], include_response_stats=True)
+    invalid_columns = [
+        col for col in request.columns
+        if not (Config.is_valid_group_column(benchmark_name, col) or Config.is_valid_metric(col))
+    ]
+    if invalid_columns:
+        raise HTTPException(status_code=400, detail=f"[{benchmark_name}] 조회할 수 없는 컬럼: {invalid_columns}")
+
+    text_columns = [col for col in TEXT_COLUMNS if col in request.include_text]
+
+    async with analysis_admission.admit(request.limit * (1 + len(text_columns))):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(
+                    execute_drilldown,
+                    connection,
+                    benchmark_name,
+                    model_names,
+                    request.filters,
+                    request.columns,
+                    text_columns,
+                    request.limit,
+                    request.cursor
+                ))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                logger.error(f"드릴다운 조회 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"드릴다운 조회 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/search/text")
+async def search_text(request: TextSearchRequest, db_conn=Depends(get_db)):
+    """로컬 역색인으로 문항을 검색하고 모델별 정답 수와 결합 (예: 특정 주제 중 정답 모델이 3개 미만인 문항)"""
+    benchmark_name = request.benchmark.value
+    model_names = [model.value for model in request.models] or Config.MODELS
+
+    async with analysis_admission.admit(len(model_names)):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(
+                    search_with_scores,
+                    connection,
+                    benchmark_name,
+                    request.query,
+                    request.field,
+                    model_names,
+                    request.min_models_correct,
+                    request.max_models_correct,
+                    request.limit
+                ))
+            except FileNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except Exception as e:
+                logger.error(f"전문 검색 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"전문 검색 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/search/semantic")
+async def search_semantic(request: SemanticSearchRequest):
+    """벡터 색인으로 의미상 유사한 문항 검색 (data_id + 코사인 유사도, DB 조회 없음)"""
+    try:
+        return await run_blocking(semantic_search, request.benchmark.value, request.query, request.top_k)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"의미 검색 중 오류 발생: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"의미 검색 중 오류가 발생했습니다: {str(e)}")
+
+@app.post("/search/semantic/batch")
+async def search_semantic_batch(request: MultiQuerySearchRequest, db_conn=Depends(get_db)):
+    """여러 질의를 한 번에 검색해 고유 문항 top_n개를 모으고, 그 문항들에서 모델별 성능 비교"""
+    model_names = [model.value for model in request.models] or Config.MODELS
+
+    async with analysis_admission.admit(len(model_names) * len(request.queries)):
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(
+                    multi_query_search_with_scores,
+                    connection,
+                    request.benchmark.value,
+                    request.queries,
+                    model_names,
+                    request.top_n
+                ))
+            except FileNotFoundError as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except Exception as e:
+                logger.error(f"다중 질의 검색 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"다중 질의 검색 중 오류가 발생했습니다: {str(e)}")
+
+@app.get("/sql/schema")
+async def get_sql_schema():
+    """SQL 에이전트가 조회할 수 있는 테이블과 컬럼 목록"""
+    return {
+        "tables": get_allowed_tables(),
+        "max_rows": Config.SQL_MAX_ROWS,
+        "max_execution_ms": Config.SQL_MAX_EXECUTION_MS
+    }
+
+@app.post("/sql")
+async def run_sql(request: SQLQueryRequest, db_conn=Depends(get_sql_db)):
+    """에이전트가 작성한 SELECT 문을 검증 후 읽기 전용으로 실행 (LIMIT, 실행 시간 제한 강제)"""
+    async with sql_admission.admit():
+        async with db_conn as connection:
+            try:
+                return InstrumentedJSONResponse(await run_blocking(
+                    execute_readonly_query, connection, request.query, request.max_rows, request.use_cache
+                ))
+            except SQLValidationError as e:
+                raise HTTPException(status_code=400, detail=f"허용되지 않는 쿼리: {str(e)}")
+            except Error as e:
+                # 문법 오류, 실행 시간 초과(3024) 등 쿼리 자체의 문제
+                logger.warning(f"SQL 실행 실패: {str(e)}")
+                raise HTTPException(status_code=400, detail=f"쿼리 실행 실패: {str(e)}")
+            except Exception as e:
+                logger.error(f"SQL 실행 중 오류 발생: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"SQL 실행 중 오류가 발생했습니다: {str(e)}")
+
+def fetch_analysis_summary(connection) -> Dict[str, Any]:
+    """벤치마크별 레코드 수/모델 수/점수 분포 요약"""
+    cursor = connection.cursor(dictionary=True)
+    summary = {}
     
-    with db_conn as connection:
-        try:
-            # 각 벤치마크별로 분석 실행
-            for benchmark in request.benchmarks:
-                benchmark_name = benchmark.value
-                metadata_columns = request.get_metadata_for_benchmark(benchmark_name)
-                
-                logger.info(f"[{benchmark_name}] 분석 시작 - 메타데이터: {metadata_columns}")
-                
-                # 개별 벤치마크 분석
-                benchmark_result = execute_benchmark_analysis(
-                    connection, 
-                    benchmark_name, 
-                    model_names, 
-                    metadata_columns
-                )
-                
-                results.append(benchmark_result)
-                logger.info(f"[{benchmark_name}] 분석 완료 - {len(benchmark_result['results'])}개 결과")
-            
-            # 전체 요약 정보 생성
-            total_summary = {
-                "total_benchmarks": len(request.benchmarks),
-                "benchmarks_analyzed": [r["benchmark"] for r in results],
-                "total_result_groups": sum(r["summary"]["total_groups"] for r in results),
-                "models_analyzed": model_names,
-                "analysis_type": "multi_benchmark" if len(request.benchmarks) > 1 else "single_benchmark"
-            }
-            
-            return {
-                "summary": total_summary,
-                "benchmark_results": results
-            }
+    try:
+        for benchmark in Config.BENCHMARKS:
+            table_name = Config.get_table_name(benchmark)
             
-        except Exception as e:
-            logger.error(f"분석 중 오류 발생: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"분석 실행 중 오류가 발생했습니다: {str(e)}")
+            try:
+                cursor.execute(f"""
+                        SELECT
+                            COUNT(*) as total_records,
+                            COUNT(DISTINCT model_name) as unique_models,
+                            AVG(match_score) as avg_score,
+                            STDDEV(match_score) as std_score,
+                            -- 분위수 계산 (MySQL 8.0+)
+                            PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY match_score) as q1_score,
+                            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY match_score) as median_score,
+                            PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY match_score) as q3_score
+                        FROM {table_name}
+                """)
+                
+                result = cursor.fetchone()
+                if result and result['total_records'] > 0:
+                    summary[benchmark] = {
+                        "total_records": result['total_records'],
+                        "unique_models": result['unique_models'], 
+                        "avg_score": round(float(result['avg_score']), 4),
+                        "std_score": round(float(result['std_score']), 4),
+                        "q1_score": round(float(result['q1_score']), 4),
+                        "median_score": round(float(result['median_score']), 4),
+                        "q3_score": round(float(result['q3_score']), 4),
+                        "table_name": table_name,
+                        "available_metadata": Config.get_available_metadata(benchmark)
+                    }
+            except Error as table_error:
+                logger.warning(f"테이블 {table_name} 조회 실패: {table_error}")
+                summary[benchmark] = {
+                    "error": f"테이블 조회 실패: {str(table_error)}",
+                    "table_name": table_name
+                }
+        
+        return summary
+        
+    finally:
+        cursor.close()
 
 @app.get("/analysis/summary")
 async def get_analysis_summary(db_conn=Depends(get_db)):
     """전체 데이터 요약 정보"""
-    with db_conn as connection:
-        cursor = connection.cursor(dictionary=True)
-        summary = {}
-        
-        try:
-            for benchmark in Config.BENCHMARKS:
-                table_name = Config.get_table_name(benchmark)
-                
-                try:
-                    cursor.execute(f"""
-                            SELECT
-                                COUNT(*) as total_records,
-                                COUNT(DISTINCT model_name) as unique_models,
-                                AVG(match_score) as avg_score,
-                                STDDEV(match_score) as std_score,
-                                -- 분위수 계산 (MySQL 8.0+)
-                                PERCENTILE_CONT(0.25) WITHIN GROUP (ORDER BY match_score) as q1_score,
-                                PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY match_score) as median_score,
-                                PERCENTILE_CONT(0.75) WITHIN GROUP (ORDER BY match_score) as q3_score
-                            FROM {table_name}
-                    """)
-                    
-                    result = cursor.fetchone()
-                    if result and result['total_records'] > 0:
-                        summary[benchmark] = {
-                            "total_records": result['total_records'],
-                            "unique_models": result['unique_models'], 
-                            "avg_score": round(float(result['avg_score']), 4),
-                            "std_score": round(float(result['std_score']), 4),
-                            "q1_score": round(float(result['q1_score']), 4),
-                            "median_score": round(float(result['median_score']), 4),
-                            "q3_score": round(float(result['q3_score']), 4),
-                            "table_name": table_name,
-                            "available_metadata": Config.get_available_metadata(benchmark)
-                        }
-                except Error as table_error:
-                    logger.warning(f"테이블 {table_name} 조회 실패: {table_error}")
-                    summary[benchmark] = {
-                        "error": f"테이블 조회 실패: {str(table_error)}",
-                        "table_name": table_name
-                    }
-            
-            return summary
-            
-        finally:
-            cursor.close()
+    async with db_conn as connection:
+        return await run_blocking(fetch_analysis_summary, connection)
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    """요청 수용 제어 현황 (동시 실행/대기/거절 수)"""
+    return {"controllers": [analysis_admission.stats(), sql_admission.stats()]}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus 텍스트 형식 지표 (라우트 지연 시간, 쿼리 지문별 실행 시간/행 수, 직렬화 시간, 캐시 적중률, 풀/수용 제어 상태)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/queries")
+async def get_metric_queries():
+    """쿼리 지문 -> 정규화된 쿼리 (지표 레이블 해석용)"""
+    return get_query_fingerprints()
+
+def _get_profile_store() -> ProfileStore:
+    if profile_store is None:
+        raise HTTPException(status_code=404, detail="프로파일링이 비활성화되어 있습니다 (PROFILING_ENABLED)")
+    return profile_store
+
+@app.get("/profiles")
+async def list_profiles(limit: int = Query(default=50, ge=1, le=500)):
+    """저장된 요청 프로파일 목록"""
+    return _get_profile_store().list_profiles(limit)
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """요청 프로파일 보고서 (단계별 시간 + 상위 함수)"""
+    store = _get_profile_store()
+    if not profile_id.isalnum():
+        raise HTTPException(status_code=400, detail=f"잘못된 프로파일 ID: {profile_id}")
+    try:
+        return store.load(profile_id)
+    except OSError:
+        raise HTTPException(status_code=404, detail=f"프로파일을 찾을 수 없습니다: {profile_id}")
+
+@app.get("/profiles/{profile_id}/pstats")
+async def download_profile_pstats(profile_id: str):
+    """cProfile 덤프 다운로드 (snakeviz, pstats 등으로 분석)"""
+    store = _get_profile_store()
+    path = store.pstats_path(profile_id)
+    if not profile_id.isalnum() or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"프로파일 덤프를 찾을 수 없습니다: {profile_id}")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+def ping_database(connection):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    finally:
+        cursor.close()
 
 @app.get("/health")
 async def health_check():
     """서버 상태 확인"""
     try:
-        with db_manager.get_connection() as connection:
-            cursor = connection.cursor()
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-            cursor.close()
+        async with checkout(db_manager) as connection:
+            await run_blocking(ping_database, connection)
         db_status = "healthy"
     except Exception as e:
         logger.error(f"데이터베이스 연결 테스트 실패: {e}")
@@ -449,20 +1263,107 @@ async def health_check():
         "status": "healthy" if db_status == "healthy" else "degraded",
         "database": db_status,
         "message": "서버가 정상적으로 실행 중입니다.",
-        "connection_pool": "active"
+        "connection_pool": "active",
+        "read_routing": read_db.stats()
     }
 
+@app.get("/db/pools")
+async def get_pool_stats():
+    """연결 풀 설정과 사용 지표 (체크아웃 대기, 사용 중 연결, 타임아웃, 재연결)"""
+    managers = [db_manager, replica_db_manager, sql_db_manager]
+    return {
+        "pools": [manager.stats() for manager in managers if manager is not None],
+        "read_routing": read_db.stats()
+    }
+
+# 비동기 작업 관리자 (종류별 요청 모델과 실행 함수)
+JOB_REQUEST_MODELS: Dict[str, type] = {
+    'analysis': AnalysisRequest,
+    'outliers': OutlierRequest,
+    'bootstrap': BootstrapRequest
+}
+
+job_manager = JobManager(Config.JOBS_DIR, max_workers=Config.JOB_WORKERS, result_ttl=Config.JOB_RESULT_TTL)
+
+def _run_analysis_job(params: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    with read_db.get_connection() as connection:
+        return run_analysis(connection, AnalysisRequest.model_validate(params), progress)
+
+def _run_outliers_job(params: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    with read_db.get_connection() as connection:
+        return run_outlier_analysis(connection, OutlierRequest.model_validate(params))
+
+def _run_bootstrap_job(params: Dict[str, Any], progress: Callable[[float, str], None]) -> Dict[str, Any]:
+    with read_db.get_connection() as connection:
+        return run_bootstrap_analysis(connection, BootstrapRequest.model_validate(params), progress)
+
+job_manager.register('analysis', _run_analysis_job)
+job_manager.register('outliers', _run_outliers_job)
+job_manager.register('bootstrap', _run_bootstrap_job)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """무거운 분석을 작업으로 등록하고 작업 ID 반환 (같은 작업이 진행 중/완료 상태면 재사용)"""
+    try:
+        parsed = JOB_REQUEST_MODELS[request.kind].model_validate(request.params)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 작업 파라미터: {str(e)}")
+    
+    if request.kind == 'analysis':
+        validate_analysis_request(parsed)
+    elif request.kind == 'outliers':
+        prepare_outlier_request(parsed)
+    
+    job, deduplicated = job_manager.submit(request.kind, parsed.model_dump(mode='json'))
+    return {**job.to_dict(), "deduplicated": deduplicated}
+
+@app.get("/jobs")
+async def list_jobs(limit: int = Query(default=50, ge=1, le=500)):
+    """최근 작업 목록"""
+    return [job.to_dict() for job in job_manager.list_jobs(limit)]
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태와 진행률 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """완료된 작업 결과 조회"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"작업을 찾을 수 없습니다: {job_id}")
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"작업이 실패했습니다: {job.error}")
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"작업이 아직 완료되지 않았습니다 (상태: {job.status}, 진행률: {job.progress})")
+    
+    try:
+        return InstrumentedJSONResponse(job_manager.load_result(job_id))
+    except OSError as e:
+        raise HTTPException(status_code=410, detail=f"작업 결과가 삭제되었습니다: {str(e)}")
+
 @app.on_event("startup")
 async def startup_event():
     """앱 시작 시 실행"""
     logger.info("AI 평가 API 서버 시작")
     logger.info(f"Connection Pool 설정 완료: {mysql_config.host}:{mysql_config.port}")
+    if replica_db_manager:
+        logger.info(f"읽기 전용 복제본 사용: {replica_mysql_config.host}:{replica_mysql_config.port}")
 
 @app.on_event("shutdown") 
 async def shutdown_event():
     """앱 종료 시 실행"""
     logger.info("AI 평가 API 서버 종료")
     db_manager.close_pool()
+    if replica_db_manager:
+        replica_db_manager.close_pool()
+    if sql_db_manager:
+        sql_db_manager.close_pool()
+    job_manager.shutdown()
 
 if __name__ == "__main__":
     import uvicorn
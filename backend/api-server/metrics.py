@@ -0,0 +1,350 @@
+"""
+Prometheus 형식 지표 모듈
+
+요청 경로에 부담을 주지 않도록 외부 라이브러리 없이 고정 버킷 히스토그램과 카운터만
+프로세스 메모리에 누적하고, /metrics 요청 시에만 텍스트 형식으로 변환합니다.
+
+- 라우트별 응답 시간 히스토그램 (경로 템플릿 기준, 상태 코드 구분)
+- 쿼리 지문(리터럴/IN 목록을 정규화한 SQL)별 실행 시간 히스토그램과 반환 행 수
+  (지문 수는 METRICS_MAX_FINGERPRINTS까지, 넘는 형태는 'other' 하나로 집계)
+- 응답 직렬화 시간
+- 캐시 적중률 (cache.TTLCache 전체)
+"""
+from typing import List, Dict, Any, Tuple, Optional, Callable
+from contextvars import ContextVar
+import bisect
+import hashlib
+import os
+import re
+import threading
+import time
+
+from fastapi.responses import JSONResponse
+
+from profiling import record_phase
+from serialization import dumps
+
+# 기본 히스토그램 버킷 (초)
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+LabelValues = Tuple[str, ...]
+
+_INF_LABEL = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블별 누적 카운터"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """레이블별 고정 버킷 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        # 레이블 -> [버킷별 개수..., 합계, 전체 개수]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, labels, _INF_LABEL)} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 모음 + 수집 시점에 값을 읽는 게이지 콜백"""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+        # (이름, 설명, 레이블 이름, 콜백 -> [(레이블 값, 값)])
+        self._gauges: List[Tuple[str, str, Tuple[str, ...], Callable[[], List[Tuple[LabelValues, float]]]]] = []
+
+    def counter(self, name: str, help_text: str, label_names: Tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, label_names: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge_callback(self, name: str, help_text: str, label_names: Tuple[str, ...], callback: Callable[[], List[Tuple[LabelValues, float]]]):
+        self._gauges.append((name, help_text, label_names, callback))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, help_text, label_names, callback in self._gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in callback():
+                lines.append(f"{name}{_format_labels(label_names, labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+request_latency = registry.histogram(
+    'ai_eval_http_request_duration_seconds', '라우트별 요청 처리 시간', ('method', 'route', 'status')
+)
+serialization_latency = registry.histogram(
+    'ai_eval_response_serialization_seconds', '응답 본문 직렬화 시간', ('route',)
+)
+response_bytes = registry.counter(
+    'ai_eval_response_bytes_total', '응답 본문 크기 합계', ('route',)
+)
+query_latency = registry.histogram(
+    'ai_eval_query_execute_seconds', '쿼리 지문별 실행 시간 (execute 호출)', ('fingerprint',)
+)
+query_fetch_seconds = registry.counter(
+    'ai_eval_query_fetch_seconds_total', '쿼리 지문별 결과 행 수신 시간 합계', ('fingerprint',)
+)
+query_rows = registry.counter(
+    'ai_eval_query_rows_returned_total', '쿼리 지문별 반환 행 수', ('fingerprint',)
+)
+query_errors = registry.counter(
+    'ai_eval_query_errors_total', '쿼리 지문별 실행 오류 수', ('fingerprint',)
+)
+
+# 지문 -> 정규화된 쿼리 (레이블에는 짧은 해시만 사용하고 원문은 /metrics/queries로 제공)
+_fingerprints: Dict[str, str] = {}
+_fingerprint_lock = threading.Lock()
+_fingerprint_memo: Dict[str, str] = {}
+MAX_FINGERPRINT_MEMO = 4096
+
+# 레이블로 쓰는 지문 수 상한 (시계열 수 제한), 초과한 쿼리 형태는 OVERFLOW_FINGERPRINT로 집계
+MAX_FINGERPRINTS = int(os.getenv('METRICS_MAX_FINGERPRINTS', 500))
+OVERFLOW_FINGERPRINT = 'other'
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """리터럴과 IN 목록 길이를 지운 쿼리 형태"""
+    normalized = _STRING_LITERAL.sub('?', query)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _IN_LIST.sub('IN (...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def fingerprint_query(query: str) -> str:
+    """쿼리 지문 (정규화된 쿼리의 짧은 해시, 지문 수가 상한에 도달한 뒤 새 형태는 OVERFLOW_FINGERPRINT)"""
+    fingerprint = _fingerprint_memo.get(query)
+    if fingerprint is not None:
+        return fingerprint
+
+    normalized = normalize_query(query)
+    fingerprint = hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:12]
+    with _fingerprint_lock:
+        if fingerprint not in _fingerprints:
+            if len(_fingerprints) >= MAX_FINGERPRINTS:
+                fingerprint = OVERFLOW_FINGERPRINT
+            else:
+                _fingerprints[fingerprint] = normalized
+        if len(_fingerprint_memo) >= MAX_FINGERPRINT_MEMO:
+            _fingerprint_memo.clear()
+        _fingerprint_memo[query] = fingerprint
+    return fingerprint
+
+
+def get_query_fingerprints() -> Dict[str, str]:
+    """지문 -> 정규화된 쿼리"""
+    with _fingerprint_lock:
+        return dict(_fingerprints)
+
+
+class InstrumentedCursor:
+    """execute/fetch 시간과 반환 행 수를 쿼리 지문별로 기록하는 커서 래퍼 (label이 있으면 지문 대신 고정 레이블)"""
+
+    def __init__(self, cursor, label: Optional[str] = None):
+        self._cursor = cursor
+        self._label = label
+        self._fingerprint: Optional[str] = None
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self._fingerprint = self._label or fingerprint_query(operation)
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        except Exception:
+            query_errors.inc((self._fingerprint,))
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            query_latency.observe(elapsed, (self._fingerprint,))
+            record_phase('execute', elapsed)
+
+    def _timed_fetch(self, fetch: Callable, *args):
+        started = time.perf_counter()
+        result = fetch(*args)
+        elapsed = time.perf_counter() - started
+        record_phase('fetch', elapsed)
+        if self._fingerprint is not None:
+            query_fetch_seconds.inc((self._fingerprint,), elapsed)
+            if isinstance(result, list):
+                query_rows.inc((self._fingerprint,), len(result))
+            elif result is not None:
+                query_rows.inc((self._fingerprint,))
+        return result
+
+    def fetchall(self):
+        return self._timed_fetch(self._cursor.fetchall)
+
+    def fetchmany(self, *args):
+        return self._timed_fetch(self._cursor.fetchmany, *args)
+
+    def fetchone(self):
+        return self._timed_fetch(self._cursor.fetchone)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    """cursor()가 InstrumentedCursor를 반환하도록 감싼 연결 (나머지 속성은 그대로 위임)
+
+    label을 지정하면 쿼리 지문 대신 그 값 하나로 집계합니다 (임의 쿼리가 들어오는 SQL 에이전트 풀 등).
+    """
+
+    def __init__(self, connection, label: Optional[str] = None):
+        self._connection = connection
+        self._label = label
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._connection.cursor(*args, **kwargs), self._label)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def register_cache_metrics(get_caches: Callable[[], List[Any]]):
+    """TTLCache 목록의 적중/미스/적중률을 게이지로 노출"""
+    def collect(key: str) -> Callable[[], List[Tuple[LabelValues, float]]]:
+        return lambda: [((stats["name"],), stats[key]) for stats in (cache.stats() for cache in get_caches())]
+
+    registry.gauge_callback('ai_eval_cache_hits', '캐시 적중 수', ('cache',), collect('hits'))
+    registry.gauge_callback('ai_eval_cache_misses', '캐시 미스 수', ('cache',), collect('misses'))
+    registry.gauge_callback('ai_eval_cache_hit_ratio', '캐시 적중률', ('cache',), collect('hit_ratio'))
+    registry.gauge_callback('ai_eval_cache_entries', '캐시 항목 수', ('cache',), collect('size'))
+
+
+# 현재 요청의 ASGI scope (직렬화 지표에 라우트 레이블을 붙이기 위해 사용)
+_current_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar('metrics_scope', default=None)
+
+
+def route_label(scope: Optional[Dict[str, Any]]) -> str:
+    """경로 템플릿 레이블 (매칭되지 않은 경로는 하나로 묶어 레이블 수 제한)"""
+    route = scope.get('route') if scope else None
+    return getattr(route, 'path', None) or 'unmatched'
+
+
+class MetricsMiddleware:
+    """라우트별 요청 처리 시간을 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = ['500']
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status[0] = str(message['status'])
+            await send(message)
+
+        token = _current_scope.set(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_latency.observe(time.perf_counter() - started, (scope['method'], route_label(scope), status[0]))
+            _current_scope.reset(token)
+
+
+class InstrumentedJSONResponse(JSONResponse):
+    """본문 직렬화 시간과 크기를 기록하는 JSONResponse (serialization.dumps 사용)"""
+
+    def render(self, content: Any) -> bytes:
+        started = time.perf_counter()
+        body = dumps(content)
+        elapsed = time.perf_counter() - started
+        route = route_label(_current_scope.get())
+        serialization_latency.observe(elapsed, (route,))
+        record_phase('serialize', elapsed)
+        response_bytes.inc((route,), len(body))
+        return body
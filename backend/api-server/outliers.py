@@ -0,0 +1,170 @@
+"""
+모델 특이 경향(이상치) 탐지 모듈
+
+벤치마크의 메타데이터 그룹 x 모델 점수 행렬을 만들고, 교차 모델 기대값
+(그룹 효과 + 모델 효과) 대비 잔차와 z-score를 한 번의 벡터 연산으로 계산합니다.
+전체 피벗 테이블 대신 상위 K개의 이상치만 반환합니다.
+"""
+from typing import List, Dict, Any, Tuple
+import logging
+
+import numpy as np
+from mysql.connector import Error
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def build_group_scores_query(benchmark: str, models: List[str], metadata_column: str) -> Tuple[str, List[str]]:
+    """메타데이터 컬럼 하나에 대한 (그룹, 모델)별 평균 점수 쿼리 생성"""
+    table_name = Config.get_table_name(benchmark)
+    model_placeholders = ', '.join(['%s'] * len(models))
+
+    query = f"""
+    SELECT {metadata_column} as metadata_value,
+        model_name,
+        AVG(match_score) as avg_match_score,
+        COUNT(*) as total_questions
+    FROM {table_name}
+    WHERE model_name IN ({model_placeholders}) AND {metadata_column} IS NOT NULL
+    GROUP BY {metadata_column}, model_name
+    """
+    return query, list(models)
+
+
+def compute_group_anomalies(
+    rows: List[Dict[str, Any]],
+    models: List[str],
+    min_questions: int = 5
+) -> Dict[str, Any]:
+    """(그룹, 모델) 점수 행렬에서 잔차와 z-score 계산
+
+    기대값은 2원 가법 모형(그룹 평균 + 모델 평균 - 전체 평균)으로 구하며,
+    잔차는 전체 잔차의 표준편차로 표준화합니다.
+    """
+    groups = sorted({row["metadata_value"] for row in rows}, key=str)
+    group_index = {value: i for i, value in enumerate(groups)}
+    model_index = {model: j for j, model in enumerate(models)}
+
+    scores = np.full((len(groups), len(models)), np.nan)
+    counts = np.zeros((len(groups), len(models)), dtype=np.int64)
+    for row in rows:
+        j = model_index.get(row["model_name"])
+        if j is None:
+            continue
+        i = group_index[row["metadata_value"]]
+        scores[i, j] = float(row["avg_match_score"])
+        counts[i, j] = row["total_questions"]
+
+    # 문제 수가 적은 셀은 노이즈가 크므로 제외
+    scores[counts < min_questions] = np.nan
+    valid = ~np.isnan(scores)
+    if valid.sum() < 2 or len(groups) < 2:
+        return {"groups": groups, "scores": scores, "counts": counts, "residuals": None, "z_scores": None}
+
+    with np.errstate(invalid='ignore'):
+        group_mean = np.nanmean(scores, axis=1, keepdims=True)
+        model_mean = np.nanmean(scores, axis=0, keepdims=True)
+        grand_mean = np.nanmean(scores)
+        expected = group_mean + model_mean - grand_mean
+
+        residuals = scores - expected
+        residual_std = np.nanstd(residuals)
+        z_scores = residuals / residual_std if residual_std > 0 else np.zeros_like(residuals)
+
+        # 그룹 내 모델 간 z-score (같은 그룹에서 다른 모델 대비 얼마나 벗어났는지)
+        group_std = np.nanstd(scores, axis=1, keepdims=True)
+        within_z = np.where(group_std > 0, (scores - group_mean) / np.where(group_std > 0, group_std, 1), 0.0)
+
+    z_scores[~valid] = np.nan
+    within_z[~valid] = np.nan
+
+    return {
+        "groups": groups,
+        "scores": scores,
+        "counts": counts,
+        "expected": expected,
+        "residuals": residuals,
+        "z_scores": z_scores,
+        "within_group_z": within_z
+    }
+
+
+def execute_outlier_analysis(
+    connection,
+    benchmark: str,
+    models: List[str],
+    metadata_columns: List[str],
+    top_k: int = 10,
+    min_questions: int = 5
+) -> Dict[str, Any]:
+    """벤치마크의 모든 메타데이터 컬럼에 대해 이상치 탐지 실행"""
+    cursor = connection.cursor(dictionary=True)
+    candidates = []
+    # 모델별 표준화 잔차 제곱합/개수 (모델의 전반적인 특이도)
+    model_sq_sum = np.zeros(len(models))
+    model_cells = np.zeros(len(models), dtype=np.int64)
+    analyzed_columns = []
+
+    try:
+        for column in metadata_columns:
+            query, params = build_group_scores_query(benchmark, models, column)
+            try:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            except Error as column_error:
+                logger.warning(f"[{benchmark}] 메타데이터 '{column}' 조회 실패: {column_error}")
+                continue
+
+            result = compute_group_anomalies(rows, models, min_questions)
+            z_scores = result["z_scores"]
+            if z_scores is None:
+                continue
+            analyzed_columns.append(column)
+
+            valid = ~np.isnan(z_scores)
+            model_sq_sum += np.where(valid, z_scores ** 2, 0.0).sum(axis=0)
+            model_cells += valid.sum(axis=0)
+
+            # 컬럼별 상위 K개 후보만 추출 (argpartition으로 전체 정렬 회피)
+            abs_z = np.where(valid, np.abs(z_scores), -1.0).ravel()
+            k = min(top_k, int(valid.sum()))
+            top_flat = np.argpartition(-abs_z, k - 1)[:k]
+
+            for flat in top_flat:
+                i, j = divmod(int(flat), len(models))
+                candidates.append({
+                    "model_name": models[j],
+                    "metadata_column": column,
+                    "metadata_value": result["groups"][i],
+                    "score": round(float(result["scores"][i, j]), 4),
+                    "expected_score": round(float(result["expected"][i, j]), 4),
+                    "residual": round(float(result["residuals"][i, j]), 4),
+                    "z_score": round(float(z_scores[i, j]), 4),
+                    "within_group_z": round(float(result["within_group_z"][i, j]), 4),
+                    "total_questions": int(result["counts"][i, j]),
+                    "direction": "over" if result["residuals"][i, j] > 0 else "under"
+                })
+    finally:
+        cursor.close()
+
+    anomalies = sorted(candidates, key=lambda x: abs(x["z_score"]), reverse=True)[:top_k]
+
+    model_peculiarity = []
+    for j, model in enumerate(models):
+        if model_cells[j] > 0:
+            model_peculiarity.append({
+                "model_name": model,
+                "rms_z_score": round(float(np.sqrt(model_sq_sum[j] / model_cells[j])), 4),
+                "cells": int(model_cells[j])
+            })
+    model_peculiarity.sort(key=lambda x: x["rms_z_score"], reverse=True)
+
+    return {
+        "benchmark": benchmark,
+        "metadata_columns": analyzed_columns,
+        "anomalies": anomalies,
+        "model_peculiarity": model_peculiarity,
+        "most_unusual_model": model_peculiarity[0]["model_name"] if model_peculiarity else None
+    }
@@ -0,0 +1,269 @@
+"""
+요청 단위 프로파일링 모듈
+
+PROFILING_ENABLED일 때만 미들웨어가 등록되며, `X-Profile` 헤더 또는 `?profile=` 쿼리로
+요청한 한 건에 대해서만 cProfile과 단계별 시간(수용 대기, 풀 대기, SQL 실행, 행 수신,
+후처리, 직렬화)을 수집합니다. 프로파일링하지 않는 요청에서는 ContextVar 조회 한 번 외에
+추가 비용이 없습니다.
+
+- `X-Profile: inline` : 응답 본문을 {"result": 원래 응답, "profile": 보고서}로 감싸 반환
+- `X-Profile: 1` (또는 store) : 보고서를 PROFILE_DIR에 저장하고 X-Profile-Id / Server-Timing 헤더로 안내
+"""
+from typing import List, Dict, Any, Optional, Callable
+from contextvars import ContextVar
+from fastapi.concurrency import run_in_threadpool
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# 보고서에 표시하는 단계 순서
+PHASES = ['admission_wait', 'pool_wait', 'execute', 'fetch', 'post_process', 'serialize']
+
+MODE_INLINE = 'inline'
+MODE_STORE = 'store'
+
+_current_profile: ContextVar[Optional['RequestProfile']] = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """한 요청의 단계별 시간과 cProfile 결과"""
+
+    def __init__(self, mode: str, method: str, path: str):
+        self.profile_id = uuid.uuid4().hex[:16]
+        self.mode = mode
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.query_count = 0
+        self.profiler: Optional[cProfile.Profile] = cProfile.Profile()
+        self.profiler_error: Optional[str] = None
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        if phase == 'execute':
+            self.query_count += 1
+
+    def run(self, func: Callable, *args, **kwargs):
+        """워커 스레드에서 cProfile을 켜고 실행 (후처리 시간 = 전체 - SQL 실행/수신)"""
+        db_before = self.phases['execute'] + self.phases['fetch']
+        started = time.perf_counter()
+        enabled = False
+        if self.profiler is not None:
+            try:
+                self.profiler.enable()
+                enabled = True
+            except ValueError as e:
+                # 다른 프로파일러가 이미 동작 중이면 단계별 시간만 수집
+                self.profiler_error = str(e)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if enabled:
+                self.profiler.disable()
+            elapsed = time.perf_counter() - started
+            db_time = self.phases['execute'] + self.phases['fetch'] - db_before
+            self.phases['post_process'] += max(elapsed - db_time, 0.0)
+
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값 (ms)"""
+        return ', '.join(f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in self.phases.items())
+
+    def top_functions(self, limit: int) -> List[Dict[str, Any]]:
+        """누적 시간 기준 상위 함수"""
+        if self.profiler is None or self.profiler_error:
+            return []
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            rows.append({
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": ncalls,
+                "total_ms": round(tottime * 1000, 3),
+                "cumulative_ms": round(cumtime * 1000, 3)
+            })
+        rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+        return rows[:limit]
+
+    def report(self, top: int = 25) -> Dict[str, Any]:
+        """단계별 시간 + 상위 함수 보고서"""
+        total = self.total_seconds()
+        phases_ms = {phase: round(seconds * 1000, 3) for phase, seconds in self.phases.items()}
+        # 나머지: 라우팅, FastAPI의 반환값 인코딩(jsonable_encoder), 미들웨어 등
+        phases_ms["other"] = round(max(total - sum(self.phases.values()), 0.0) * 1000, 3)
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "total_ms": round(total * 1000, 3),
+            "phases_ms": phases_ms,
+            "query_count": self.query_count,
+            "profiler_error": self.profiler_error,
+            "top_functions": self.top_functions(top)
+        }
+
+
+def record_phase(phase: str, seconds: float):
+    """프로파일링 중인 요청이면 단계 시간 누적"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(phase, seconds)
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """블로킹 함수를 스레드 풀에서 실행 (프로파일링 중이면 cProfile 적용)"""
+    profile = _current_profile.get()
+    if profile is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await run_in_threadpool(profile.run, func, *args, **kwargs)
+
+
+def _requested_mode(scope) -> Optional[str]:
+    """X-Profile 헤더 또는 profile 쿼리 파라미터에서 모드 결정"""
+    value = None
+    for name, header_value in scope.get('headers', []):
+        if name == b'x-profile':
+            value = header_value.decode('latin-1')
+            break
+    if value is None and b'profile=' in scope.get('query_string', b''):
+        for pair in scope['query_string'].decode('latin-1').split('&'):
+            key, _, pair_value = pair.partition('=')
+            if key == 'profile':
+                value = pair_value
+                break
+    if not value or value.lower() in ('0', 'false', 'off'):
+        return None
+    return MODE_INLINE if value.lower() == MODE_INLINE else MODE_STORE
+
+
+class ProfileStore:
+    """프로파일 보고서(JSON)와 pstats 덤프 저장소"""
+
+    def __init__(self, profile_dir: str, max_profiles: int = 200):
+        self.profile_dir = profile_dir
+        self.max_profiles = max_profiles
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def report_path(self, profile_id: str) -> str:
+        return os.path.join(self.profile_dir, f"{profile_id}.json")
+
+    def pstats_path(self, profile_id: str) -> str:
+        return os.path.join(self.profile_dir, f"{profile_id}.prof")
+
+    def save(self, profile: RequestProfile, report: Dict[str, Any]):
+        with open(self.report_path(profile.profile_id), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False)
+        if profile.profiler is not None and not profile.profiler_error:
+            profile.profiler.dump_stats(self.pstats_path(profile.profile_id))
+        self._prune()
+
+    def _prune(self):
+        """오래된 프로파일 정리"""
+        reports = sorted(
+            (os.path.join(self.profile_dir, name) for name in os.listdir(self.profile_dir) if name.endswith('.json')),
+            key=os.path.getmtime
+        )
+        for path in reports[:max(len(reports) - self.max_profiles, 0)]:
+            for stale in (path, path[:-len('.json')] + '.prof'):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    def load(self, profile_id: str) -> Dict[str, Any]:
+        with open(self.report_path(profile_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """최근 프로파일 요약"""
+        reports = sorted(
+            (name for name in os.listdir(self.profile_dir) if name.endswith('.json')),
+            key=lambda name: os.path.getmtime(os.path.join(self.profile_dir, name)),
+            reverse=True
+        )[:limit]
+        summaries = []
+        for name in reports:
+            report = self.load(name[:-len('.json')])
+            summaries.append({key: report[key] for key in ("profile_id", "method", "path", "total_ms", "phases_ms")})
+        return summaries
+
+
+class ProfilingMiddleware:
+    """프로파일링을 요청한 요청만 RequestProfile을 만들어 처리하는 ASGI 미들웨어"""
+
+    def __init__(self, app, store: ProfileStore, top_functions: int = 25):
+        self.app = app
+        self.store = store
+        self.top_functions = top_functions
+
+    async def __call__(self, scope, receive, send):
+        mode = _requested_mode(scope) if scope['type'] == 'http' else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(mode, scope['method'], scope['path'])
+        token = _current_profile.set(profile)
+        try:
+            if mode == MODE_INLINE:
+                await self._run_inline(profile, scope, receive, send)
+            else:
+                await self._run_store(profile, scope, receive, send)
+        finally:
+            _current_profile.reset(token)
+
+    async def _run_store(self, profile: RequestProfile, scope, receive, send):
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers', []))
+                headers.append((b'x-profile-id', profile.profile_id.encode('latin-1')))
+                headers.append((b'server-timing', profile.server_timing().encode('latin-1')))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        report = profile.report(self.top_functions)
+        try:
+            self.store.save(profile, report)
+        except OSError as e:
+            logger.warning(f"프로파일 저장 실패: {e}")
+        logger.info(f"프로파일 저장: {profile.profile_id} {profile.method} {profile.path} ({report['total_ms']}ms)")
+
+    async def _run_inline(self, profile: RequestProfile, scope, receive, send):
+        start_message: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                start_message.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, send_wrapper)
+
+        body = b''.join(chunks)
+        try:
+            result = json.loads(body) if body else None
+        except ValueError:
+            result = body.decode('utf-8', errors='replace')
+        payload = json.dumps(
+            {"result": result, "profile": profile.report(self.top_functions)}, ensure_ascii=False, default=str
+        ).encode('utf-8')
+
+        headers = [
+            (name, value) for name, value in start_message.get('headers', [])
+            if name not in (b'content-length', b'content-type')
+        ]
+        headers.append((b'content-type', b'application/json'))
+        headers.append((b'content-length', str(len(payload)).encode('latin-1')))
+        headers.append((b'server-timing', profile.server_timing().encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': start_message.get('status', 500), 'headers': headers})
+        await send({'type': 'http.response.body', 'body': payload})
@@ -0,0 +1,86 @@
+"""
+메타데이터 필터 쿼리 플래너
+
+분석 요청의 메타데이터 필터를 WHERE 조건으로 변환합니다. 기존 단일 컬럼 인덱스
+(Config.TABLE_INDEXES)를 탈 수 있는 선택적인 조건을 앞에 두고, 가장 선택적인 인덱스
+조건이 있으면 모델 인덱스와 함께 USE INDEX 힌트를 생성해 필터링된 요청이 적은 행만
+스캔하도록 합니다.
+"""
+from typing import List, Any, Tuple, Optional
+from dataclasses import dataclass
+
+from config import Config
+
+# 연산자별 SQL 템플릿
+FILTER_OPERATORS = {
+    'eq': "{column} = %s",
+    'ne': "{column} <> %s",
+    'in': "{column} IN ({placeholders})",
+    'not_in': "{column} NOT IN ({placeholders})",
+    'gte': "{column} >= %s",
+    'lte': "{column} <= %s"
+}
+
+# 인덱스로 범위를 좁힐 수 있는 연산자 (부정 조건은 인덱스 효율이 낮음)
+INDEXABLE_OPERATORS = {'eq', 'in', 'gte', 'lte'}
+
+
+@dataclass(frozen=True)
+class PlannedPredicate:
+    """계획된 WHERE 조건"""
+    sql: str
+    params: Tuple[Any, ...]
+    column: str
+    index_name: Optional[str]
+    rank: Tuple[int, int]
+
+
+def plan_predicate(benchmark: str, column: str, op: str, values: List[Any]) -> PlannedPredicate:
+    """단일 필터 조건을 SQL로 변환하고 실행 우선순위 계산
+
+    우선순위: 인덱스 동등/IN 조건(값이 적을수록 앞) -> 인덱스 범위 조건 -> 그 외
+    """
+    index_name = Config.get_table_indexes(benchmark).get(column)
+    placeholders = ', '.join(['%s'] * len(values))
+    sql = FILTER_OPERATORS[op].format(column=column, placeholders=placeholders)
+
+    if index_name and op in ('eq', 'in'):
+        rank = (0, len(values))
+    elif index_name and op in INDEXABLE_OPERATORS:
+        rank = (1, 0)
+    else:
+        rank = (2, 0)
+        index_name = None
+
+    return PlannedPredicate(sql=sql, params=tuple(values), column=column, index_name=index_name, rank=rank)
+
+
+def plan_filters(benchmark: str, filters: List[Any]) -> Tuple[List[str], List[Any], str]:
+    """필터 목록을 (WHERE 조건 리스트, 파라미터, 인덱스 힌트)로 변환
+
+    filters의 각 항목은 column, op, values 속성을 가집니다.
+    """
+    if not filters:
+        return [], [], ""
+
+    predicates = sorted(
+        (plan_predicate(benchmark, f.column, f.op, list(f.values)) for f in filters),
+        key=lambda p: p.rank
+    )
+
+    conditions = [p.sql for p in predicates]
+    params: List[Any] = []
+    for p in predicates:
+        params.extend(p.params)
+
+    # 가장 선택적인 인덱스 동등/IN 조건이 있으면 모델 인덱스와 함께 사용하도록 힌트 (index merge 허용)
+    index_hint = ""
+    best = predicates[0]
+    if best.index_name and best.rank[0] == 0:
+        hint_indexes = [best.index_name]
+        model_index = Config.get_table_indexes(benchmark).get('model_name')
+        if model_index and model_index not in hint_indexes:
+            hint_indexes.append(model_index)
+        index_hint = f"USE INDEX ({', '.join(hint_indexes)})"
+
+    return conditions, params, index_hint
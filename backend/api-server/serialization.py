@@ -0,0 +1,87 @@
+"""
+응답 직렬화 모듈
+
+분석 결과는 수천 개의 중첩 dict로 구성되어 FastAPI 기본 경로(jsonable_encoder로 한 번 더
+변환한 뒤 표준 json으로 인코딩)에서 인코딩 시간이 SQL 실행 시간을 넘기도 합니다.
+orjson이 설치되어 있으면 결과 dict를 바로 bytes로 인코딩하고, 없으면 표준 json으로 대체합니다.
+
+대용량 피벗 결과를 위해 행(dict) 리스트 대신 필드별 배열을 반환하는 columnar 형태도 제공합니다.
+"""
+from typing import List, Dict, Any, Iterable
+from decimal import Decimal
+from enum import Enum
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 사용
+    orjson = None
+
+# 응답 형태
+FORMAT_ROWS = 'rows'
+FORMAT_COLUMNAR = 'columnar'
+
+
+def _default(obj: Any) -> Any:
+    """기본 인코더가 처리하지 못하는 타입 변환 (DB 값, numpy 스칼라, pydantic 모델 등)"""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.decode('utf-8', errors='replace')
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump(mode='json')
+    if hasattr(obj, 'item'):  # numpy 스칼라
+        return obj.item()
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"JSON으로 직렬화할 수 없는 타입: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """응답 본문 인코딩 (UTF-8 bytes)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':'), default=_default
+    ).encode('utf-8')
+
+
+def rows_to_columns(rows: List[Dict[str, Any]], exclude: Iterable[str] = ()) -> Dict[str, List[Any]]:
+    """행(dict) 리스트 -> 필드별 배열 (없는 필드는 None, 필드 순서는 처음 등장한 순서)"""
+    excluded = set(exclude)
+    keys: Dict[str, None] = {}
+    for row in rows:
+        for key in row:
+            if key not in excluded:
+                keys.setdefault(key)
+    return {key: [row.get(key) for row in rows] for key in keys}
+
+
+def benchmark_result_to_columnar(result: Dict[str, Any]) -> Dict[str, Any]:
+    """execute_benchmark_analysis 결과를 columnar 형태로 변환
+
+    - columns: 그룹별 메타데이터/평균 점수/문항 수 배열
+    - model_scores: 모델별 {score, questions, avg_<지표>} 배열 (그룹에 모델이 없으면 None)
+    행마다 반복되던 benchmark/models 필드는 제거합니다.
+    """
+    rows = result["results"]
+    columnar = {key: value for key, value in result.items() if key != "results"}
+    columnar["format"] = FORMAT_COLUMNAR
+    columnar["row_count"] = len(rows)
+    columnar["columns"] = rows_to_columns(rows, exclude=("model_scores", "models", "benchmark"))
+
+    if any("model_scores" in row for row in rows):
+        model_names: Dict[str, None] = {}
+        for row in rows:
+            for model_name in row.get("model_scores", {}):
+                model_names.setdefault(model_name)
+        # 모델이 빠진 그룹은 빈 dict로 채워 모든 배열 길이를 그룹 수에 맞춤
+        columnar["model_scores"] = {
+            model_name: rows_to_columns([row.get("model_scores", {}).get(model_name) or {} for row in rows])
+            for model_name in model_names
+        }
+    return columnar
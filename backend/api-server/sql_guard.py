@@ -0,0 +1,415 @@
+"""
+SQL 에이전트용 읽기 전용 쿼리 검증/실행 모듈
+
+에이전트가 작성한 SELECT 문을 토큰 단위로 검사해 허용된 결과 테이블(*_results)과 컬럼,
+집계/문자열 함수만 사용하는지 확인합니다. 통과한 쿼리에는 LIMIT(최대 행 수)과
+MAX_EXECUTION_TIME 옵티마이저 힌트를 강제로 넣고, 읽기 전용 트랜잭션에서 실행합니다.
+정규화된 쿼리 텍스트를 키로 결과를 캐시해 같은 쿼리의 재시도가 DB를 다시 조회하지 않습니다.
+"""
+from typing import List, Dict, Any, Tuple, Optional, Set
+from dataclasses import dataclass
+from decimal import Decimal
+import re
+import time
+
+from config import Config
+from cache import TTLCache
+
+
+class SQLValidationError(ValueError):
+    """허용되지 않는 SQL"""
+
+
+@dataclass
+class Token:
+    """SQL 토큰 (kind: ident, qident, kw, str, num, op, hint)"""
+    kind: str
+    value: str
+
+
+TOKEN_REGEX = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>--|\#|/\*)
+  | (?P<str>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+  | (?P<qident>`[^`]+`)
+  | (?P<num>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|\.\d+)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<op><=>|<=|>=|<>|!=|\|\||&&|[-+*/%=<>(),.;!~^&|])
+""", re.VERBOSE)
+
+# 식별자가 아닌 예약어 (대문자 비교)
+KEYWORDS = {
+    'SELECT', 'DISTINCT', 'FROM', 'WHERE', 'AND', 'OR', 'NOT', 'XOR', 'IN', 'IS', 'NULL', 'LIKE', 'BETWEEN',
+    'EXISTS', 'AS', 'ON', 'USING', 'JOIN', 'INNER', 'LEFT', 'RIGHT', 'OUTER', 'CROSS', 'NATURAL', 'GROUP', 'BY',
+    'HAVING', 'ORDER', 'ASC', 'DESC', 'LIMIT', 'OFFSET', 'UNION', 'ALL', 'CASE', 'WHEN', 'THEN', 'ELSE', 'END',
+    'TRUE', 'FALSE', 'WITH', 'ROLLUP', 'DIV', 'MOD', 'REGEXP', 'RLIKE', 'INTERVAL', 'ESCAPE', 'SEPARATOR',
+    'OVER', 'PARTITION', 'ROWS', 'RANGE', 'PRECEDING', 'FOLLOWING', 'CURRENT', 'ROW', 'UNBOUNDED',
+    'SIGNED', 'UNSIGNED', 'DECIMAL', 'CHAR', 'DOUBLE', 'FLOAT', 'INTEGER', 'DATE', 'DATETIME', 'BINARY',
+    'YEAR', 'MONTH', 'DAY', 'HOUR', 'MINUTE', 'SECOND'
+}
+
+# SELECT 문 안에서 파일 출력, 잠금, 무한 재귀를 일으킬 수 있는 예약어
+FORBIDDEN_KEYWORDS = {'INTO', 'OUTFILE', 'DUMPFILE', 'FOR', 'LOCK', 'SHARE', 'PROCEDURE', 'RECURSIVE'}
+
+# 호출 가능한 함수
+ALLOWED_FUNCTIONS = {
+    'COUNT', 'SUM', 'AVG', 'MIN', 'MAX', 'STD', 'STDDEV', 'STDDEV_POP', 'STDDEV_SAMP', 'VARIANCE', 'VAR_POP',
+    'VAR_SAMP', 'GROUP_CONCAT', 'BIT_AND', 'BIT_OR', 'ROUND', 'FLOOR', 'CEIL', 'CEILING', 'ABS',
+    'SIGN', 'SQRT', 'POW', 'POWER', 'LN', 'LOG', 'LOG10', 'LOG2', 'EXP', 'MOD', 'GREATEST', 'LEAST',
+    'COALESCE', 'IFNULL', 'NULLIF', 'IF', 'CAST', 'CONCAT', 'CONCAT_WS', 'LENGTH', 'CHAR_LENGTH', 'LOWER',
+    'UPPER', 'SUBSTRING', 'SUBSTR', 'LEFT', 'RIGHT', 'TRIM', 'LOCATE', 'INSTR', 'DATE', 'YEAR', 'MONTH',
+    'DAY', 'ROW_NUMBER', 'RANK', 'DENSE_RANK', 'PERCENT_RANK', 'CUME_DIST', 'NTILE', 'LAG', 'LEAD',
+    'FIRST_VALUE', 'LAST_VALUE'
+}
+
+# 별칭이 올 수 있는 직전 토큰 종류/예약어 (표현식의 끝)
+EXPRESSION_END_KINDS = {'ident', 'qident', 'num', 'str'}
+EXPRESSION_END_KEYWORDS = {'END', 'NULL', 'TRUE', 'FALSE'}
+
+
+def tokenize_sql(sql: str) -> List[Token]:
+    """SQL 문자열을 토큰 리스트로 분리 (주석, 변수(@), 알 수 없는 문자는 거부)"""
+    tokens = []
+    pos = 0
+    while pos < len(sql):
+        match = TOKEN_REGEX.match(sql, pos)
+        if not match:
+            raise SQLValidationError(f"허용되지 않는 문자: {sql[pos:pos + 10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        pos = match.end()
+
+        if kind == 'ws':
+            continue
+        if kind == 'comment':
+            raise SQLValidationError("주석은 사용할 수 없습니다")
+        if kind == 'ident':
+            upper = value.upper()
+            if upper in FORBIDDEN_KEYWORDS:
+                raise SQLValidationError(f"허용되지 않는 키워드: {upper}")
+            if upper in KEYWORDS:
+                kind, value = 'kw', upper
+            else:
+                value = value.lower()
+        elif kind == 'qident':
+            value = value[1:-1].lower()
+        tokens.append(Token(kind, value))
+    return tokens
+
+
+def _at(tokens: List[Token], index: int) -> Optional[Token]:
+    """범위를 벗어나면 None"""
+    return tokens[index] if 0 <= index < len(tokens) else None
+
+
+def _is_name(token: Optional[Token]) -> bool:
+    return token is not None and token.kind in ('ident', 'qident')
+
+
+def _is_op(token: Optional[Token], value: str) -> bool:
+    return token is not None and token.kind == 'op' and token.value == value
+
+
+def _is_kw(token: Optional[Token], value: str) -> bool:
+    return token is not None and token.kind == 'kw' and token.value == value
+
+
+def get_allowed_tables() -> Dict[str, List[str]]:
+    """쿼리 가능한 결과 테이블 -> 컬럼 리스트"""
+    return {
+        Config.get_table_name(benchmark): Config.get_table_columns(benchmark)
+        for benchmark in Config.BENCHMARKS
+    }
+
+
+@dataclass
+class ValidatedQuery:
+    """검증 후 실행 가능한 쿼리"""
+    sql: str
+    normalized: str
+    tables: List[str]
+    fetch_limit: int
+
+
+def _find_matching_paren(tokens: List[Token], start: int) -> int:
+    depth = 0
+    for i in range(start, len(tokens)):
+        if _is_op(tokens[i], '('):
+            depth += 1
+        elif _is_op(tokens[i], ')'):
+            depth -= 1
+            if depth == 0:
+                return i
+    raise SQLValidationError("괄호가 맞지 않습니다")
+
+
+def _collect_names(
+    tokens: List[Token], allowed_tables: Dict[str, List[str]]
+) -> Tuple[Dict[int, str], Set[str], Dict[str, Optional[str]], Set[str]]:
+    """1차 패스: 테이블/별칭/CTE 위치 표시
+
+    Returns:
+        (토큰 위치 -> 역할, 사용 테이블 집합, 테이블 별칭 -> 원본 테이블(CTE/서브쿼리는 None), 컬럼 별칭 집합)
+    """
+    roles: Dict[int, str] = {}
+    tables: Set[str] = set()
+    table_aliases: Dict[str, Optional[str]] = {}
+    column_aliases: Set[str] = set()
+    ctes: Set[str] = set()
+
+    # WITH name AS ( ... ), name AS ( ... )
+    i = 0
+    if _is_kw(tokens[0], 'WITH'):
+        i = 1
+        while True:
+            if not (_is_name(_at(tokens, i)) and _is_kw(_at(tokens, i + 1), 'AS') and _is_op(_at(tokens, i + 2), '(')):
+                raise SQLValidationError("WITH 절은 'WITH 이름 AS (SELECT ...)' 형식만 지원합니다")
+            ctes.add(tokens[i].value)
+            roles[i] = 'cte'
+            i = _find_matching_paren(tokens, i + 2) + 1
+            if _is_op(_at(tokens, i), ','):
+                i += 1
+                continue
+            break
+        if not _is_kw(_at(tokens, i), 'SELECT'):
+            raise SQLValidationError("WITH 절 뒤에는 SELECT가 와야 합니다")
+    for name in ctes:
+        table_aliases[name] = None
+
+    for i, token in enumerate(tokens):
+        previous = _at(tokens, i - 1)
+
+        if _is_kw(token, 'FROM') or _is_kw(token, 'JOIN'):
+            # FROM a, (SELECT ...) b, c 형태의 목록을 끝까지 검사
+            # (서브쿼리 내용은 이 반복문에서 같은 방식으로 따로 검사됨)
+            j = i + 1
+            while True:
+                if _is_op(_at(tokens, j), '('):
+                    source = None
+                    j = _find_matching_paren(tokens, j) + 1
+                elif _is_name(_at(tokens, j)):
+                    name = tokens[j].value
+                    if _is_op(_at(tokens, j + 1), '.'):
+                        raise SQLValidationError(f"데이터베이스를 지정한 테이블은 사용할 수 없습니다: {name}")
+                    if name not in allowed_tables and name not in ctes:
+                        raise SQLValidationError(f"허용되지 않은 테이블: {name}")
+                    roles[j] = 'table'
+                    source = name if name in allowed_tables else None
+                    if source:
+                        tables.add(name)
+                    j += 1
+                else:
+                    raise SQLValidationError(f"{token.value} 뒤에 테이블이 필요합니다")
+
+                # 테이블 별칭 (AS 생략 가능)
+                if _is_kw(_at(tokens, j), 'AS'):
+                    j += 1
+                if _is_name(_at(tokens, j)):
+                    roles[j] = 'table_alias'
+                    table_aliases[tokens[j].value] = source
+                    j += 1
+
+                if _is_op(_at(tokens, j), ','):
+                    j += 1
+                    continue
+                # 테이블 참조 뒤에는 예약어, 닫는 괄호 또는 문장 끝만 허용 (STRAIGHT_JOIN 등 우회 방지)
+                following = _at(tokens, j)
+                if following is not None and following.kind != 'kw' and not _is_op(following, ')'):
+                    raise SQLValidationError(f"테이블 목록을 해석할 수 없습니다: {following.value}")
+                break
+            continue
+
+        if i in roles or not _is_name(token):
+            continue
+
+        # 함수 위치의 이름은 별칭이 아님 (validate_select에서 함수로 검사)
+        if _is_op(_at(tokens, i + 1), '('):
+            continue
+
+        # 컬럼/서브쿼리 별칭: AS 뒤 또는 표현식 끝 바로 뒤
+        if _is_kw(previous, 'AS') or (
+            previous is not None
+            and (
+                previous.kind in EXPRESSION_END_KINDS
+                or _is_op(previous, ')')
+                or (previous.kind == 'kw' and previous.value in EXPRESSION_END_KEYWORDS)
+            )
+        ):
+            roles[i] = 'alias'
+            column_aliases.add(token.value)
+
+    return roles, tables, table_aliases, column_aliases
+
+
+def _render(tokens: List[Token]) -> str:
+    """토큰을 SQL 텍스트로 재조립 (함수명과 괄호, 한정자 '.' 주변은 붙여 씀)"""
+    parts: List[str] = []
+    previous: Optional[Token] = None
+    for token in tokens:
+        if token.kind == 'qident':
+            text = f"`{token.value}`"
+        else:
+            text = token.value
+
+        glue = (
+            previous is None
+            or _is_op(token, '.') or _is_op(previous, '.')
+            or _is_op(token, ',') or _is_op(token, ')') or _is_op(previous, '(')
+            or (_is_op(token, '(') and previous.kind in ('ident', 'kw') and previous.value.upper() in ALLOWED_FUNCTIONS)
+        )
+        parts.append(text if glue else f" {text}")
+        previous = token
+    return ''.join(parts)
+
+
+def validate_select(sql: str, max_rows: int, max_execution_ms: int) -> ValidatedQuery:
+    """에이전트 SQL 검증 후 LIMIT/실행 시간 힌트를 넣은 실행용 쿼리 생성"""
+    tokens = tokenize_sql(sql)
+    while tokens and _is_op(tokens[-1], ';'):
+        tokens.pop()
+    if not tokens:
+        raise SQLValidationError("빈 쿼리입니다")
+    if any(_is_op(token, ';') for token in tokens):
+        raise SQLValidationError("여러 문장은 실행할 수 없습니다")
+    if not (_is_kw(tokens[0], 'SELECT') or _is_kw(tokens[0], 'WITH')):
+        raise SQLValidationError("SELECT 문만 실행할 수 있습니다")
+
+    allowed_tables = get_allowed_tables()
+    roles, tables, table_aliases, column_aliases = _collect_names(tokens, allowed_tables)
+    if not tables:
+        raise SQLValidationError("결과 테이블(*_results)을 하나 이상 조회해야 합니다")
+
+    allowed_columns: Set[str] = set()
+    for table in tables:
+        allowed_columns.update(allowed_tables[table])
+
+    # 2차 패스: 함수와 컬럼 검사 (컬럼 별칭은 한정자나 한정된 실제 테이블 컬럼을 대신할 수 없음)
+    qualified: Set[int] = set()
+    for i, token in enumerate(tokens):
+        if token.kind not in ('ident', 'qident', 'kw'):
+            continue
+        following = _at(tokens, i + 1)
+
+        # 함수 위치는 역할(별칭 등)과 무관하게 검사
+        # (같은 이름의 별칭이나 `이름`( ) 형태로 허용 목록을 우회하지 못하도록)
+        if _is_op(following, '('):
+            if token.kind == 'qident':
+                raise SQLValidationError(f"따옴표로 감싼 이름은 함수로 호출할 수 없습니다: {token.value}")
+            if token.kind == 'ident' and token.value.upper() not in ALLOWED_FUNCTIONS:
+                raise SQLValidationError(f"허용되지 않은 함수: {token.value.upper()}")
+            continue
+        if i in roles or i in qualified or token.kind == 'kw':
+            continue
+        if _is_op(following, '.'):
+            # 한정자: 조회 중인 테이블 또는 테이블 별칭만 허용
+            if token.value in tables:
+                source = token.value
+            elif token.value in table_aliases:
+                source = table_aliases[token.value]
+            else:
+                raise SQLValidationError(f"알 수 없는 테이블 한정자: {token.value}")
+            column = _at(tokens, i + 2)
+            if _is_name(column):
+                if _is_op(_at(tokens, i + 3), '.'):
+                    raise SQLValidationError(f"세 부분으로 된 이름은 사용할 수 없습니다: {token.value}.{column.value}")
+                # 실제 테이블은 그 테이블의 컬럼만, CTE/서브쿼리는 결과 컬럼(또는 그 별칭)
+                allowed = allowed_tables[source] if source else allowed_columns | column_aliases
+                if column.value not in allowed:
+                    raise SQLValidationError(f"허용되지 않은 컬럼: {token.value}.{column.value}")
+                qualified.add(i + 2)
+            continue
+        if token.value not in allowed_columns and token.value not in column_aliases:
+            raise SQLValidationError(f"허용되지 않은 컬럼: {token.value}")
+
+    normalized = _render(tokens)
+
+    # 최상위 LIMIT 처리 (요청 한도를 넘으면 max_rows + 1로 줄여 잘림 여부를 확인)
+    depth = 0
+    limit_index = None
+    for i, token in enumerate(tokens):
+        if _is_op(token, '('):
+            depth += 1
+        elif _is_op(token, ')'):
+            depth -= 1
+        elif depth == 0 and _is_kw(token, 'LIMIT'):
+            limit_index = i
+
+    fetch_limit = max_rows + 1
+    if limit_index is None:
+        tokens = tokens + [Token('kw', 'LIMIT'), Token('num', str(fetch_limit))]
+    else:
+        # LIMIT n | LIMIT offset, n | LIMIT n OFFSET offset
+        count_index = limit_index + 3 if _is_op(_at(tokens, limit_index + 2), ',') else limit_index + 1
+        tail = tokens[count_index + 1:]
+        valid_tail = not tail or (len(tail) == 2 and _is_kw(tail[0], 'OFFSET') and tail[1].value.isdigit())
+        count_token = _at(tokens, count_index)
+        if count_token is None or not count_token.value.isdigit() or not valid_tail:
+            raise SQLValidationError("LIMIT에는 정수만 사용할 수 있습니다")
+        requested = int(tokens[count_index].value)
+        fetch_limit = min(requested, max_rows + 1)
+        tokens = list(tokens)
+        tokens[count_index] = Token('num', str(fetch_limit))
+
+    # 최상위 SELECT 바로 뒤에 실행 시간 제한 힌트
+    depth = 0
+    for i, token in enumerate(tokens):
+        if _is_op(token, '('):
+            depth += 1
+        elif _is_op(token, ')'):
+            depth -= 1
+        elif depth == 0 and _is_kw(token, 'SELECT'):
+            select_index = i
+            break
+    tokens = tokens[:select_index + 1] + [Token('hint', f"/*+ MAX_EXECUTION_TIME({int(max_execution_ms)}) */")] + tokens[select_index + 1:]
+    executable = _render(tokens)
+
+    return ValidatedQuery(sql=executable, normalized=normalized, tables=sorted(tables), fetch_limit=fetch_limit)
+
+
+_query_cache = TTLCache('sql_query', maxsize=Config.SQL_CACHE_SIZE, ttl=Config.SQL_CACHE_TTL)
+
+
+def get_query_cache() -> TTLCache:
+    """SQL 결과 캐시 (통계 조회용)"""
+    return _query_cache
+
+
+def execute_readonly_query(connection, sql: str, max_rows: int, use_cache: bool = True) -> Dict[str, Any]:
+    """검증된 쿼리를 읽기 전용 트랜잭션으로 실행 (정규화 쿼리 기준 캐시)"""
+    validated = validate_select(sql, max_rows, Config.SQL_MAX_EXECUTION_MS)
+    cache_key = (validated.normalized, max_rows)
+
+    if use_cache:
+        cached = _query_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    start = time.perf_counter()
+    connection.start_transaction(readonly=True)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(validated.sql)
+        columns = list(cursor.column_names)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        connection.rollback()
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    truncated = len(rows) > max_rows
+    rows = [
+        [float(value) if isinstance(value, Decimal) else value for value in row]
+        for row in rows[:max_rows]
+    ]
+
+    result = {
+        "query": validated.sql,
+        "tables": validated.tables,
+        "columns": columns,
+        "rows": rows,
+        "row_count": len(rows),
+        "truncated": truncated,
+        "elapsed_ms": elapsed_ms
+    }
+    _query_cache.set(cache_key, result)
+    return {**result, "cached": False}
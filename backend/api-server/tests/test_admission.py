@@ -0,0 +1,50 @@
+"""admission 슬롯 반납 회귀 테스트"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionController
+
+
+async def _cancel_waiter(grant_before_cancel: bool) -> AdmissionController:
+    controller = AdmissionController("test", slots=1, max_heavy=1, max_queue=10, max_wait=5)
+    release = asyncio.Event()
+
+    async def holder():
+        async with controller.admit():
+            await release.wait()
+
+    holder_task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(controller._acquire(0))
+    await asyncio.sleep(0)
+
+    if grant_before_cancel:
+        # 보유자가 반납해 대기자에게 슬롯이 배정된 직후, 대기자가 깨어나기 전에 취소
+        release.set()
+        await holder_task
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    release.set()
+    await holder_task
+    return controller
+
+
+def test_cancelled_waiter_leaves_queue():
+    controller = asyncio.run(_cancel_waiter(grant_before_cancel=False))
+    assert controller.stats()["queued"] == 0
+    assert controller.active == 0
+
+
+def test_cancelled_waiter_returns_granted_slot():
+    controller = asyncio.run(_cancel_waiter(grant_before_cancel=True))
+    assert controller.active == 0
+
+    async def admit_again():
+        async with controller.admit():
+            return True
+
+    assert asyncio.run(asyncio.wait_for(admit_again(), 1))
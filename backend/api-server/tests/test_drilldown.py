@@ -0,0 +1,62 @@
+"""drilldown 키셋 페이지네이션 회귀 테스트 (sqlite로 쿼리 실행)"""
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from drilldown import execute_drilldown
+
+
+class SQLiteConnection:
+    """mysql.connector 연결 대신 쓰는 최소 래퍼 (%s -> ?, dictionary 커서)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self, dictionary=False):
+        return SQLiteCursor(self.connection.cursor())
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params):
+        self.cursor.execute(query.replace('%s', '?'), params)
+
+    def fetchall(self):
+        columns = [column[0] for column in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def close(self):
+        self.cursor.close()
+
+
+def test_duplicate_keys_across_page_boundary_are_not_skipped():
+    table_name = Config.get_table_name('aime')
+    db = sqlite3.connect(':memory:')
+    db.execute(
+        f"CREATE TABLE {table_name} (id INTEGER PRIMARY KEY, data_id INTEGER, model_name TEXT, "
+        "answer TEXT, filtered_resps TEXT, match_score REAL)"
+    )
+    # (data_id, model_name)이 같은 행이 페이지 경계에 걸치도록 중복 삽입
+    rows = [(1, 'a'), (1, 'a'), (1, 'a'), (2, 'a'), (2, 'a'), (3, 'a')]
+    db.executemany(
+        f"INSERT INTO {table_name} (data_id, model_name, answer, filtered_resps, match_score) VALUES (?, ?, '', '', 1.0)",
+        rows
+    )
+    connection = SQLiteConnection(db)
+
+    seen = []
+    cursor_token = None
+    while True:
+        page = execute_drilldown(connection, 'aime', ['a'], [], [], [], limit=2, cursor_token=cursor_token)
+        assert all('id' not in row for row in page["rows"])
+        seen.extend((row['data_id'], row['model_name']) for row in page["rows"])
+        cursor_token = page["next_cursor"]
+        if not cursor_token:
+            break
+
+    assert seen == rows
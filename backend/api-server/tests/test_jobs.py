@@ -0,0 +1,48 @@
+"""jobs 만료 작업 정리 회귀 테스트"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jobs import JobManager, SUCCEEDED
+
+
+def wait_finished(manager: JobManager, job_id: str):
+    for _ in range(200):
+        if manager.get(job_id).finished_at:
+            return
+        time.sleep(0.01)
+    raise AssertionError("작업이 끝나지 않았습니다")
+
+
+def test_expired_jobs_are_purged_on_submit(tmp_path):
+    manager = JobManager(str(tmp_path), max_workers=1, result_ttl=3600)
+    manager.register('echo', lambda params, progress: {"value": params["value"]})
+
+    old, _ = manager.submit('echo', {"value": 1})
+    wait_finished(manager, old.job_id)
+    assert old.status == SUCCEEDED
+    assert sorted(os.listdir(tmp_path)) == [f"{old.job_id}.meta.json", f"{old.job_id}.result.json"]
+
+    # 만료 시점이 지난 것으로 처리
+    old.finished_at -= 7200
+    fresh, deduplicated = manager.submit('echo', {"value": 1})
+    wait_finished(manager, fresh.job_id)
+    manager.shutdown()
+
+    assert not deduplicated
+    assert manager.get(old.job_id) is None
+    assert sorted(os.listdir(tmp_path)) == [f"{fresh.job_id}.meta.json", f"{fresh.job_id}.result.json"]
+
+
+def test_expired_jobs_are_purged_on_startup(tmp_path):
+    manager = JobManager(str(tmp_path), max_workers=1, result_ttl=3600)
+    manager.register('echo', lambda params, progress: {})
+    job, _ = manager.submit('echo', {})
+    wait_finished(manager, job.job_id)
+    manager.shutdown()
+
+    assert JobManager(str(tmp_path), result_ttl=3600).get(job.job_id) is not None
+    assert JobManager(str(tmp_path), result_ttl=0).get(job.job_id) is None
+    assert os.listdir(tmp_path) == []
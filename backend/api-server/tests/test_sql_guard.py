@@ -0,0 +1,56 @@
+"""sql_guard 검증 회귀 테스트"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sql_guard import SQLValidationError, validate_select
+
+
+def validate(sql: str):
+    return validate_select(sql, max_rows=100, max_execution_ms=1000)
+
+
+@pytest.mark.parametrize("sql", [
+    # 같은 이름의 별칭으로 함수 허용 목록 우회
+    "SELECT 1 `load_file`, `load_file`('/etc/passwd') FROM aime_results",
+    "SELECT 1 AS `sleep`, `sleep`(5) FROM aime_results",
+    # 표현식 뒤 이름이 별칭으로 처리되어 함수 검사를 건너뛰는 경우
+    "SELECT 1 sleep(5) FROM aime_results",
+    "SELECT sleep(5) FROM aime_results",
+    # 서브쿼리 뒤 테이블 목록이 검사되지 않고 컬럼 별칭이 한정자로 허용되던 경우
+    "SELECT 1 AS mysql, 1 AS user, 1 AS authentication_string, u.user, u.authentication_string "
+    "FROM (SELECT 1 FROM aime_results) t, mysql.user u",
+    "SELECT 1 AS information_schema, 1 AS processlist, 1 AS info, p.info "
+    "FROM (SELECT 1 FROM aime_results) t, information_schema.processlist p",
+    # 컬럼 별칭을 한정자로 사용
+    "SELECT 1 AS x, x.model_name FROM aime_results",
+    # 테이블 별칭 뒤 알 수 없는 조인 구문
+    "SELECT a.model_name FROM aime_results a straight_join answer_choice_counts",
+])
+def test_rejects_unsafe_queries(sql):
+    with pytest.raises(SQLValidationError):
+        validate(sql)
+
+
+def test_allows_aggregate_with_alias():
+    query = validate(
+        "SELECT model_name, AVG(match_score) AS avg_score FROM aime_results "
+        "GROUP BY model_name ORDER BY avg_score DESC"
+    )
+    assert query.tables == ["aime_results"]
+    assert query.sql.endswith("LIMIT 101")
+
+
+@pytest.mark.parametrize("sql", [
+    "SELECT a.model_name, AVG(b.match_score) FROM aime_results a JOIN mmlu_results b "
+    "ON a.model_name = b.model_name GROUP BY a.model_name",
+    "SELECT t.model_name, t.avg_score FROM (SELECT model_name, AVG(match_score) AS avg_score "
+    "FROM aime_results GROUP BY model_name) t, mmlu_results m WHERE t.model_name = m.model_name",
+    "WITH s AS (SELECT model_name, AVG(match_score) AS avg_score FROM aime_results GROUP BY model_name) "
+    "SELECT s.model_name, s.avg_score FROM s ORDER BY avg_score",
+])
+def test_allows_qualified_tables_and_subqueries(sql):
+    validate(sql)
@@ -0,0 +1,84 @@
+"""text_index 색인 교체 회귀 테스트"""
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import text_index
+from config import Config
+from text_index import TextIndexBuilder, search_with_scores
+
+
+def build(prefix: str, docs):
+    builder = TextIndexBuilder()
+    for key, text in docs:
+        builder.add(key, text)
+    builder.write(prefix)
+
+
+def test_rebuild_keeps_old_reader_usable(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_index, "get_index_prefix", lambda benchmark, field: str(tmp_path / f"{benchmark}.{field}"))
+    prefix = str(tmp_path / "aime.question")
+
+    build(prefix, [("q1", "prime numbers modulo"), ("q2", "geometry triangle")])
+    old = text_index.load_text_index("aime", "question")
+    assert old.search("prime") == ["q1"]
+
+    # 다른 요청이 이전 색인을 사용 중일 때 재생성
+    build(prefix, [("q3", "prime factors"), ("q4", "prime triangle"), ("q5", "geometry")])
+    new = text_index.load_text_index("aime", "question")
+
+    assert new is not old
+    assert new.search("prime") == ["q3", "q4"]
+    assert new.search("prime triangle") == ["q4"]
+    # 이전 색인은 닫히지 않고 자신의 포스팅/오프셋으로 계속 조회됨
+    assert old.search("prime") == ["q1"]
+    assert os.listdir(tmp_path) == ["aime.question.index"]
+
+
+class SQLiteConnection:
+    """mysql.connector 연결 대신 쓰는 최소 래퍼 (%s -> ?, dictionary 커서)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self, dictionary=False):
+        return SQLiteCursor(self.connection.cursor())
+
+
+class SQLiteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params):
+        self.cursor.execute(query.replace('%s', '?'), params)
+
+    def fetchall(self):
+        columns = [column[0] for column in self.cursor.description]
+        return [dict(zip(columns, row)) for row in self.cursor.fetchall()]
+
+    def close(self):
+        self.cursor.close()
+
+
+def test_score_filter_covers_every_hit(tmp_path, monkeypatch):
+    monkeypatch.setattr(text_index, "get_index_prefix", lambda benchmark, field: str(tmp_path / f"{benchmark}.{field}"))
+    monkeypatch.setattr(text_index, "SCORE_QUERY_CHUNK_SIZE", 2)
+    build(str(tmp_path / "aime.question"), [(f"q{i}", "prime numbers") for i in range(7)])
+
+    table_name = Config.get_table_name('aime')
+    db = sqlite3.connect(':memory:')
+    db.execute(f"CREATE TABLE {table_name} (data_id TEXT, model_name TEXT, match_score REAL)")
+    # 앞 청크 문항은 모두 정답, 필터에 걸리는 문항은 마지막 청크들에만 있음
+    scores = {"q0": 1, "q1": 1, "q2": 1, "q3": 1, "q4": 0.5, "q5": 1, "q6": 0}
+    for data_id, score in scores.items():
+        db.execute(f"INSERT INTO {table_name} VALUES (?, 'm1', ?)", (data_id, score))
+        db.execute(f"INSERT INTO {table_name} VALUES (?, 'm2', 1)", (data_id,))
+
+    result = search_with_scores(SQLiteConnection(db), 'aime', 'prime', 'question', ['m1', 'm2'],
+                                max_models_correct=1, limit=5)
+
+    assert result["total_hits"] == 7
+    assert [row["data_id"] for row in result["results"]] == ["q6", "q4"]
+    assert [row["avg_match_score"] for row in result["results"]] == [0.5, 0.75]
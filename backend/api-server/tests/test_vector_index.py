@@ -0,0 +1,47 @@
+"""vector_index data_id 보존 회귀 테스트"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import vector_index
+from vector_index import VectorIndex, write_vector_index
+
+
+def test_string_data_ids_round_trip(tmp_path):
+    prefix = str(tmp_path / "aime.semantic")
+    data_ids = ["2024-I-1", "2024-I-2", "2024-II-3"]
+    texts = ["triangle area inscribed circle", "probability of drawing red balls", "sum of digits of integer"]
+    write_vector_index(prefix, data_ids, texts, dim=64)
+
+    index = VectorIndex(prefix)
+    assert index.search("triangle circle", top_k=1)[0]["data_id"] == "2024-I-1"
+    found = {item["data_id"] for item in index.multi_search(["red balls", "digits"], top_n=3)}
+    assert found == set(data_ids)
+
+
+def test_integer_data_ids_unchanged(tmp_path):
+    prefix = str(tmp_path / "mmlu.semantic")
+    write_vector_index(prefix, [10, 20], ["alpha beta", "gamma delta"], dim=64)
+
+    assert VectorIndex(prefix).search("gamma", top_k=1)[0]["data_id"] == 20
+
+
+def test_rebuild_swaps_ids_and_vectors_together(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_index, "get_vector_index_prefix", lambda benchmark: str(tmp_path / f"{benchmark}.semantic"))
+    prefix = str(tmp_path / "aime.semantic")
+
+    write_vector_index(prefix, ["q1", "q2"], ["prime numbers", "triangle geometry"], dim=64)
+    old = vector_index.load_vector_index("aime")
+    assert old.search("prime", top_k=1)[0]["data_id"] == "q1"
+
+    # 문항 수가 바뀌는 재생성: 새 리더는 새 벡터와 새 data_id를 함께 사용
+    write_vector_index(prefix, ["q3", "q4", "q5"], ["circle area", "prime factors", "dice probability"], dim=64)
+    new = vector_index.load_vector_index("aime")
+    assert new is not old
+    assert new.vectors.shape == (64, 3)
+    assert new.search("prime", top_k=1)[0]["data_id"] == "q4"
+
+    # 조회 중이던 이전 리더는 이전 빌드를 계속 사용
+    assert old.search("prime", top_k=1)[0]["data_id"] == "q1"
+    assert vector_index.load_vector_index("aime") is new
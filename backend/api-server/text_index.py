@@ -0,0 +1,355 @@
+"""
+로컬 전문 검색(역색인) 모듈
+
+결과 테이블에는 FULLTEXT 인덱스가 없어 LIKE '%...%' 검색은 모든 모델의 TEXT 행을 스캔합니다.
+이 모듈은 적재 후 한 번 역색인을 만들어 디스크에 저장하고, 조회 시 메모리 맵으로 읽습니다.
+
+- question 색인: 문항(data_id)당 한 번만 저장 (모델 수만큼 중복 저장하지 않음)
+- response 색인(선택): (data_id, model_name) 단위 문서
+- 포스팅: 문서 번호의 차분(delta)을 varint로 압축
+- 파일: <prefix>.index 하나에 [메타 길이(8바이트) | 메타 JSON(어휘/문서 테이블) | 포스팅] 순서로 저장
+  (재생성 시 rename 한 번으로 교체되므로 조회 중에 새 포스팅과 이전 오프셋이 섞이지 않음)
+
+사용법 (적재 완료 후):
+    python text_index.py --benchmark aime [--responses]
+"""
+from typing import List, Dict, Any, Tuple, Optional, Iterable
+import argparse
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+
+from config import Config, mysql_config
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = {
+    'the', 'a', 'an', 'of', 'to', 'in', 'is', 'and', 'or', 'for', 'on', 'by', 'with', 'that', 'this',
+    'be', 'are', 'as', 'at', 'it', 'its', 'from', 'which', 'what', 'was', 'were'
+}
+INDEX_FORMAT_VERSION = 2
+HEADER = struct.Struct('<Q')  # 메타 JSON 길이
+INDEX_FIELDS = ('question', 'response')
+SCORE_QUERY_CHUNK_SIZE = 1000  # 점수 결합 쿼리 한 번에 넣는 data_id 수
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 변환 후 단어 토큰 추출 (불용어, 한 글자 영문 토큰 제외)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or '').lower()):
+        if token in STOPWORDS or (len(token) == 1 and not token.isdigit()):
+            continue
+        tokens.append(token)
+    return tokens
+
+
+def encode_postings(doc_ids: Iterable[int]) -> bytes:
+    """정렬된 문서 번호를 차분 + varint로 압축"""
+    out = bytearray()
+    previous = 0
+    for doc_id in doc_ids:
+        delta = doc_id - previous
+        previous = doc_id
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(buffer, offset: int, length: int) -> List[int]:
+    """varint 차분 포스팅을 문서 번호 리스트로 복원"""
+    doc_ids = []
+    current = 0
+    value = 0
+    shift = 0
+    for byte in buffer[offset:offset + length]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        current += value
+        doc_ids.append(current)
+        value = 0
+        shift = 0
+    return doc_ids
+
+
+def intersect_sorted(left: List[int], right: List[int]) -> List[int]:
+    """정렬된 두 포스팅 리스트의 교집합"""
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i] == right[j]:
+            result.append(left[i])
+            i += 1
+            j += 1
+        elif left[i] < right[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def get_index_prefix(benchmark: str, field: str) -> str:
+    """벤치마크/필드별 색인 파일 경로 접두사"""
+    return os.path.join(Config.INDEX_DIR, f"{benchmark}.{field}")
+
+
+class TextIndexBuilder:
+    """메모리에서 역색인을 만들고 디스크에 기록"""
+
+    def __init__(self):
+        self.doc_keys: List[Any] = []
+        self.postings: Dict[str, List[int]] = {}
+
+    def add(self, doc_key: Any, text: str):
+        """문서 추가 (문서 번호는 추가 순서)"""
+        doc_id = len(self.doc_keys)
+        self.doc_keys.append(doc_key)
+        for term in set(tokenize(text)):
+            self.postings.setdefault(term, []).append(doc_id)
+
+    def write(self, prefix: str):
+        """<prefix>.index (메타 JSON + 포스팅) 기록"""
+        os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+        terms = {}
+        chunks = []
+        offset = 0
+        for term in sorted(self.postings):
+            encoded = encode_postings(self.postings[term])
+            chunks.append(encoded)
+            terms[term] = [offset, len(encoded), len(self.postings[term])]
+            offset += len(encoded)
+
+        meta = {"version": INDEX_FORMAT_VERSION, "docs": self.doc_keys, "terms": terms}
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+        with open(f"{prefix}.index.tmp", 'wb') as f:
+            f.write(HEADER.pack(len(meta_bytes)))
+            f.write(meta_bytes)
+            for encoded in chunks:
+                f.write(encoded)
+
+        # 조회 중인 서버가 반쯤 쓰인 파일을 읽지 않도록 교체는 rename 한 번으로
+        os.replace(f"{prefix}.index.tmp", f"{prefix}.index")
+        logger.info(f"역색인 기록 완료: {prefix} (문서 {len(self.doc_keys)}개, 단어 {len(terms)}개)")
+
+
+def file_identity(stat: os.stat_result) -> Tuple[int, int]:
+    """재생성(rename) 여부 판단용 (inode, 수정 시각)"""
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class TextIndex:
+    """메모리 맵 기반 역색인 리더
+
+    메모리 맵은 명시적으로 닫지 않습니다. 색인이 재생성되어 캐시에서 교체되어도 조회 중인
+    요청이 참조를 들고 있는 동안은 유지되고, 마지막 참조가 사라지면 해제됩니다.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        with open(f"{prefix}.index", 'rb') as f:
+            self.identity = file_identity(os.fstat(f.fileno()))
+            # mmap은 파일 디스크립터를 복제하므로 파일은 바로 닫아도 됨
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (meta_length,) = HEADER.unpack_from(buffer, 0)
+        meta = json.loads(buffer[HEADER.size:HEADER.size + meta_length].decode('utf-8'))
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 색인 버전: {meta.get('version')}")
+
+        self.doc_keys: List[Any] = meta["docs"]
+        self.terms: Dict[str, List[int]] = meta["terms"]
+        self._buffer = buffer
+        self._postings_offset = HEADER.size + meta_length
+
+    def postings(self, term: str) -> List[int]:
+        """단어의 문서 번호 리스트"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return []
+        offset, length, _ = entry
+        return decode_postings(self._buffer, self._postings_offset + offset, length)
+
+    def search(self, query: str) -> List[Any]:
+        """질의의 모든 단어를 포함하는 문서 키 반환 (AND 검색, 문서 빈도가 낮은 단어부터 교집합)"""
+        terms = sorted(set(tokenize(query)), key=lambda t: self.terms.get(t, [0, 0, 0])[2])
+        if not terms:
+            return []
+
+        result = self.postings(terms[0])
+        for term in terms[1:]:
+            if not result:
+                break
+            result = intersect_sorted(result, self.postings(term))
+
+        return [self.doc_keys[doc_id] for doc_id in result]
+
+
+_index_cache: Dict[Tuple[str, str], TextIndex] = {}
+_index_lock = threading.Lock()
+
+
+def load_text_index(benchmark: str, field: str) -> Optional[TextIndex]:
+    """색인 로드 (프로세스 내 캐시, 파일이 다시 빌드되면 재로드)"""
+    prefix = get_index_prefix(benchmark, field)
+    try:
+        identity = file_identity(os.stat(f"{prefix}.index"))
+    except FileNotFoundError:
+        return None
+
+    with _index_lock:
+        cached = _index_cache.get((benchmark, field))
+        if cached and cached.identity == identity:
+            return cached
+
+        # 이전 색인은 닫지 않고 캐시에서만 교체 (조회 중인 요청이 끝나면 참조 카운트로 해제)
+        index = TextIndex(prefix)
+        _index_cache[(benchmark, field)] = index
+        return index
+
+
+def build_text_index(connection, benchmark: str, field: str = 'question', batch_size: int = 2000) -> TextIndexBuilder:
+    """결과 테이블에서 역색인 생성 (question은 data_id당 한 번만 색인)"""
+    table_name = Config.get_table_name(benchmark)
+    builder = TextIndexBuilder()
+    seen = set()
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT data_id, model_name, {field} FROM {table_name} ORDER BY data_id, model_name")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for data_id, model_name, text in rows:
+                if field == 'question':
+                    if data_id in seen:
+                        continue
+                    seen.add(data_id)
+                    builder.add(data_id, text)
+                else:
+                    builder.add([data_id, model_name], text)
+    finally:
+        cursor.close()
+
+    builder.write(get_index_prefix(benchmark, field))
+    return builder
+
+
+def search_with_scores(
+    connection,
+    benchmark: str,
+    query: str,
+    field: str,
+    models: List[str],
+    min_models_correct: Optional[int] = None,
+    max_models_correct: Optional[int] = None,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """전문 검색 결과 문항을 모델별 점수와 결합
+
+    models_correct는 만점(match_score = 1)을 받은 모델 수입니다.
+    """
+    index = load_text_index(benchmark, field)
+    if index is None:
+        raise FileNotFoundError(f"[{benchmark}] '{field}' 색인이 없습니다. text_index.py로 먼저 생성하세요.")
+
+    hits = index.search(query)
+    if field == 'response':
+        # (data_id, model_name) 문서 -> 요청한 모델의 data_id만
+        model_set = set(models)
+        hit_data_ids = list(dict.fromkeys(doc[0] for doc in hits if doc[1] in model_set))
+    else:
+        hit_data_ids = hits
+    total_hits = len(hit_data_ids)
+
+    if not hit_data_ids:
+        return {"benchmark": benchmark, "query": query, "field": field, "total_hits": 0, "results": []}
+
+    table_name = Config.get_table_name(benchmark)
+    having = []
+    having_params: List[Any] = []
+    if min_models_correct is not None:
+        having.append("models_correct >= %s")
+        having_params.append(min_models_correct)
+    if max_models_correct is not None:
+        having.append("models_correct <= %s")
+        having_params.append(max_models_correct)
+
+    # 집계·필터·정렬은 data_id별이므로 IN 목록을 나눠 조회해도 전체 적중 문항에 대한 결과와 같습니다.
+    # 청크마다 상위 limit개만 받아 합친 뒤 다시 정렬합니다.
+    rows: List[Dict[str, Any]] = []
+    cursor = connection.cursor(dictionary=True)
+    try:
+        for start in range(0, len(hit_data_ids), SCORE_QUERY_CHUNK_SIZE):
+            chunk = hit_data_ids[start:start + SCORE_QUERY_CHUNK_SIZE]
+            query_sql = f"""
+            SELECT data_id,
+                COUNT(*) as models_evaluated,
+                SUM(match_score >= 1) as models_correct,
+                AVG(match_score) as avg_match_score
+            FROM {table_name}
+            WHERE data_id IN ({', '.join(['%s'] * len(chunk))})
+                AND model_name IN ({', '.join(['%s'] * len(models))})
+            GROUP BY data_id
+            {'HAVING ' + ' AND '.join(having) if having else ''}
+            ORDER BY models_correct, avg_match_score
+            LIMIT %s
+            """
+            cursor.execute(query_sql, list(chunk) + list(models) + having_params + [limit])
+            rows.extend(cursor.fetchall())
+    finally:
+        cursor.close()
+
+    rows.sort(key=lambda row: (int(row["models_correct"] or 0), float(row["avg_match_score"])))
+    rows = rows[:limit]
+
+    results = [
+        {
+            "data_id": row["data_id"],
+            "models_evaluated": row["models_evaluated"],
+            "models_correct": int(row["models_correct"] or 0),
+            "avg_match_score": round(float(row["avg_match_score"]), 4)
+        }
+        for row in rows
+    ]
+
+    return {
+        "benchmark": benchmark,
+        "query": query,
+        "field": field,
+        "total_hits": total_hits,
+        "results": results
+    }
+
+
+def main():
+    """적재 완료 후 색인 생성 CLI"""
+    import mysql.connector
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="벤치마크 결과 전문 검색 색인 생성")
+    parser.add_argument('--benchmark', action='append', choices=Config.BENCHMARKS,
+                        help="색인할 벤치마크 (생략 시 전체)")
+    parser.add_argument('--responses', action='store_true', help="모델 응답(response) 색인도 생성")
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**mysql_config.to_dict())
+    try:
+        for benchmark in args.benchmark or Config.BENCHMARKS:
+            build_text_index(connection, benchmark, 'question')
+            if args.responses:
+                build_text_index(connection, benchmark, 'response')
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+문항 의미 검색(벡터) 색인 모듈
+
+Agentic RAG 서브 에이전트용으로 벤치마크 문항(문제 + 선택지)을 임베딩해 오프라인으로
+색인을 만들고, 조회 시 메모리 맵 float16 행렬에 대한 NumPy 전수(brute-force) 내적으로
+가장 유사한 문항을 찾습니다.
+
+임베딩은 외부 모델 없이 동작하는 해시 TF-IDF(단어 + 바이그램 feature hashing)입니다.
+벡터는 L2 정규화되어 있어 내적이 곧 코사인 유사도입니다.
+
+파일: <prefix>.index 하나에 [메타 길이(8바이트) | 메타 JSON(data_id 목록) | IDF(float32) | 벡터(float16)]
+순서로 저장합니다. (text_index와 같이 재생성 시 rename 한 번으로 교체되므로 조회 중에 새 벡터와
+이전 data_id 목록이 섞이지 않음)
+
+사용법 (적재 완료 후):
+    python vector_index.py --benchmark mmlu [--dim 1024]
+"""
+from typing import List, Dict, Any, Tuple, Optional
+import argparse
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from config import Config, mysql_config
+from text_index import HEADER, file_identity, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_DIM = 1024
+INDEX_FORMAT_VERSION = 4
+# 배열 시작 위치 정렬 단위 (바이트)
+ARRAY_ALIGNMENT = 64
+
+# 전수 검색 시 한 번에 float32로 변환할 문항 수 (메모리 사용량 제한)
+SEARCH_BLOCK_ROWS = 65536
+
+
+class HashedTfidfEmbedder:
+    """해시 TF-IDF 임베딩 (단어 유니그램 + 바이그램, 부호 해싱)"""
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM, idf: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.idf = idf if idf is not None else np.ones(dim, dtype=np.float32)
+
+    @staticmethod
+    def features(text: str) -> List[str]:
+        """텍스트의 유니그램 + 바이그램 특징"""
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _hash(self, feature: str) -> Tuple[int, float]:
+        """특징 -> (버킷, 부호). 프로세스마다 값이 달라지는 hash() 대신 crc32 사용"""
+        h = zlib.crc32(feature.encode('utf-8'))
+        return h % self.dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+    def _term_frequencies(self, text: str) -> Dict[int, float]:
+        """버킷별 부호 있는 TF 합"""
+        counts: Dict[int, float] = {}
+        for feature in self.features(text):
+            bucket, sign = self._hash(feature)
+            counts[bucket] = counts.get(bucket, 0.0) + sign
+        return counts
+
+    def fit(self, texts: List[str]) -> 'HashedTfidfEmbedder':
+        """문서 빈도로 버킷별 IDF 계산"""
+        df = np.zeros(self.dim, dtype=np.float64)
+        for text in texts:
+            buckets = {self._hash(feature)[0] for feature in self.features(text)}
+            df[list(buckets)] += 1
+        self.idf = (np.log((1 + len(texts)) / (1 + df)) + 1).astype(np.float32)
+        return self
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        """텍스트 리스트 -> L2 정규화된 (len(texts), dim) float32 행렬"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for bucket, value in self._term_frequencies(text).items():
+                # 서브리니어 TF (부호 유지)
+                if value:
+                    matrix[row, bucket] = math.copysign(1 + math.log(abs(value)), value)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+def get_vector_index_prefix(benchmark: str) -> str:
+    """벤치마크별 벡터 색인 파일 경로 접두사"""
+    return os.path.join(Config.INDEX_DIR, f"{benchmark}.semantic")
+
+
+def build_document_text(question: str, choices: List[Optional[str]]) -> str:
+    """임베딩할 문항 텍스트 (문제 + 선택지)"""
+    return "\n".join([question or ''] + [choice for choice in choices if choice])
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+def write_vector_index(prefix: str, data_ids: List[Any], texts: List[str], dim: int = DEFAULT_EMBEDDING_DIM):
+    """임베딩 후 <prefix>.index (메타 JSON + IDF float32 + 벡터 float16) 기록
+
+    data_id는 벤치마크마다 INT 또는 VARCHAR이므로 text_index와 같이 메타 JSON에 JSON 값 그대로 저장하고
+    검색 결과에도 그대로 반환합니다.
+
+    벡터 행렬은 (dim, 문항 수) 차원 우선 배치로 저장합니다. 희소 질의의 0이 아닌 차원만
+    읽을 때 연속된 행을 읽게 되어 메모리 맵 접근이 빠릅니다.
+    """
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+    embedder = HashedTfidfEmbedder(dim).fit(texts)
+    vectors = np.ascontiguousarray(embedder.transform(texts).T.astype(np.float16))
+    idf = np.ascontiguousarray(embedder.idf.astype(np.float32))
+
+    meta = {
+        "version": INDEX_FORMAT_VERSION, "embedding": "hashed-tfidf", "dim": dim,
+        "count": len(data_ids), "ids": list(data_ids)
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    idf_offset = _aligned(HEADER.size + len(meta_bytes))
+    vectors_offset = _aligned(idf_offset + idf.nbytes)
+
+    with open(f"{prefix}.index.tmp", 'wb') as f:
+        f.write(HEADER.pack(len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(b'\0' * (idf_offset - f.tell()))
+        f.write(idf.tobytes())
+        f.write(b'\0' * (vectors_offset - f.tell()))
+        f.write(vectors.tobytes())
+
+    # 조회 중인 서버가 반쯤 쓰인 파일이나 서로 다른 빌드의 벡터/메타를 읽지 않도록 교체는 rename 한 번으로
+    os.replace(f"{prefix}.index.tmp", f"{prefix}.index")
+    logger.info(f"벡터 색인 기록 완료: {prefix} (문항 {len(data_ids)}개, 차원 {dim})")
+
+
+class VectorIndex:
+    """메모리 맵 float16 행렬 기반 벡터 색인 리더
+
+    메모리 맵은 명시적으로 닫지 않습니다. 색인이 재생성되어 캐시에서 교체되어도 조회 중인
+    요청이 참조를 들고 있는 동안은 유지되고, 마지막 참조가 사라지면 해제됩니다.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        with open(f"{prefix}.index", 'rb') as f:
+            self.identity = file_identity(os.fstat(f.fileno()))
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (meta_length,) = HEADER.unpack_from(buffer, 0)
+        meta = json.loads(buffer[HEADER.size:HEADER.size + meta_length].decode('utf-8'))
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 색인 버전: {meta.get('version')}")
+
+        dim, count = meta["dim"], meta["count"]
+        idf_offset = _aligned(HEADER.size + meta_length)
+        vectors_offset = _aligned(idf_offset + dim * 4)
+        self.data_ids: List[Any] = meta["ids"]
+        self.vectors = np.frombuffer(buffer, dtype=np.float16, count=dim * count, offset=vectors_offset).reshape(dim, count)
+        idf = np.frombuffer(buffer, dtype=np.float32, count=dim, offset=idf_offset)
+        self.embedder = HashedTfidfEmbedder(dim, idf.copy())
+
+    def __len__(self) -> int:
+        return len(self.data_ids)
+
+    def scores(self, query_vectors: np.ndarray) -> np.ndarray:
+        """(질의 수, dim) -> (질의 수, 문항 수) 코사인 유사도
+
+        해시 TF-IDF 질의 벡터는 희소하므로 0이 아닌 차원의 행만 float32로 변환해 곱합니다.
+        (행렬 전체 변환 대비 메모리/시간이 질의 단어 수에 비례)
+        """
+        dims = np.flatnonzero(np.any(query_vectors != 0, axis=0))
+        result = np.zeros((query_vectors.shape[0], len(self)), dtype=np.float32)
+        if len(dims) == 0:
+            return result
+        query_part = query_vectors[:, dims]
+        for start in range(0, len(self), SEARCH_BLOCK_ROWS):
+            block = np.asarray(self.vectors[dims, start:start + SEARCH_BLOCK_ROWS], dtype=np.float32)
+            result[:, start:start + block.shape[1]] = query_part @ block
+        return result
+
+    def search(self, query: str, top_k: int = 100) -> List[Dict[str, Any]]:
+        """질의와 가장 유사한 문항 top_k개 (유사도 내림차순)"""
+        if len(self) == 0:
+            return []
+        scores = self.scores(self.embedder.transform([query]))[0]
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [{"data_id": self.data_ids[i], "score": round(float(scores[i]), 4)} for i in top]
+
+    def multi_search(self, queries: List[str], top_n: int = 100) -> List[Dict[str, Any]]:
+        """여러 질의를 한 번의 행렬 곱으로 검색하고 중복을 제거한 상위 top_n개 문항 반환
+
+        질의별 상위 top_n개(각각 서로 다른 문항)를 힙으로 병합하므로 문항 수가 충분하면
+        항상 정확히 top_n개의 고유 문항이 나옵니다. 각 문항의 점수는 질의 중 최대 유사도입니다.
+        """
+        if len(self) == 0 or not queries:
+            return []
+        scores = self.scores(self.embedder.transform(queries))
+        k = min(top_n, len(self))
+
+        # 질의별 상위 k개 (유사도 내림차순)
+        per_query = []
+        for query_idx, row in enumerate(scores):
+            top = np.argpartition(-row, k - 1)[:k]
+            top = top[np.argsort(-row[top])]
+            per_query.append([(-float(row[i]), int(i), query_idx) for i in top])
+
+        merged: Dict[int, Dict[str, Any]] = {}
+        for neg_score, doc_idx, query_idx in heapq.merge(*per_query):
+            entry = merged.get(doc_idx)
+            if entry is not None:
+                entry["matched_queries"].append(query_idx)
+                continue
+            if len(merged) == k:
+                continue
+            merged[doc_idx] = {
+                "data_id": self.data_ids[doc_idx],
+                "score": round(-neg_score, 4),
+                "matched_queries": [query_idx]
+            }
+
+        return list(merged.values())
+
+
+_index_cache: Dict[str, VectorIndex] = {}
+_index_lock = threading.Lock()
+
+
+def load_vector_index(benchmark: str) -> Optional[VectorIndex]:
+    """벡터 색인 로드 (프로세스 내 캐시, 파일이 다시 빌드되면 재로드)"""
+    prefix = get_vector_index_prefix(benchmark)
+    try:
+        identity = file_identity(os.stat(f"{prefix}.index"))
+    except FileNotFoundError:
+        return None
+
+    with _index_lock:
+        cached = _index_cache.get(benchmark)
+        if cached and cached.identity == identity:
+            return cached
+
+        # 이전 색인은 닫지 않고 캐시에서만 교체 (조회 중인 요청이 끝나면 참조 카운트로 해제)
+        index = VectorIndex(prefix)
+        _index_cache[benchmark] = index
+        return index
+
+
+def semantic_search(benchmark: str, query: str, top_k: int = 100) -> Dict[str, Any]:
+    """의미 검색 실행 (DB 조회 없음)"""
+    index = load_vector_index(benchmark)
+    if index is None:
+        raise FileNotFoundError(f"[{benchmark}] 의미 검색 색인이 없습니다. vector_index.py로 먼저 생성하세요.")
+
+    start = time.perf_counter()
+    results = index.search(query, top_k)
+
+    return {
+        "benchmark": benchmark,
+        "query": query,
+        "results": results,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+
+def multi_query_search_with_scores(
+    connection,
+    benchmark: str,
+    queries: List[str],
+    models: List[str],
+    top_n: int = 100
+) -> Dict[str, Any]:
+    """여러 질의의 유사 문항(고유 top_n개)을 찾고 해당 문항들에 대한 모델별 성능 집계"""
+    index = load_vector_index(benchmark)
+    if index is None:
+        raise FileNotFoundError(f"[{benchmark}] 의미 검색 색인이 없습니다. vector_index.py로 먼저 생성하세요.")
+
+    start = time.perf_counter()
+    questions = index.multi_search(queries, top_n)
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    model_scores = []
+    if questions:
+        data_ids = [q["data_id"] for q in questions]
+        query_sql = f"""
+        SELECT model_name,
+            COUNT(*) as question_count,
+            SUM(match_score >= 1) as correct_count,
+            AVG(match_score) as avg_match_score
+        FROM {Config.get_table_name(benchmark)}
+        WHERE data_id IN ({', '.join(['%s'] * len(data_ids))})
+            AND model_name IN ({', '.join(['%s'] * len(models))})
+        GROUP BY model_name
+        ORDER BY avg_match_score DESC
+        """
+        cursor = connection.cursor(dictionary=True)
+        try:
+            cursor.execute(query_sql, data_ids + list(models))
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        model_scores = [
+            {
+                "model_name": row["model_name"],
+                "question_count": row["question_count"],
+                "correct_count": int(row["correct_count"] or 0),
+                "avg_match_score": round(float(row["avg_match_score"]), 4)
+            }
+            for row in rows
+        ]
+
+    return {
+        "benchmark": benchmark,
+        "queries": queries,
+        "questions": questions,
+        "model_scores": model_scores,
+        "best_model": model_scores[0]["model_name"] if model_scores else None,
+        "search_elapsed_ms": elapsed_ms
+    }
+
+
+def build_vector_index(connection, benchmark: str, dim: int = DEFAULT_EMBEDDING_DIM, batch_size: int = 2000):
+    """결과 테이블에서 문항(data_id당 한 번) 텍스트를 읽어 벡터 색인 생성"""
+    table_name = Config.get_table_name(benchmark)
+    choice_columns = Config.BENCHMARK_CHOICE_COLUMNS.get(benchmark, [])
+    select_columns = ['data_id', 'question'] + choice_columns
+
+    data_ids: List[Any] = []
+    texts: List[str] = []
+    seen = set()
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT {', '.join(select_columns)} FROM {table_name} ORDER BY data_id")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                if row[0] in seen:
+                    continue
+                seen.add(row[0])
+                data_ids.append(row[0])
+                texts.append(build_document_text(row[1], list(row[2:])))
+    finally:
+        cursor.close()
+
+    write_vector_index(get_vector_index_prefix(benchmark), data_ids, texts, dim)
+
+
+def main():
+    """적재 완료 후 벡터 색인 생성 CLI"""
+    import mysql.connector
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="벤치마크 문항 의미 검색 색인 생성")
+    parser.add_argument('--benchmark', action='append', choices=Config.BENCHMARKS,
+                        help="색인할 벤치마크 (생략 시 전체)")
+    parser.add_argument('--dim', type=int, default=DEFAULT_EMBEDDING_DIM, help="임베딩 차원 (해시 버킷 수)")
+    args = parser.parse_args()
+
+    connection = mysql.connector.connect(**mysql_config.to_dict())
+    try:
+        for benchmark in args.benchmark or Config.BENCHMARKS:
+            build_vector_index(connection, benchmark, args.dim)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
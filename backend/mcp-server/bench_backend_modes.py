@@ -0,0 +1,85 @@
+"""
+MCP 도구 호출 지연 시간 비교 (http vs embedded)
+
+같은 도구 호출을 두 가지 백엔드 호출 방식으로 반복 실행하고 p50/p95/평균을 출력합니다.
+http 모드는 api-server가 실행 중이어야 하며, embedded 모드는 같은 MySQL 설정(.env)을 사용합니다.
+
+사용 예:
+    python bench_backend_modes.py --iterations 30
+    python bench_backend_modes.py --modes embedded --benchmark mmlu --models gpt-4o llama-4
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Dict, Any, Callable, Awaitable, Tuple
+
+import server
+
+
+def build_scenarios(args) -> List[Tuple[str, Callable[[], Awaitable[str]]]]:
+    """(이름, 도구 호출) 목록"""
+    return [
+        ("get_available_models", lambda: server.get_available_models()),
+        ("analyze_single_model_with_metadata", lambda: server.analyze_single_model_with_metadata(
+            model=args.models[0], benchmark=args.benchmark, metadata_columns=args.metadata
+        )),
+        ("compare_models_multi_benchmark", lambda: server.compare_models_multi_benchmark(
+            models=args.models, benchmarks=[args.benchmark], metadata_level=args.metadata
+        )),
+        ("find_unusual_models", lambda: server.find_unusual_models(
+            benchmark=args.benchmark, models=args.models, metadata_columns=args.metadata
+        )),
+    ]
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(mode: str, scenarios, iterations: int, warmup: int) -> Dict[str, Dict[str, Any]]:
+    """한 모드에서 시나리오별 지연 시간 측정 (ms)"""
+    server.client = server.create_client(mode)
+    results = {}
+    for name, call in scenarios:
+        for _ in range(warmup):
+            await call()
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            output = await call()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = {
+            "p50": statistics.median(timings),
+            "p95": percentile(timings, 0.95),
+            "mean": statistics.fmean(timings),
+            "output_chars": len(output)
+        }
+    await server.client.client.aclose()
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MCP 도구 호출 지연 시간 비교 (http vs embedded)")
+    parser.add_argument("--modes", nargs="+", default=["http", "embedded"], choices=["http", "embedded"])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--benchmark", default="mmlu")
+    parser.add_argument("--models", nargs="+", default=["gpt-4o", "llama-4", "deepseek-r1"])
+    parser.add_argument("--metadata", nargs="+", default=["difficulty"])
+    args = parser.parse_args()
+
+    scenarios = build_scenarios(args)
+    all_results = {mode: await run_mode(mode, scenarios, args.iterations, args.warmup) for mode in args.modes}
+
+    print(f"{'도구':<40} {'모드':<10} {'p50(ms)':>10} {'p95(ms)':>10} {'평균(ms)':>10} {'출력 길이':>10}")
+    for name, _ in scenarios:
+        for mode in args.modes:
+            r = all_results[mode][name]
+            print(f"{name:<40} {mode:<10} {r['p50']:>10.2f} {r['p95']:>10.2f} {r['mean']:>10.2f} {r['output_chars']:>10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
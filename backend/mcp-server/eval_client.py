@@ -0,0 +1,219 @@
+"""
+api-server 공용 HTTP 클라이언트
+
+MCP 서버들(server.py, test.py, image_agent/image-mcp.py)이 함께 쓰는 httpx 래퍼입니다.
+- 연결 풀 크기와 keep-alive 유지 시간 조정 (uvicorn 기본 keep-alive 5초보다 짧게 유지해
+  서버가 닫은 연결을 재사용하다 실패하는 경우를 줄임)
+- h2 패키지가 설치되어 있으면 HTTP/2 사용 (TLS 백엔드에서만 협상되고, 평문 HTTP는 HTTP/1.1 유지)
+- 멱등 요청은 연결 오류와 429/502/503/504 응답에 지터 백오프로 재시도 (Retry-After 준수)
+  멱등이 아닌 요청은 요청이 전송되기 전 실패(연결 실패)만 재시도
+- 느린 요청 헤징: 지정한 요청이 일정 시간 안에 끝나지 않으면 같은 요청을 한 번 더 보내 먼저 끝난 응답 사용
+- 엔드포인트별 지연 시간/재시도/헤징 통계
+"""
+from collections import deque
+from typing import Dict, Any, Optional, Deque
+import asyncio
+import importlib.util
+import os
+import random
+import time
+
+import httpx
+
+# 타임아웃(초)
+HTTP_TIMEOUT = float(os.getenv("AI_EVAL_HTTP_TIMEOUT", 30))
+CONNECT_TIMEOUT = float(os.getenv("AI_EVAL_HTTP_CONNECT_TIMEOUT", 5))
+
+# 연결 풀
+MAX_CONNECTIONS = int(os.getenv("AI_EVAL_HTTP_MAX_CONNECTIONS", 20))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_EVAL_HTTP_MAX_KEEPALIVE", 10))
+KEEPALIVE_EXPIRY = float(os.getenv("AI_EVAL_HTTP_KEEPALIVE_EXPIRY", 4))
+
+# 재시도 (지터 백오프: 0 ~ min(최대, 기본 * 2^시도) 사이 임의 대기)
+MAX_RETRIES = int(os.getenv("AI_EVAL_HTTP_MAX_RETRIES", 2))
+RETRY_BACKOFF_BASE = 0.2
+RETRY_BACKOFF_MAX = 2.0
+RETRY_AFTER_MAX = 10.0
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+# 헤징 대기 시간(초, 0이면 헤징 안 함). 표본이 충분하면 엔드포인트 p95와 비교해 더 긴 쪽 사용
+HEDGE_DELAY = float(os.getenv("AI_EVAL_HEDGE_DELAY", 0))
+HEDGE_MIN_SAMPLES = 20
+
+# 엔드포인트별 보관할 최근 지연 시간 수
+LATENCY_WINDOW = 500
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class EndpointStats:
+    """엔드포인트 하나의 호출 통계 (지연 시간은 최근 LATENCY_WINDOW개 기준)"""
+
+    def __init__(self):
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p50_ms": ms(self.percentile(0.5)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "mean_ms": ms(sum(self.latencies) / len(self.latencies)) if self.latencies else None
+        }
+
+
+class ResilientClient:
+    """재시도/헤징/통계를 더한 httpx.AsyncClient 래퍼 (get/post는 httpx와 같은 방식으로 응답 반환)"""
+
+    def __init__(
+        self,
+        base_url: str,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_retries: int = MAX_RETRIES,
+        hedge_delay: float = HEDGE_DELAY
+    ):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.hedge_delay = hedge_delay
+        self.stats: Dict[str, EndpointStats] = {}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            transport=transport,
+            timeout=httpx.Timeout(HTTP_TIMEOUT, connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY
+            ),
+            http2=HTTP2_AVAILABLE and transport is None
+        )
+
+    async def get(self, url: str, endpoint: Optional[str] = None, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, idempotent=True, endpoint=endpoint, **kwargs)
+
+    async def post(
+        self,
+        url: str,
+        idempotent: bool = False,
+        hedge: bool = False,
+        endpoint: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """POST 요청 (조회용 POST는 idempotent=True로 재시도 허용, hedge=True면 느릴 때 헤징)"""
+        return await self.request("POST", url, idempotent=idempotent, hedge=hedge, endpoint=endpoint, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        hedge: bool = False,
+        endpoint: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """재시도 대상 응답은 재시도 후 마지막 응답 반환, 연결 오류는 재시도가 끝나면 그대로 발생"""
+        stats = self.stats.setdefault(f"{method} {endpoint or url}", EndpointStats())
+        stats.requests += 1
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                if hedge and idempotent and self.hedge_delay > 0:
+                    response = await self._send_hedged(stats, method, url, **kwargs)
+                else:
+                    response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries or not self._can_retry_error(e, idempotent):
+                    stats.errors += 1
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if not (idempotent and response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries):
+                    stats.latencies.append(time.perf_counter() - started)
+                    if response.status_code >= 500:
+                        stats.errors += 1
+                    return response
+                delay = self._retry_after(response) or self._backoff(attempt)
+                await response.aclose()
+
+            attempt += 1
+            stats.retries += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _can_retry_error(error: httpx.TransportError, idempotent: bool) -> bool:
+        """멱등 요청은 전송 오류(응답 대기 시간 초과 제외), 그 외에는 요청이 전송되지 않은 연결 실패만 재시도"""
+        if isinstance(error, httpx.ReadTimeout):
+            # 이미 오래 걸린 분석을 다시 보내면 백엔드 부하만 늘어남
+            return False
+        if idempotent:
+            return True
+        return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """Retry-After 헤더(초) -> 대기 시간 (최대 RETRY_AFTER_MAX)"""
+        value = response.headers.get("retry-after")
+        try:
+            return min(float(value), RETRY_AFTER_MAX) if value else None
+        except ValueError:
+            return None
+
+    def _hedge_after(self, stats: EndpointStats) -> float:
+        if len(stats.latencies) < HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        return max(self.hedge_delay, stats.percentile(0.95))
+
+    async def _send_hedged(self, stats: EndpointStats, method: str, url: str, **kwargs) -> httpx.Response:
+        """첫 요청이 헤징 대기 시간 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 응답 사용"""
+        primary = asyncio.create_task(self.client.request(method, url, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=self._hedge_after(stats))
+        if done:
+            return primary.result()
+
+        stats.hedges += 1
+        backup = asyncio.create_task(self.client.request(method, url, **kwargs))
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """엔드포인트별 통계"""
+        return {endpoint: stats.to_dict() for endpoint, stats in sorted(self.stats.items())}
+
+    async def aclose(self):
+        await self.client.aclose()
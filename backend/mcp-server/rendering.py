@@ -0,0 +1,267 @@
+"""
+토큰 예산 기반 도구 출력 렌더링
+
+메타데이터 2단계 그룹화 결과는 수천 행의 마크다운 테이블이 되어 연구 모델의 컨텍스트를
+넘기 쉽습니다. 이 모듈은 테이블 행마다 관련도(모델 간 점수 편차, 평균 대비 극단값)를 매겨
+예산 안에서 관련도가 높은 행만 남기고, 나머지는 1단계 그룹별 요약 행으로 접은 뒤
+무엇을 생략했는지 함께 표시합니다. 도구 호출 하나의 출력 크기가 예산을 넘지 않습니다.
+
+에이전트가 결과를 다시 가공하는 경우를 위해 산문 없이 값만 담는 압축 형식(csv, json-compact)도
+제공합니다. 짧은 키와 고정 소수점 자릿수를 사용합니다.
+- 공통 키: m=모델, b=벤치마크, lv=메타데이터 기준, s=점수, n=문항 수, avg/min/max=점수 요약
+- json-compact 표: {"id": 표 이름, "c": 컬럼, "r": 행 배열, "x": 생략된 행 수}
+- csv 표: "# " 로 시작하는 메타 줄(key=value;...) 뒤에 헤더와 행
+"""
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+import csv
+import io
+import json
+import math
+import os
+
+# 도구 출력 기본 토큰 예산 (0 이하면 제한 없음)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("MCP_TOKEN_BUDGET", 4000))
+
+# 점수 상위/하위 몇 개 행은 관련도와 무관하게 항상 표시
+ALWAYS_KEEP_EXTREMES = 2
+
+# 도구 출력 형식
+FORMAT_MARKDOWN = "markdown"
+FORMAT_CSV = "csv"
+FORMAT_JSON_COMPACT = "json-compact"
+OUTPUT_FORMATS = (FORMAT_MARKDOWN, FORMAT_CSV, FORMAT_JSON_COMPACT)
+
+# 압축 형식의 실수 소수점 자릿수
+COMPACT_PRECISION = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사 (영문/숫자/기호 약 4자당 1토큰, 한글 등 비ASCII 약 1.5자당 1토큰)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def resolve_budget(token_budget: Optional[int]) -> int:
+    """도구 인자 -> 실제 예산 (None이면 기본값, 0 이하면 무제한)"""
+    budget = DEFAULT_TOKEN_BUDGET if token_budget is None else token_budget
+    return budget if budget > 0 else 0
+
+
+@dataclass
+class TableRow:
+    """렌더링할 테이블 행"""
+    cells: List[str]
+    score: float              # 요약 행의 평균/범위 계산용
+    relevance: float = 0.0
+    group: str = ""           # 생략 시 묶을 키 (보통 1단계 메타데이터 값)
+    questions: int = 0
+
+
+def _z_scores(values: List[float]) -> List[float]:
+    if len(values) < 2:
+        return [0.0] * len(values)
+    mean = sum(values) / len(values)
+    std = math.sqrt(sum((v - mean) ** 2 for v in values) / len(values)) or 1.0
+    return [abs(v - mean) / std for v in values]
+
+
+def relevance_scores(scores: List[float], spreads: Optional[List[float]] = None) -> List[float]:
+    """관련도 계산: 평균 대비 극단 정도 + (있으면) 모델 간 점수 편차, 상·하위 극값은 inf"""
+    if not scores:
+        return []
+    extremes = _z_scores(scores)
+    max_extreme = max(extremes) or 1.0
+    max_spread = max(spreads) if spreads and max(spreads) > 0 else 1.0
+    relevance = [extreme / max_extreme for extreme in extremes]
+    if spreads:
+        relevance = [value + spread / max_spread for value, spread in zip(relevance, spreads)]
+
+    ranked = sorted(range(len(scores)), key=lambda i: scores[i])
+    for i in ranked[:ALWAYS_KEEP_EXTREMES] + ranked[-ALWAYS_KEEP_EXTREMES:]:
+        relevance[i] = math.inf
+    return relevance
+
+
+def score_relevance(rows: List[TableRow], spreads: Optional[List[float]] = None):
+    """TableRow들의 relevance 채우기"""
+    for row, relevance in zip(rows, relevance_scores([row.score for row in rows], spreads)):
+        row.relevance = relevance
+
+
+def _select_rows(costs: List[int], relevance: List[float], available: int) -> set:
+    """관련도 높은 행부터 남은 예산 안에서 선택 (극값 행은 예산을 넘지 않는 한 항상 포함)"""
+    order = sorted(range(len(costs)), key=lambda i: relevance[i], reverse=True)
+    keep = set()
+    for i in order:
+        if costs[i] <= available:
+            keep.add(i)
+            available -= costs[i]
+        elif relevance[i] != math.inf:
+            break
+    return keep
+
+
+def _format_row(cells: List[str]) -> str:
+    return "| " + " | ".join(cells) + " |"
+
+
+def _summary_cells(label: str, rows: List[TableRow], width: int, score_col: int) -> List[str]:
+    """생략된 행 묶음을 한 행으로: 라벨, 점수 열에 평균(최소~최대)"""
+    scores = [row.score for row in rows]
+    cells = [""] * width
+    cells[0] = f"… {label} ({len(rows)}개 생략)"
+    cells[score_col] = f"평균 {sum(scores) / len(scores):.4f} ({min(scores):.4f}~{max(scores):.4f})"
+    return cells
+
+
+def render_table(
+    headers: List[str],
+    rows: List[TableRow],
+    token_budget: int,
+    score_col: Optional[int] = None
+) -> List[str]:
+    """예산 안에서 마크다운 테이블 렌더링 (rows는 표시 순서, relevance는 미리 계산)
+
+    예산 0이면 전체 행을 그대로 출력합니다. 예산을 넘으면 관련도 순으로 행을 고르고,
+    나머지는 group별 요약 행(공간이 부족하면 전체 요약 한 줄)으로 대체한 뒤 생략 내역을 덧붙입니다.
+    """
+    score_col = len(headers) - 1 if score_col is None else score_col
+    lines = [_format_row(headers), "|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|"]
+    row_lines = [_format_row(row.cells) for row in rows]
+    costs = [estimate_tokens(line) + 1 for line in row_lines]
+
+    used = sum(estimate_tokens(line) + 1 for line in lines)
+    if not token_budget or used + sum(costs) <= token_budget:
+        return lines + row_lines
+
+    # 생략 안내/요약 행 공간 예약
+    reserve = 80
+    available = max(token_budget - used - reserve, 0)
+    keep = _select_rows(costs, [row.relevance for row in rows], available)
+    available -= sum(costs[i] for i in keep)
+
+    elided = [rows[i] for i in range(len(rows)) if i not in keep]
+    lines.extend(row_lines[i] for i in range(len(rows)) if i in keep)
+
+    # 생략된 행을 group별로 요약 (행이 많은 그룹부터, 남은 예산 안에서)
+    groups: Dict[str, List[TableRow]] = {}
+    for row in elided:
+        groups.setdefault(row.group, []).append(row)
+    summary_budget = available + reserve - 40
+    folded = 0
+    if len(groups) > 1:
+        for label, group_rows in sorted(groups.items(), key=lambda item: len(item[1]), reverse=True):
+            line = _format_row(_summary_cells(label or "기타", group_rows, len(headers), score_col))
+            cost = estimate_tokens(line) + 1
+            if cost > summary_budget:
+                break
+            lines.append(line)
+            summary_budget -= cost
+            groups.pop(label)
+            folded += len(group_rows)
+    rest = [row for group_rows in groups.values() for row in group_rows]
+    if rest:
+        lines.append(_format_row(_summary_cells("나머지 그룹" if folded else "생략된 그룹", rest, len(headers), score_col)))
+
+    questions = sum(row.questions for row in elided)
+    lines.append("")
+    lines.append(
+        f"(테이블 토큰 예산 {token_budget}: 전체 {len(rows)}개 행 중 {len(keep)}개 표시, "
+        f"{len(elided)}개 행{f'(문항 {questions:,}개)' if questions else ''}은 요약 행으로 접음. "
+        f"점수 편차·극단값 기준으로 선택, token_budget=0이면 전체 표시)"
+    )
+    return lines
+
+
+def check_output_format(output_format: str) -> Optional[str]:
+    """지원하지 않는 출력 형식이면 오류 메시지"""
+    if output_format in OUTPUT_FORMATS:
+        return None
+    return f"오류: output_format은 {', '.join(OUTPUT_FORMATS)} 중 하나여야 합니다."
+
+
+@dataclass
+class CompactTable:
+    """압축 형식으로 출력할 표 (rows는 표시 순서의 원시 값)"""
+    columns: List[str]
+    rows: List[List[Any]]
+    name: str = ""
+    meta: Dict[str, Any] = field(default_factory=dict)
+    scores: Optional[List[float]] = None   # 예산 초과 시 행 선택 기준 (없으면 앞에서부터)
+    spreads: Optional[List[float]] = None
+
+
+def _compact_value(value: Any) -> Any:
+    """실수는 고정 자릿수로 반올림 (bool/정수/문자열/None은 그대로)"""
+    if isinstance(value, float):
+        return round(value, COMPACT_PRECISION) if math.isfinite(value) else None
+    if isinstance(value, (list, tuple)):
+        return "|".join(str(_compact_value(item)) for item in value)
+    return value
+
+
+def _csv_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.{COMPACT_PRECISION}f}" if math.isfinite(value) else ""
+    return str(_compact_value(value))
+
+
+def _csv_line(values: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow([_csv_cell(value) for value in values])
+    return buffer.getvalue()
+
+
+def _csv_meta(meta: Dict[str, Any]) -> str:
+    return "# " + ";".join(f"{key}={_csv_cell(value)}" for key, value in meta.items() if value is not None) + "\n"
+
+
+def _trim_table(table: CompactTable, token_budget: int) -> int:
+    """표가 예산을 넘으면 관련도 순으로 행을 골라 줄이고 생략한 행 수 반환"""
+    costs = [estimate_tokens(_csv_line(row)) for row in table.rows]
+    if not token_budget or sum(costs) <= token_budget:
+        return 0
+    if table.scores is not None:
+        relevance = relevance_scores(table.scores, table.spreads)
+    else:
+        relevance = [float(len(costs) - i) for i in range(len(costs))]
+    keep = _select_rows(costs, relevance, token_budget)
+    elided = len(table.rows) - len(keep)
+    table.rows = [row for i, row in enumerate(table.rows) if i in keep]
+    return elided
+
+
+def render_compact(
+    meta: Dict[str, Any],
+    tables: List[CompactTable],
+    output_format: str,
+    token_budget: int = 0
+) -> str:
+    """도구 결과를 csv 또는 json-compact 문자열로 출력 (예산은 표마다 균등 분배)"""
+    table_budget = max(token_budget // max(len(tables), 1) - 20, 100) if token_budget else 0
+    elided = [_trim_table(table, table_budget) for table in tables]
+
+    if output_format == FORMAT_JSON_COMPACT:
+        payload = {key: _compact_value(value) for key, value in meta.items() if value is not None}
+        payload["t"] = []
+        for table, elided_rows in zip(tables, elided):
+            entry: Dict[str, Any] = {"id": table.name} if table.name else {}
+            entry.update({key: _compact_value(value) for key, value in table.meta.items() if value is not None})
+            entry["c"] = table.columns
+            entry["r"] = [[_compact_value(value) for value in row] for row in table.rows]
+            if elided_rows:
+                entry["x"] = elided_rows
+            payload["t"].append(entry)
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    parts = [_csv_meta(meta)] if meta else []
+    for table, elided_rows in zip(tables, elided):
+        table_meta = {"t": table.name or None, **table.meta, "x": elided_rows or None}
+        if any(value is not None for value in table_meta.values()):
+            parts.append(_csv_meta(table_meta))
+        parts.append(_csv_line(table.columns))
+        parts.extend(_csv_line(row) for row in table.rows)
+    return "".join(parts).rstrip("\n")
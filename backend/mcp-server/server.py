@@ -6,55 +6,133 @@ FastAPI 백엔드와 연동하여 AI 모델들의 벤치마크 성능을 분석
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional, Union
+import importlib.util
+import json
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Union, AsyncIterator
 import httpx
 from mcp.server.fastmcp import FastMCP
 
-# MCP 서버 초기화
-mcp = FastMCP("ai-evaluation-server")
+from eval_client import ResilientClient
+from rendering import (
+    FORMAT_CSV, FORMAT_JSON_COMPACT, FORMAT_MARKDOWN, CompactTable, TableRow, check_output_format, estimate_tokens,
+    render_compact, render_table, resolve_budget, score_relevance
+)
 
 # FastAPI 백엔드 URL 설정
-BACKEND_URL = "http://127.0.0.1:8000"
+BACKEND_URL = os.getenv("AI_EVAL_BACKEND_URL", "http://127.0.0.1:8000")
+
+# 백엔드 호출 방식
+# - http: 별도로 실행 중인 api-server에 HTTP로 요청
+# - embedded: api-server의 분석 계층을 같은 프로세스에서 직접 호출 (연결 풀/캐시 공유, HTTP/JSON 왕복 없음)
+BACKEND_MODE = os.getenv("AI_EVAL_BACKEND_MODE", "http")
+API_SERVER_DIR = os.getenv(
+    "API_SERVER_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api-server")
+)
+
+# 카탈로그(모델/벤치마크/메타데이터) 캐시 유지 시간(초). 만료 후에는 버전만 확인하고 바뀐 경우에만 다시 받음
+CATALOG_TTL = 300.0
+
+# 배치 분석 도구 제한 (동시 실행 수는 백엔드 수용 제어 슬롯을 한 배치가 독점하지 않도록 작게 유지)
+BATCH_MAX_SPECS = 20
+BATCH_MAX_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", 4))
+BATCH_SPEC_KEYS = {"label", "models", "benchmarks", "metadata_level", "filters"}
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """MCP 서버 시작 시 카탈로그 캐시 예열 (백엔드가 아직 안 떠 있으면 첫 호출 때 로드)"""
+    try:
+        await client.catalog.get()
+    except httpx.HTTPError:
+        pass
+    yield
+
+# MCP 서버 초기화
+mcp = FastMCP("ai-evaluation-server", lifespan=lifespan)
+
+class CatalogCache:
+    """백엔드 /catalog 응답 캐시 (TTL + ETag 버전 확인, 백엔드 장애 시 마지막 카탈로그 사용)"""
+    
+    def __init__(self, http_client: ResilientClient, ttl: float = CATALOG_TTL):
+        self.http_client = http_client
+        self.ttl = ttl
+        self.data: Optional[Dict[str, Any]] = None
+        self.fetched_at = 0.0
+        self._lock = asyncio.Lock()
+    
+    def is_fresh(self) -> bool:
+        return self.data is not None and time.monotonic() - self.fetched_at < self.ttl
+    
+    async def refresh(self):
+        """카탈로그 갱신 (버전이 같으면 304로 본문 없이 확인만)"""
+        headers = {"If-None-Match": f'"{self.data["version"]}"'} if self.data else {}
+        response = await self.http_client.get("/catalog", headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+            self.data = response.json()
+        self.fetched_at = time.monotonic()
+    
+    async def get(self) -> Dict[str, Any]:
+        """카탈로그 조회 (유효하면 네트워크 호출 없음)"""
+        if self.is_fresh():
+            return self.data
+        async with self._lock:
+            if not self.is_fresh():
+                try:
+                    await self.refresh()
+                except httpx.HTTPError:
+                    if self.data is None:
+                        raise
+        return self.data
 
 class AIEvaluationClient:
     """FastAPI 백엔드와 통신하는 클라이언트"""
     
     def __init__(self, base_url: str = BACKEND_URL):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(base_url=self.base_url, timeout=30.0)
+        self.client = ResilientClient(self.base_url)
+        self.catalog = CatalogCache(self.client)
     
     async def get_models(self) -> List[str]:
-        """사용 가능한 모델 목록 조회"""
-        response = await self.client.get("/models")
-        response.raise_for_status()
-        return response.json()
+        """사용 가능한 모델 목록 조회 (카탈로그 캐시)"""
+        return (await self.catalog.get())["models"]
     
     async def get_benchmarks(self) -> List[str]:
-        """사용 가능한 벤치마크 목록 조회"""
-        response = await self.client.get("/benchmarks")
-        response.raise_for_status()
-        return response.json()
+        """사용 가능한 벤치마크 목록 조회 (카탈로그 캐시)"""
+        return (await self.catalog.get())["benchmarks"]
     
     async def get_benchmark_metadata(self, benchmark: str) -> Dict[str, Any]:
-        """벤치마크별 메타데이터 조회"""
-        response = await self.client.get(f"/benchmarks/{benchmark}/metadata")
-        response.raise_for_status()
-        return response.json()
+        """벤치마크별 메타데이터 조회 (카탈로그 캐시)"""
+        catalog = await self.catalog.get()
+        metadata = catalog["metadata"]
+        if benchmark not in metadata:
+            raise ValueError(f"벤치마크를 찾을 수 없습니다: {benchmark}")
+        return {
+            "available_metadata": metadata[benchmark],
+            "response_stat_dimensions": catalog.get("response_stat_dimensions", [])
+        }
     
     async def analyze_performance(
         self,
         models: List[str],
         benchmarks: List[str],
-        metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None
+        metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None,
+        metrics: Optional[List[str]] = None,
+        filters: Optional[Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]] = None
     ) -> Dict[str, Any]:
         """다중 벤치마크 모델 성능 분석"""
         payload = {
             "models": models,
             "benchmarks": benchmarks,
-            "metadata_level": metadata_level or []
+            "metadata_level": metadata_level or [],
+            "metrics": metrics or [],
+            "filters": filters or []
         }
         
-        response = await self.client.post("/analysis", json=payload)
+        response = await self.client.post("/analysis", json=payload, idempotent=True, hedge=True)
         response.raise_for_status()
         return response.json()
     
@@ -63,9 +141,236 @@ class AIEvaluationClient:
         response = await self.client.get("/analysis/summary")
         response.raise_for_status()
         return response.json()
+    
+    async def find_outliers(
+        self,
+        benchmark: str,
+        models: Optional[List[str]] = None,
+        metadata_columns: Optional[List[str]] = None,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """메타데이터 그룹별 특이 경향(이상치) 탐지"""
+        payload = {
+            "benchmark": benchmark,
+            "models": models or [],
+            "metadata_columns": metadata_columns or [],
+            "top_k": top_k
+        }
+        
+        response = await self.client.post("/analysis/outliers", json=payload, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_choice_bias(
+        self,
+        benchmark: str,
+        models: Optional[List[str]] = None,
+        metadata_column: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """선택지 응답 편향 통계 조회"""
+        params = {"models": models or [], "metadata_column": metadata_column or ""}
+        response = await self.client.get(
+            f"/benchmarks/{benchmark}/choice-bias", params=params, endpoint="/benchmarks/{benchmark}/choice-bias"
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def drill_down_questions(
+        self,
+        benchmark: str,
+        models: Optional[List[str]] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        include_text: Optional[List[str]] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """그룹을 구성하는 문항 행 조회 (키셋 페이지네이션)"""
+        payload = {
+            "benchmark": benchmark,
+            "models": models or [],
+            "filters": filters or [],
+            "include_text": include_text if include_text is not None else ["question"],
+            "limit": limit,
+            "cursor": cursor
+        }
+        
+        response = await self.client.post("/analysis/questions", json=payload, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+    
+    async def search_text(
+        self,
+        benchmark: str,
+        query: str,
+        field: str = "question",
+        models: Optional[List[str]] = None,
+        min_models_correct: Optional[int] = None,
+        max_models_correct: Optional[int] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """전문 검색 + 모델별 정답 수 조회"""
+        payload = {
+            "benchmark": benchmark,
+            "query": query,
+            "field": field,
+            "models": models or [],
+            "min_models_correct": min_models_correct,
+            "max_models_correct": max_models_correct,
+            "limit": limit
+        }
+        
+        response = await self.client.post("/search/text", json=payload, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+    
+    async def search_semantic(self, benchmark: str, query: str, top_k: int = 100) -> Dict[str, Any]:
+        """의미상 유사한 문항 검색"""
+        payload = {"benchmark": benchmark, "query": query, "top_k": top_k}
+        
+        response = await self.client.post("/search/semantic", json=payload, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+    
+    async def search_semantic_batch(
+        self,
+        benchmark: str,
+        queries: List[str],
+        top_n: int = 100,
+        models: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """여러 질의로 고유 유사 문항 top_n개를 찾고 모델별 성능 조회"""
+        payload = {"benchmark": benchmark, "queries": queries, "top_n": top_n, "models": models or []}
+        
+        response = await self.client.post("/search/semantic/batch", json=payload, idempotent=True)
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_sql_schema(self) -> Dict[str, Any]:
+        """SQL로 조회 가능한 테이블/컬럼 목록"""
+        response = await self.client.get("/sql/schema")
+        response.raise_for_status()
+        return response.json()
+    
+    async def run_sql(self, query: str, max_rows: int = 200) -> Dict[str, Any]:
+        """읽기 전용 SELECT 실행 (검증 실패 시 서버 메시지를 그대로 전달)"""
+        response = await self.client.post("/sql", json={"query": query, "max_rows": max_rows}, idempotent=True)
+        if response.status_code == 400:
+            raise ValueError(response.json().get("detail", "허용되지 않는 쿼리"))
+        response.raise_for_status()
+        return response.json()
+    
+    async def submit_job(self, kind: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """무거운 분석을 비동기 작업으로 등록"""
+        response = await self.client.post("/jobs", json={"kind": kind, "params": params})
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        """작업 상태/진행률 조회"""
+        response = await self.client.get(f"/jobs/{job_id}", endpoint="/jobs/{job_id}")
+        response.raise_for_status()
+        return response.json()
+    
+    async def get_job_result(self, job_id: str) -> Dict[str, Any]:
+        """완료된 작업 결과 조회"""
+        response = await self.client.get(f"/jobs/{job_id}/result", endpoint="/jobs/{job_id}/result")
+        response.raise_for_status()
+        return response.json()
+    
+    async def wait_for_job(self, job_id: str, wait_seconds: float, poll_interval: float = 1.0) -> Dict[str, Any]:
+        """작업이 끝나거나 wait_seconds가 지날 때까지 폴링 후 마지막 상태 반환"""
+        deadline = asyncio.get_running_loop().time() + wait_seconds
+        while True:
+            job = await self.get_job(job_id)
+            if job["status"] in ("succeeded", "failed") or asyncio.get_running_loop().time() >= deadline:
+                return job
+            await asyncio.sleep(poll_interval)
+
+def load_api_server(api_server_dir: str = API_SERVER_DIR):
+    """api-server의 main 모듈을 'ai_eval_api' 이름으로 로드 (mcp-server의 main.py와 이름 충돌 방지)"""
+    if "ai_eval_api" in sys.modules:
+        return sys.modules["ai_eval_api"]
+    
+    api_server_dir = os.path.abspath(api_server_dir)
+    if api_server_dir not in sys.path:
+        sys.path.insert(0, api_server_dir)
+    spec = importlib.util.spec_from_file_location("ai_eval_api", os.path.join(api_server_dir, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["ai_eval_api"] = module
+    spec.loader.exec_module(module)
+    return module
+
+class EmbeddedAIEvaluationClient(AIEvaluationClient):
+    """api-server를 같은 프로세스에 로드해 호출하는 클라이언트
+    
+    분석/이상치 탐지는 분석 함수를 직접 호출해 결과 dict를 그대로 받고, 나머지 요청은
+    ASGI 전송으로 FastAPI 앱을 네트워크 없이 호출합니다. 요청 수용 제어와 연결 풀은
+    api-server와 동일한 객체를 사용합니다.
+    """
+    
+    def __init__(self, api_server_dir: str = API_SERVER_DIR):
+        self.api = load_api_server(api_server_dir)
+        self.base_url = "http://embedded"
+        # 같은 프로세스 호출이므로 헤징은 하지 않음
+        self.client = ResilientClient(self.base_url, transport=httpx.ASGITransport(app=self.api.app), hedge_delay=0)
+        self.catalog = CatalogCache(self.client)
+    
+    def _run_with_connection(self, func, *args):
+        with self.api.read_db.get_connection() as connection:
+            return func(connection, *args)
+    
+    async def _run_analysis(self, cost: int, func, *args) -> Dict[str, Any]:
+        """수용 제어 슬롯을 받아 api-server와 같은 스레드 풀(run_blocking)에서 분석 함수 실행"""
+        async with self.api.analysis_admission.admit(cost):
+            return await self.api.run_blocking(self._run_with_connection, func, *args)
+    
+    async def analyze_performance(
+        self,
+        models: List[str],
+        benchmarks: List[str],
+        metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None,
+        metrics: Optional[List[str]] = None,
+        filters: Optional[Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]] = None
+    ) -> Dict[str, Any]:
+        """다중 벤치마크 모델 성능 분석 (run_analysis 직접 호출)"""
+        request = self.api.AnalysisRequest.model_validate({
+            "models": models,
+            "benchmarks": benchmarks,
+            "metadata_level": metadata_level or [],
+            "metrics": metrics or [],
+            "filters": filters or []
+        })
+        self.api.validate_analysis_request(request)
+        return await self._run_analysis(self.api.estimate_analysis_request_cost(request), self.api.run_analysis, request)
+    
+    async def find_outliers(
+        self,
+        benchmark: str,
+        models: Optional[List[str]] = None,
+        metadata_columns: Optional[List[str]] = None,
+        top_k: int = 10
+    ) -> Dict[str, Any]:
+        """메타데이터 그룹별 특이 경향(이상치) 탐지 (run_outlier_analysis 직접 호출)"""
+        request = self.api.OutlierRequest.model_validate({
+            "benchmark": benchmark,
+            "models": models or [],
+            "metadata_columns": metadata_columns or [],
+            "top_k": top_k
+        })
+        return await self._run_analysis(
+            self.api.estimate_outlier_request_cost(request), self.api.run_outlier_analysis, request
+        )
+
+def create_client(mode: str = BACKEND_MODE) -> AIEvaluationClient:
+    """설정된 백엔드 호출 방식의 클라이언트 생성"""
+    if mode == "embedded":
+        return EmbeddedAIEvaluationClient()
+    if mode != "http":
+        raise ValueError(f"지원하지 않는 AI_EVAL_BACKEND_MODE: {mode} (http 또는 embedded)")
+    return AIEvaluationClient()
 
 # 클라이언트 인스턴스
-client = AIEvaluationClient()
+client = create_client()
 
 @mcp.tool()
 async def get_available_models() -> str:
@@ -109,17 +414,47 @@ async def get_benchmark_metadata(benchmark: str) -> str:
     try:
         metadata_info = await client.get_benchmark_metadata(benchmark)
         available_metadata = metadata_info.get("available_metadata", [])
+        stat_dimensions = metadata_info.get("response_stat_dimensions", [])
         
-        return (f"벤치마크 '{benchmark}'에서 사용 가능한 메타데이터:\n" + 
-                "\n".join([f"- {meta}" for meta in available_metadata]))
+        output = (f"벤치마크 '{benchmark}'에서 사용 가능한 메타데이터:\n" + 
+                  "\n".join([f"- {meta}" for meta in available_metadata]))
+        if stat_dimensions:
+            output += "\n\n성능 분석(metadata_level)에서만 쓸 수 있는 응답 통계 차원:\n" + "\n".join(
+                [f"- {dimension}" for dimension in stat_dimensions]
+            )
+        return output
     except Exception as e:
         return f"메타데이터 조회 실패: {str(e)}"
 
+def compact_group_table(
+    name: str,
+    results: List[Dict[str, Any]],
+    metadata_columns: List[str],
+    summary: Optional[Dict[str, Any]] = None
+) -> CompactTable:
+    """그룹별 분석 결과 -> 점수 내림차순 압축 표 (메타데이터 컬럼, s, n)"""
+    sorted_results = sorted(results, key=lambda x: x['avg_match_score'], reverse=True)
+    meta = {}
+    if summary and metadata_columns:
+        meta = {"g": summary['total_groups'], "avg": summary['avg_score'],
+                "min": summary['min_score'], "max": summary['max_score']}
+    return CompactTable(
+        name=name,
+        columns=metadata_columns + ["s", "n"],
+        rows=[
+            [result.get(col) for col in metadata_columns] + [result['avg_match_score'], result['total_questions']]
+            for result in sorted_results
+        ],
+        meta=meta,
+        scores=[result['avg_match_score'] for result in sorted_results]
+    )
+
 @mcp.tool()
 async def analyze_single_model(
     model: str,
     benchmarks: List[str],
-    metadata_level: Optional[List[str]] = None
+    metadata_level: Optional[List[str]] = None,
+    output_format: str = FORMAT_MARKDOWN
 ) -> str:
     """
     단일 모델에 대해 하나 이상의 벤치마크에서 성능을 분석합니다.
@@ -128,6 +463,7 @@ async def analyze_single_model(
         model: 분석할 모델명 (예: "gpt-4o")
         benchmarks: 분석할 벤치마크 리스트 (예: ["mmlu-redux", "hellaswag"])
         metadata_level: 분류 기준 리스트 (예: ["category", "subject"])
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
         
     Returns:
         모델의 벤치마크별 성능 분석 결과를 포맷된 문자열로 반환
@@ -135,6 +471,9 @@ async def analyze_single_model(
     try:
         if not benchmarks:
             return "오류: 최소 하나의 벤치마크를 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
         
         # 성능 분석 요청
         results = await client.analyze_performance(
@@ -146,6 +485,13 @@ async def analyze_single_model(
         if not results or not results.get("benchmark_results"):
             return f"모델 '{model}'에 대한 데이터를 찾을 수 없습니다."
         
+        if output_format != FORMAT_MARKDOWN:
+            tables = [
+                compact_group_table(item["benchmark"], item["results"], metadata_level or [], item["summary"])
+                for item in results["benchmark_results"]
+            ]
+            return render_compact({"m": model, "lv": metadata_level}, tables, output_format)
+        
         # 결과 포맷팅
         output = [f"모델 성능 분석 결과: {model}"]
         output.append(f"분석 벤치마크: {', '.join(benchmarks)}")
@@ -229,7 +575,10 @@ async def analyze_single_model(
 async def analyze_single_model_with_metadata(
     model: str,
     benchmark: str,
-    metadata_columns: List[str]
+    metadata_columns: List[str],
+    filters: Optional[List[Dict[str, Any]]] = None,
+    token_budget: Optional[int] = None,
+    output_format: str = FORMAT_MARKDOWN
 ) -> str:
     """
     단일 모델에 대해 특정 벤치마크에서 메타데이터별 세부 성능을 분석합니다.
@@ -238,6 +587,9 @@ async def analyze_single_model_with_metadata(
         model: 분석할 모델명
         benchmark: 분석할 벤치마크 (단일)
         metadata_columns: 세부 분석할 메타데이터 컬럼들
+        filters: 메타데이터 필터 (예: [{"column": "difficulty", "op": "in", "values": ["Hard", "Extreme"]}])
+        token_budget: 출력 토큰 예산 (기본 MCP_TOKEN_BUDGET, 0이면 전체 그룹 표시). 넘으면 극단값 위주로 표시하고 나머지는 요약
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
         
     Returns:
         메타데이터별 세부 성능 분석 결과
@@ -245,11 +597,15 @@ async def analyze_single_model_with_metadata(
     try:
         if not metadata_columns:
             return "오류: 최소 하나의 메타데이터 컬럼을 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
         
         results = await client.analyze_performance(
             models=[model],
             benchmarks=[benchmark],
-            metadata_level=metadata_columns
+            metadata_level=metadata_columns,
+            filters=filters
         )
         
         if not results or not results.get("benchmark_results"):
@@ -259,6 +615,11 @@ async def analyze_single_model_with_metadata(
         benchmark_data = benchmark_result["results"]
         benchmark_summary = benchmark_result["summary"]
         
+        if output_format != FORMAT_MARKDOWN:
+            table = compact_group_table("", benchmark_data, metadata_columns, benchmark_summary)
+            meta = {"m": model, "b": benchmark, "lv": metadata_columns, "n": benchmark_summary['total_questions']}
+            return render_compact(meta, [table], output_format, resolve_budget(token_budget))
+        
         output = [f"메타데이터별 세부 성능 분석"]
         output.append(f"모델: {model}")
         output.append(f"벤치마크: {benchmark}")
@@ -329,11 +690,8 @@ async def analyze_single_model_with_metadata(
                 headers.append(col.title())
             headers.extend(["Score", "Questions", "Performance Level", "Percentile"])
             
-            # 테이블 헤더
-            output.append("| " + " | ".join(headers) + " |")
-            output.append("|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|")
-            
-            # 테이블 데이터 행
+            # 테이블 데이터 행 (예산을 넘으면 render_table이 관련도 순으로 선택)
+            table_rows = []
             for i, result in enumerate(sorted_results, 1):
                 row_data = []
                 
@@ -355,8 +713,18 @@ async def analyze_single_model_with_metadata(
                 row_data.append(level)
                 row_data.append(f"상위 {percentile}%")
                 
-                output.append("| " + " | ".join(row_data) + " |")
+                table_rows.append(TableRow(
+                    cells=row_data,
+                    score=result['avg_match_score'],
+                    group=f"{metadata_columns[0]}={result.get(metadata_columns[0], 'N/A')}",
+                    questions=result['total_questions']
+                ))
             
+            score_relevance(table_rows)
+            budget = resolve_budget(token_budget)
+            if budget:
+                budget = max(budget - estimate_tokens("\n".join(output)), 200)
+            output.extend(render_table(headers, table_rows, budget, score_col=len(metadata_columns) + 1))
             output.append("")  # 테이블 후 빈 줄
         else:
             output.append("데이터 없음")
@@ -371,7 +739,10 @@ async def analyze_single_model_with_metadata(
 async def compare_models_multi_benchmark(
     models: List[str],
     benchmarks: List[str],
-    metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None
+    metadata_level: Optional[Union[List[str], Dict[str, List[str]]]] = None,
+    filters: Optional[Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]] = None,
+    token_budget: Optional[int] = None,
+    output_format: str = FORMAT_MARKDOWN
 ) -> str:
     """
     여러 모델을 여러 벤치마크에서 비교 분석합니다.
@@ -380,6 +751,11 @@ async def compare_models_multi_benchmark(
         models: 비교할 모델들의 리스트
         benchmarks: 분석할 벤치마크들의 리스트  
         metadata_level: 벤치마크별 메타데이터 설정 (Dict) 또는 공통 메타데이터 (List)
+        filters: 메타데이터 필터 - 공통 (List) 또는 벤치마크별 (Dict)
+                 (예: [{"column": "business_category", "op": "eq", "values": ["Reasoning"]}])
+        token_budget: 출력 토큰 예산 (기본 MCP_TOKEN_BUDGET, 0이면 전체 그룹 표시). 벤치마크별 피벗 테이블에 나눠 적용되며,
+                      넘으면 모델 간 점수 차이가 크거나 극단적인 그룹 위주로 표시하고 나머지는 요약
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
         
     Returns:
         다중 벤치마크에서의 모델 비교 결과
@@ -389,11 +765,15 @@ async def compare_models_multi_benchmark(
             return "오류: 최소 하나의 모델을 지정해야 합니다."
         if not benchmarks:
             return "오류: 최소 하나의 벤치마크를 지정해야 합니다."
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
         
         results = await client.analyze_performance(
             models=models,
             benchmarks=benchmarks,
-            metadata_level=metadata_level
+            metadata_level=metadata_level,
+            filters=filters
         )
         
         if not results or not results.get("benchmark_results"):
@@ -406,6 +786,12 @@ async def compare_models_multi_benchmark(
         
         # 전체 벤치마크 요약을 위한 데이터 저장
         benchmark_summaries = {}
+        # 압축 형식 출력용 표
+        compact_tables = []
+        
+        # 피벗 테이블별 토큰 예산 (벤치마크 수로 균등 분배)
+        budget = resolve_budget(token_budget)
+        table_budget = max(budget // len(results["benchmark_results"]) - 150, 200) if budget else 0
         
         for benchmark_result in results["benchmark_results"]:
             benchmark_name = benchmark_result["benchmark"]
@@ -439,6 +825,11 @@ async def compare_models_multi_benchmark(
                         output.append(f"| {model} | {data['score']:.4f} | {data['questions']:,} |")
                     
                     output.append("")
+                    compact_tables.append(CompactTable(
+                        name=benchmark_name,
+                        columns=["model", "s", "n"],
+                        rows=[[model, data['score'], data['questions']] for model, data in sorted_models]
+                    ))
                 
                 # 요약 정보 저장
                 benchmark_summaries[benchmark_name] = {model: data['score'] for model, data in model_scores.items()}
@@ -499,10 +890,6 @@ async def compare_models_multi_benchmark(
                                 headers.append(col.title())
                             headers.extend(models)  # 각 모델을 컬럼으로
                             
-                            # 테이블 헤더
-                            output.append("| " + " | ".join(headers) + " |")
-                            output.append("|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|")
-                            
                             # 메타데이터 키별로 정렬 (점수 기준)
                             def get_avg_score(item):
                                 _, model_data = item
@@ -511,7 +898,9 @@ async def compare_models_multi_benchmark(
                             
                             sorted_pivot_data = sorted(pivot_data.items(), key=get_avg_score, reverse=True)
                             
-                            # 데이터 행 생성
+                            # 데이터 행 생성 (모델 간 점수 편차를 관련도에 반영)
+                            table_rows = []
+                            spreads = []
                             for metadata_key, model_data in sorted_pivot_data:
                                 row_data = []
                                 
@@ -527,9 +916,31 @@ async def compare_models_multi_benchmark(
                                     else:
                                         row_data.append("N/A")
                                 
-                                output.append("| " + " | ".join(row_data) + " |")
+                                scores = [data['score'] for data in model_data.values()]
+                                spreads.append(max(scores) - min(scores) if scores else 0.0)
+                                table_rows.append(TableRow(
+                                    cells=row_data,
+                                    score=get_avg_score((metadata_key, model_data)),
+                                    group=f"{current_metadata_cols[0]}={metadata_key[0]}"
+                                ))
                             
+                            score_relevance(table_rows, spreads)
+                            output.extend(render_table(headers, table_rows, table_budget, score_col=len(current_metadata_cols)))
                             output.append("")
+                            compact_tables.append(CompactTable(
+                                name=benchmark_name,
+                                columns=list(current_metadata_cols) + list(models),
+                                rows=[
+                                    list(metadata_key) + [
+                                        model_data[model]['score'] if model in model_data else None
+                                        for model in models
+                                    ]
+                                    for metadata_key, model_data in sorted_pivot_data
+                                ],
+                                meta={"g": benchmark_summary['total_groups'], "avg": benchmark_summary['avg_score']},
+                                scores=[row.score for row in table_rows],
+                                spreads=spreads
+                            ))
                 
                 # 메타데이터가 있는 경우에는 종합 순위 테이블을 생성하지 않음
                 # (메타데이터별로 세분화된 결과이므로)
@@ -583,6 +994,21 @@ async def compare_models_multi_benchmark(
                         output.append("| " + " | ".join(row_data) + " |")
                     
                     output.append("")
+                    compact_tables.append(CompactTable(
+                        name="overall",
+                        columns=["model", "avg"] + list(benchmarks),
+                        rows=[
+                            [model, avg_score] + [model_detailed_scores[model].get(name) for name in benchmarks]
+                            for model, avg_score in sorted_models
+                        ]
+                    ))
+        
+        if output_format != FORMAT_MARKDOWN:
+            meta = {"m": models, "b": benchmarks}
+            if isinstance(metadata_level, list):
+                meta["lv"] = metadata_level
+            # 압축 표도 같은 토큰 예산 안에서 관련도 순으로 행 선택
+            return render_compact(meta, compact_tables, output_format, budget)
         
         # 분석 요약
         summary = results["summary"]
@@ -597,6 +1023,660 @@ async def compare_models_multi_benchmark(
         return f"다중 벤치마크 비교 분석 실패: {str(e)}"
 
 
+def validate_batch_spec(spec: Dict[str, Any], catalog: Dict[str, Any]) -> Optional[str]:
+    """배치 분석 항목을 카탈로그 기준으로 검증 (문제가 있으면 오류 메시지)"""
+    unknown = set(spec) - BATCH_SPEC_KEYS
+    if unknown:
+        return f"알 수 없는 항목: {', '.join(sorted(unknown))}"
+    if not spec.get("models") or not spec.get("benchmarks"):
+        return "models와 benchmarks는 필수입니다."
+    
+    invalid_models = [model for model in spec["models"] if model not in catalog["models"]]
+    if invalid_models:
+        return f"존재하지 않는 모델: {', '.join(invalid_models)}"
+    invalid_benchmarks = [benchmark for benchmark in spec["benchmarks"] if benchmark not in catalog["metadata"]]
+    if invalid_benchmarks:
+        return f"존재하지 않는 벤치마크: {', '.join(invalid_benchmarks)}"
+    
+    metadata_level = spec.get("metadata_level") or []
+    stat_dimensions = catalog.get("response_stat_dimensions", [])
+    for benchmark in spec["benchmarks"]:
+        columns = metadata_level.get(benchmark, []) if isinstance(metadata_level, dict) else metadata_level
+        # 응답 통계 차원은 메타데이터 목록과 별도로 모든 벤치마크에서 그룹화 가능
+        invalid_columns = [col for col in columns if col not in catalog["metadata"][benchmark] and col not in stat_dimensions]
+        if invalid_columns:
+            return f"[{benchmark}] 사용할 수 없는 메타데이터: {', '.join(invalid_columns)}"
+    return None
+
+def batch_spec_key(spec: Dict[str, Any]) -> str:
+    """같은 분석 요청을 한 번만 실행하기 위한 키 (label 제외)"""
+    return json.dumps({key: spec.get(key) for key in sorted(BATCH_SPEC_KEYS - {"label"})}, sort_keys=True)
+
+@mcp.tool()
+async def run_analysis_batch(
+    specs: List[Dict[str, Any]],
+    token_budget: Optional[int] = None,
+    output_format: str = FORMAT_MARKDOWN,
+    max_concurrency: int = BATCH_MAX_CONCURRENCY
+) -> str:
+    """
+    여러 분석 조건을 한 번에 동시 실행하고 결과를 하나로 합쳐 반환합니다.
+    
+    서로 다른 조건(모델/벤치마크/메타데이터/필터 조합)을 여러 번 나눠 호출하는 대신 사용하세요.
+    카탈로그 검증은 한 번만 하고, 같은 조건은 한 번만 실행합니다.
+    
+    Args:
+        specs: 분석 조건 리스트. 각 항목은 compare_models_multi_benchmark의 인자와 같습니다.
+               (예: [{"label": "어려운 문제", "models": ["gpt-4o", "llama-4"], "benchmarks": ["mmlu"],
+                      "metadata_level": ["subject"], "filters": [{"column": "difficulty", "op": "eq", "values": ["Hard"]}]}])
+        token_budget: 전체 출력 토큰 예산 (기본 MCP_TOKEN_BUDGET, 0이면 제한 없음). 고유 조건 수로 나눠 적용
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        max_concurrency: 동시에 실행할 분석 수 (최대 MCP_BATCH_CONCURRENCY)
+        
+    Returns:
+        조건별 분석 결과를 순서대로 합친 문자열
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        if not specs:
+            return "오류: 최소 하나의 분석 조건을 지정해야 합니다."
+        if len(specs) > BATCH_MAX_SPECS:
+            return f"오류: 분석 조건은 최대 {BATCH_MAX_SPECS}개까지 지정할 수 있습니다."
+        
+        started = time.perf_counter()
+        catalog = await client.catalog.get()
+        errors = {i: validate_batch_spec(spec, catalog) for i, spec in enumerate(specs)}
+        
+        # 같은 조건은 한 번만 실행
+        unique_specs: Dict[str, Dict[str, Any]] = {}
+        for i, spec in enumerate(specs):
+            if not errors[i]:
+                unique_specs.setdefault(batch_spec_key(spec), spec)
+        
+        budget = resolve_budget(token_budget)
+        spec_budget = max(budget // max(len(unique_specs), 1) - 50, 300) if budget else 0
+        concurrency = max(1, min(max_concurrency, BATCH_MAX_CONCURRENCY))
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run_spec(spec: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await compare_models_multi_benchmark(
+                    models=spec["models"],
+                    benchmarks=spec["benchmarks"],
+                    metadata_level=spec.get("metadata_level"),
+                    filters=spec.get("filters"),
+                    token_budget=spec_budget,
+                    output_format=output_format
+                )
+        
+        outputs = dict(zip(unique_specs, await asyncio.gather(*(run_spec(spec) for spec in unique_specs.values()))))
+        elapsed = time.perf_counter() - started
+        
+        # 같은 조건이 반복되면 결과는 처음 한 번만 표시
+        sections = []
+        first_index: Dict[str, int] = {}
+        for i, spec in enumerate(specs):
+            label = spec.get("label") or f"조건 {i + 1}"
+            key = batch_spec_key(spec)
+            same_as = None
+            if errors[i]:
+                text = f"오류: {errors[i]}"
+            elif key in first_index:
+                same_as = first_index[key]
+                text = f"참고: 조건 {same_as}과 같은 조건 (결과 생략)"
+            else:
+                first_index[key] = i + 1
+                text = outputs[key]
+            sections.append((i + 1, label, text, same_as))
+        
+        if output_format == FORMAT_JSON_COMPACT:
+            items = []
+            for index, label, text, same_as in sections:
+                if same_as:
+                    items.append({"i": index, "label": label, "same_as": same_as})
+                    continue
+                try:
+                    items.append({"i": index, "label": label, **json.loads(text)})
+                except ValueError:
+                    items.append({"i": index, "label": label, "error": text})
+            return json.dumps({"specs": len(specs), "unique": len(unique_specs), "sec": round(elapsed, 3), "r": items},
+                              ensure_ascii=False, separators=(",", ":"))
+        if output_format == FORMAT_CSV:
+            return "\n".join(f"## i={index};label={label}\n{text}" for index, label, text, _ in sections)
+        
+        output = [f"배치 분석 결과: 조건 {len(specs)}개 (실행 {len(unique_specs)}개, 동시 {concurrency}개, {elapsed:.2f}초)"]
+        for index, label, text, _ in sections:
+            output.append(f"\n{'#' * 60}\n[{index}] {label}\n{'#' * 60}")
+            output.append(text)
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"배치 분석 실패: {str(e)}"
+
+
+@mcp.tool()
+async def find_unusual_models(
+    benchmark: str,
+    models: Optional[List[str]] = None,
+    metadata_columns: Optional[List[str]] = None,
+    top_k: int = 10,
+    output_format: str = FORMAT_MARKDOWN
+) -> str:
+    """
+    벤치마크에서 가장 특이한 경향을 보이는 모델과 (모델, 메타데이터 그룹)을 탐지합니다.
+    
+    각 메타데이터 그룹에서 모델 점수를 교차 모델 기대값(그룹 난이도 + 모델 실력)과 비교하여
+    잔차의 z-score가 큰 상위 K개만 반환하므로, 전체 피벗 테이블을 조회할 필요가 없습니다.
+    
+    Args:
+        benchmark: 분석할 벤치마크 (예: "hle")
+        models: 비교할 모델 리스트 (생략 시 전체 모델)
+        metadata_columns: 분석할 메타데이터 컬럼 (생략 시 전체 메타데이터)
+        top_k: 반환할 이상치 개수
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        
+    Returns:
+        모델별 특이도 순위와 상위 이상치 목록
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        
+        result = await client.find_outliers(
+            benchmark=benchmark,
+            models=models,
+            metadata_columns=metadata_columns,
+            top_k=top_k
+        )
+        
+        if output_format != FORMAT_MARKDOWN:
+            meta = {"b": benchmark, "lv": result['metadata_columns'], "top": result.get('most_unusual_model')}
+            tables = [
+                CompactTable(
+                    name="models",
+                    columns=["model", "rmsz", "cells"],
+                    rows=[[item['model_name'], item['rms_z_score'], item['cells']] for item in result.get("model_peculiarity", [])]
+                ),
+                CompactTable(
+                    name="anomalies",
+                    columns=["model", "col", "val", "s", "exp", "z", "n"],
+                    rows=[
+                        [item['model_name'], item['metadata_column'], item['metadata_value'], item['score'],
+                         item['expected_score'], item['z_score'], item['total_questions']]
+                        for item in result.get("anomalies", [])
+                    ]
+                )
+            ]
+            return render_compact(meta, tables, output_format)
+        
+        output = [f"[{benchmark}] 특이 경향 분석"]
+        output.append(f"분석 메타데이터: {', '.join(result['metadata_columns'])}")
+        output.append("=" * 60)
+        
+        if not result.get("model_peculiarity"):
+            output.append("분석 가능한 데이터가 없습니다.")
+            return "\n".join(output)
+        
+        output.append(f"\n가장 특이한 모델: {result['most_unusual_model']}")
+        output.append("\n모델별 특이도 (표준화 잔차 RMS):")
+        output.append("| Rank | Model | RMS Z | Cells |")
+        output.append("|------|-------|-------|-------|")
+        for rank, item in enumerate(result["model_peculiarity"], 1):
+            output.append(f"| {rank} | {item['model_name']} | {item['rms_z_score']:.2f} | {item['cells']} |")
+        
+        output.append(f"\n상위 {len(result['anomalies'])}개 이상치:")
+        output.append("| Model | Metadata | Value | Score | Expected | Z | Questions |")
+        output.append("|-------|----------|-------|-------|----------|---|-----------|")
+        for item in result["anomalies"]:
+            output.append(
+                f"| {item['model_name']} | {item['metadata_column']} | {item['metadata_value']} | "
+                f"{item['score']:.4f} | {item['expected_score']:.4f} | {item['z_score']:+.2f} | "
+                f"{item['total_questions']:,} |"
+            )
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"특이 경향 분석 실패: {str(e)}"
+
+@mcp.tool()
+async def analyze_answer_bias(
+    benchmark: str,
+    models: Optional[List[str]] = None,
+    metadata_column: Optional[str] = None,
+    output_format: str = FORMAT_MARKDOWN
+) -> str:
+    """
+    객관식 벤치마크에서 모델별 선택지 응답 경향(위치 편향)을 분석합니다.
+    
+    Args:
+        benchmark: 분석할 객관식 벤치마크 (예: "mmlu-redux")
+        models: 분석할 모델 리스트 (생략 시 전체 모델)
+        metadata_column: 그룹화할 메타데이터 컬럼 (예: "category", 생략 시 모델별 전체)
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        
+    Returns:
+        모델(및 메타데이터 그룹)별 선택 분포, 위치 편향, 카이제곱 검정 결과
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        
+        result = await client.get_choice_bias(benchmark, models, metadata_column)
+        rows = result.get("results", [])
+        if not rows:
+            return f"벤치마크 '{benchmark}'에 대한 선택지 집계 데이터가 없습니다."
+        
+        if output_format != FORMAT_MARKDOWN:
+            group_columns = [metadata_column] if metadata_column else []
+            table = CompactTable(
+                columns=["model"] + group_columns + ["n", "acc", "dist", "over", "bias", "chi2", "p", "fail"],
+                rows=[
+                    [item["model_name"]] + [item.get(col) for col in group_columns] + [
+                        item['total_questions'],
+                        item['accuracy'],
+                        " ".join(f"{letter}:{share:.2f}" for letter, share in item["chosen_distribution"].items()),
+                        item["most_over_chosen"],
+                        item['position_bias'][item["most_over_chosen"]] if item["most_over_chosen"] else None,
+                        item['chi_square'],
+                        item['p_value'],
+                        item['extraction_failure_rate']
+                    ]
+                    for item in rows
+                ]
+            )
+            return render_compact({"b": benchmark}, [table], output_format)
+        
+        output = [f"[{benchmark}] 선택지 응답 편향 분석"]
+        if metadata_column:
+            output.append(f"분류 기준: {metadata_column}")
+        output.append("=" * 60)
+        
+        headers = ["Model"]
+        if metadata_column:
+            headers.append(metadata_column.title())
+        headers.extend(["Questions", "Accuracy", "Chosen Dist", "Over-chosen", "Chi2", "p-value", "Extract Fail"])
+        output.append("| " + " | ".join(headers) + " |")
+        output.append("|" + "|".join(["-" * (len(h) + 2) for h in headers]) + "|")
+        
+        for item in rows:
+            row_data = [item["model_name"]]
+            if metadata_column:
+                row_data.append(str(item.get(metadata_column, "N/A")))
+            chosen_dist = " ".join(f"{letter}:{share:.2f}" for letter, share in item["chosen_distribution"].items())
+            over_chosen = item["most_over_chosen"]
+            row_data.extend([
+                f"{item['total_questions']:,}",
+                f"{item['accuracy']:.4f}",
+                chosen_dist,
+                f"{over_chosen} ({item['position_bias'][over_chosen]:+.2f})" if over_chosen else "-",
+                f"{item['chi_square']:.2f}",
+                f"{item['p_value']:.4f}",
+                f"{item['extraction_failure_rate']:.2%}"
+            ])
+            output.append("| " + " | ".join(row_data) + " |")
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"선택지 편향 분석 실패: {str(e)}"
+
+@mcp.tool()
+async def list_group_questions(
+    benchmark: str,
+    models: Optional[List[str]] = None,
+    filters: Optional[List[Dict[str, Any]]] = None,
+    include_response: bool = False,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> str:
+    """
+    분석 그룹을 구성하는 개별 문항과 모델별 채점 결과를 조회합니다.
+    
+    Args:
+        benchmark: 조회할 벤치마크
+        models: 조회할 모델 리스트 (생략 시 전체 모델)
+        filters: 메타데이터 필터 (예: [{"column": "category", "op": "eq", "values": ["STEM"]}])
+        include_response: 모델 응답 전문 포함 여부 (길어서 기본값 False)
+        limit: 페이지 크기
+        cursor: 다음 페이지 조회 시 이전 결과의 커서
+        
+    Returns:
+        문항별 정답/응답/점수 목록과 다음 페이지 커서
+    """
+    try:
+        include_text = ["question", "response"] if include_response else ["question"]
+        result = await client.drill_down_questions(benchmark, models, filters, include_text, limit, cursor)
+        rows = result.get("rows", [])
+        if not rows:
+            return "조건에 해당하는 문항이 없습니다."
+        
+        output = [f"[{benchmark}] 문항 목록 ({result['count']}개)"]
+        output.append("=" * 60)
+        for row in rows:
+            output.append(
+                f"- #{row['data_id']} [{row['model_name']}] 정답: {row['answer']} / "
+                f"응답: {row.get('filtered_resps') or '-'} / 점수: {row['match_score']:.2f}"
+            )
+            if row.get("question"):
+                output.append(f"  Q: {row['question']}")
+            if row.get("response"):
+                output.append(f"  A: {row['response']}")
+        
+        if result.get("has_more"):
+            output.append(f"\n다음 페이지 커서: {result['next_cursor']}")
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"문항 조회 실패: {str(e)}"
+
+@mcp.tool()
+async def search_questions(
+    benchmark: str,
+    query: str,
+    search_responses: bool = False,
+    models: Optional[List[str]] = None,
+    min_models_correct: Optional[int] = None,
+    max_models_correct: Optional[int] = None,
+    limit: int = 30
+) -> str:
+    """
+    키워드로 문항을 검색하고 모델별 정답 수와 함께 보여줍니다.
+    
+    Args:
+        benchmark: 검색할 벤치마크
+        query: 검색어 (모든 단어를 포함하는 문항, 예: "modular arithmetic")
+        search_responses: 문제 대신 모델 응답에서 검색
+        models: 정답 수를 셀 모델 리스트 (생략 시 전체 모델)
+        min_models_correct: 정답 모델 수 하한
+        max_models_correct: 정답 모델 수 상한 (예: 2 -> 3개 미만 모델만 맞힌 문항)
+        limit: 최대 결과 수
+        
+    Returns:
+        검색된 문항별 평가 모델 수, 정답 모델 수, 평균 점수
+    """
+    try:
+        field = "response" if search_responses else "question"
+        result = await client.search_text(
+            benchmark, query, field, models, min_models_correct, max_models_correct, limit
+        )
+        results = result.get("results", [])
+        if not results:
+            return f"'{query}' 검색 결과가 없습니다."
+        
+        output = [f"[{benchmark}] '{query}' 검색 결과 (전체 {result['total_hits']}개 중 {len(results)}개)"]
+        output.append("=" * 60)
+        output.append("| data_id | 평가 모델 수 | 정답 모델 수 | 평균 점수 |")
+        output.append("|---------|-------------|-------------|----------|")
+        for row in results:
+            output.append(
+                f"| {row['data_id']} | {row['models_evaluated']} | {row['models_correct']} | {row['avg_match_score']:.3f} |"
+            )
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"문항 검색 실패: {str(e)}"
+
+@mcp.tool()
+async def find_similar_questions(benchmark: str, query: str, top_k: int = 20) -> str:
+    """
+    질문과 의미상 유사한 벤치마크 문항을 찾습니다.
+    
+    Args:
+        benchmark: 검색할 벤치마크
+        query: 찾고 싶은 문제 형태의 자연어 질의
+        top_k: 반환할 유사 문항 수
+        
+    Returns:
+        유사도 순 문항 data_id 목록
+    """
+    try:
+        result = await client.search_semantic(benchmark, query, top_k)
+        results = result.get("results", [])
+        if not results:
+            return "유사한 문항이 없습니다."
+        
+        output = [f"[{benchmark}] 유사 문항 {len(results)}개 ({result['elapsed_ms']}ms)"]
+        output.append("=" * 60)
+        output.append("| 순위 | data_id | 유사도 |")
+        output.append("|------|---------|--------|")
+        for rank, row in enumerate(results, 1):
+            output.append(f"| {rank} | {row['data_id']} | {row['score']:.4f} |")
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"유사 문항 검색 실패: {str(e)}"
+
+@mcp.tool()
+async def best_model_on_similar_questions(
+    benchmark: str,
+    queries: List[str],
+    top_n: int = 100,
+    models: Optional[List[str]] = None,
+    output_format: str = FORMAT_MARKDOWN
+) -> str:
+    """
+    여러 유사 질문(재작성 질의)으로 관련 문항을 모아, 그 문항들에서 어떤 모델이 가장 잘하는지 비교합니다.
+    
+    Args:
+        benchmark: 검색할 벤치마크
+        queries: 검색 질의 리스트 (원 질문을 재작성한 유사 질문 여러 개)
+        top_n: 중복 제거 후 모을 고유 문항 수
+        models: 비교할 모델 리스트 (생략 시 전체 모델)
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        
+    Returns:
+        모은 문항 수와 모델별 정답 수/평균 점수 순위
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        
+        result = await client.search_semantic_batch(benchmark, queries, top_n, models)
+        questions = result.get("questions", [])
+        if not questions:
+            return "유사한 문항이 없습니다."
+        
+        if output_format != FORMAT_MARKDOWN:
+            table = CompactTable(
+                columns=["model", "n", "ok", "s"],
+                rows=[
+                    [row['model_name'], row['question_count'], row['correct_count'], row['avg_match_score']]
+                    for row in result.get("model_scores", [])
+                ]
+            )
+            meta = {"b": benchmark, "q": len(queries), "nq": len(questions), "best": result.get("best_model")}
+            return render_compact(meta, [table], output_format)
+        
+        output = [f"[{benchmark}] 질의 {len(queries)}개 -> 고유 문항 {len(questions)}개 ({result['search_elapsed_ms']}ms)"]
+        output.append("=" * 60)
+        output.append("| 순위 | 모델 | 문항 수 | 정답 수 | 평균 점수 |")
+        output.append("|------|------|--------|--------|----------|")
+        for rank, row in enumerate(result.get("model_scores", []), 1):
+            output.append(
+                f"| {rank} | {row['model_name']} | {row['question_count']} | {row['correct_count']} | {row['avg_match_score']:.3f} |"
+            )
+        
+        if result.get("best_model"):
+            output.append(f"\n가장 잘한 모델: {result['best_model']}")
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"유사 문항 기반 모델 비교 실패: {str(e)}"
+
+@mcp.tool()
+async def get_sql_schema() -> str:
+    """
+    run_sql_query로 조회할 수 있는 테이블과 컬럼 목록을 조회합니다.
+    
+    Returns:
+        테이블별 컬럼 목록과 실행 제한
+    """
+    try:
+        schema = await client.get_sql_schema()
+        output = ["SQL 조회 가능 테이블"]
+        output.append("=" * 50)
+        for table, columns in schema["tables"].items():
+            output.append(f"- {table}: {', '.join(columns)}")
+        output.append(f"\n최대 {schema['max_rows']}행, 실행 시간 {schema['max_execution_ms']}ms 제한")
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"스키마 조회 실패: {str(e)}"
+
+@mcp.tool()
+async def run_sql_query(query: str, max_rows: int = 200) -> str:
+    """
+    벤치마크 결과 테이블에 읽기 전용 SELECT 문을 실행합니다.
+    
+    Args:
+        query: SELECT 문 (get_sql_schema의 테이블/컬럼만, 주석/여러 문장 불가)
+        max_rows: 최대 반환 행 수
+        
+    Returns:
+        마크다운 표 형식의 결과
+    """
+    try:
+        result = await client.run_sql(query, max_rows)
+        columns = result.get("columns", [])
+        rows = result.get("rows", [])
+        if not rows:
+            return "결과가 없습니다."
+        
+        output = [f"| {' | '.join(columns)} |"]
+        output.append(f"|{'|'.join(['---'] * len(columns))}|")
+        for row in rows:
+            output.append(f"| {' | '.join('' if value is None else str(value) for value in row)} |")
+        
+        notes = [f"{result['row_count']}행"]
+        if result.get("truncated"):
+            notes.append(f"최대 {max_rows}행에서 잘림")
+        if result.get("cached"):
+            notes.append("캐시된 결과")
+        output.append(f"\n({', '.join(notes)})")
+        
+        return "\n".join(output)
+        
+    except Exception as e:
+        return f"SQL 실행 실패: {str(e)}"
+
+def format_bootstrap_result(result: Dict[str, Any], output_format: str = FORMAT_MARKDOWN) -> str:
+    """부트스트랩 결과를 벤치마크별 마크다운 표(또는 압축 형식)로 변환"""
+    confidence = int(result["confidence"] * 100)
+    if output_format != FORMAT_MARKDOWN:
+        tables = [
+            CompactTable(
+                name=benchmark_result['benchmark'],
+                columns=["model", "s", "lo", "hi", "se", "pbest"],
+                rows=[
+                    [row['model_name'], row['mean_score'], row['ci_lower'], row['ci_upper'], row['std_error'], row['prob_best']]
+                    for row in benchmark_result["models"]
+                ],
+                meta={"nq": benchmark_result['question_count']}
+            )
+            for benchmark_result in result["benchmark_results"]
+        ]
+        return render_compact({"ci": confidence, "k": result['n_resamples']}, tables, output_format)
+    output = [f"부트스트랩 {confidence}% 신뢰구간 (재표본 {result['n_resamples']}회)"]
+    output.append("=" * 60)
+    for benchmark_result in result["benchmark_results"]:
+        output.append(f"\n[{benchmark_result['benchmark']}] 문항 {benchmark_result['question_count']}개")
+        output.append("| 모델 | 평균 점수 | 신뢰구간 | 표준오차 | 최고 모델 확률 |")
+        output.append("|------|----------|---------|---------|---------------|")
+        for row in benchmark_result["models"]:
+            output.append(
+                f"| {row['model_name']} | {row['mean_score']:.3f} | [{row['ci_lower']:.3f}, {row['ci_upper']:.3f}] | "
+                f"{row['std_error']:.3f} | {row['prob_best']:.1%} |"
+            )
+    return "\n".join(output)
+
+def format_job_status(job: Dict[str, Any]) -> str:
+    """진행 중/실패한 작업 상태 메시지"""
+    if job["status"] == "failed":
+        return f"작업 실패 ({job['job_id']}): {job.get('error')}"
+    return (
+        f"작업 진행 중 - ID: {job['job_id']}, 상태: {job['status']}, 진행률: {job['progress']:.0%}"
+        f" {job.get('message') or ''}\n잠시 후 check_analysis_job으로 결과를 확인하세요."
+    )
+
+@mcp.tool()
+async def run_bootstrap_analysis(
+    benchmarks: Optional[List[str]] = None,
+    models: Optional[List[str]] = None,
+    n_resamples: int = 1000,
+    wait_seconds: int = 20,
+    output_format: str = FORMAT_MARKDOWN
+) -> str:
+    """
+    모델별 평균 점수의 부트스트랩 신뢰구간과 최고 모델일 확률을 계산합니다. (백그라운드 작업)
+    
+    Args:
+        benchmarks: 분석할 벤치마크 (생략 시 전체)
+        models: 분석할 모델 (생략 시 전체)
+        n_resamples: 재표본 수
+        wait_seconds: 결과를 기다릴 최대 시간(초). 넘으면 작업 ID를 반환
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        
+    Returns:
+        완료 시 벤치마크별 신뢰구간 표, 미완료 시 작업 ID
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        
+        params = {"benchmarks": benchmarks or [], "models": models or [], "n_resamples": n_resamples}
+        job = await client.submit_job("bootstrap", params)
+        job = await client.wait_for_job(job["job_id"], wait_seconds)
+        if job["status"] != "succeeded":
+            return format_job_status(job)
+        
+        return format_bootstrap_result(await client.get_job_result(job["job_id"]), output_format)
+        
+    except Exception as e:
+        return f"부트스트랩 분석 실패: {str(e)}"
+
+@mcp.tool()
+async def check_analysis_job(job_id: str, output_format: str = FORMAT_MARKDOWN) -> str:
+    """
+    백그라운드 분석 작업의 진행률 또는 결과를 조회합니다.
+    
+    Args:
+        job_id: 작업 등록 시 받은 ID
+        output_format: 출력 형식 - "markdown"(기본), "csv", "json-compact" (짧은 키, 소수점 4자리, 설명 문장 없음)
+        
+    Returns:
+        진행 상태 또는 완료된 결과
+    """
+    try:
+        format_error = check_output_format(output_format)
+        if format_error:
+            return format_error
+        
+        job = await client.get_job(job_id)
+        if job["status"] != "succeeded":
+            return format_job_status(job)
+        
+        result = await client.get_job_result(job_id)
+        if job["kind"] == "bootstrap":
+            return format_bootstrap_result(result, output_format)
+        if output_format != FORMAT_MARKDOWN:
+            return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+        
+        return f"작업 완료 ({job['kind']}, {job['elapsed_seconds']}초)\n\n{json.dumps(result, ensure_ascii=False, indent=2)}"
+        
+    except Exception as e:
+        return f"작업 조회 실패: {str(e)}"
+
 @mcp.tool()
 async def get_data_overview() -> str:
     """
@@ -638,6 +1718,27 @@ async def get_data_overview() -> str:
     except Exception as e:
         return f"데이터 현황 조회 실패: {str(e)}"
 
+@mcp.tool()
+async def get_backend_latency_stats() -> str:
+    """
+    이 MCP 서버가 백엔드에 보낸 요청의 엔드포인트별 지연 시간/재시도/헤징 통계를 조회합니다.
+    
+    Returns:
+        엔드포인트별 요청 수, 오류/재시도/헤징 횟수, p50/p95/p99 지연 시간(ms) 표
+    """
+    stats = client.client.get_stats()
+    if not stats:
+        return "아직 백엔드 호출 기록이 없습니다."
+    
+    output = ["| Endpoint | Requests | Errors | Retries | Hedges (wins) | p50 | p95 | p99 |"]
+    output.append("|----------|----------|--------|---------|---------------|-----|-----|-----|")
+    for endpoint, item in stats.items():
+        output.append(
+            f"| {endpoint} | {item['requests']} | {item['errors']} | {item['retries']} | "
+            f"{item['hedges']} ({item['hedge_wins']}) | {item['p50_ms']} | {item['p95_ms']} | {item['p99_ms']} |"
+        )
+    return "\n".join(output)
+
 if __name__ == "__main__":
     # MCP 서버 실행
     mcp.run()
\ No newline at end of file
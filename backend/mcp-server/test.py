@@ -6,9 +6,10 @@ FastAPI 백엔드와 연동하여 AI 모델들의 벤치마크 성능을 분석
 
 import asyncio
 from typing import List, Dict, Any, Optional
-import httpx
 from mcp.server.fastmcp import FastMCP
 
+from eval_client import ResilientClient
+
 # MCP 서버 초기화
 mcp = FastMCP("ai-evaluation-server")
 
@@ -20,7 +21,7 @@ class AIEvaluationClient:
     
     def __init__(self, base_url: str = BACKEND_URL):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(base_url = self.base_url, timeout=30.0)
+        self.client = ResilientClient(self.base_url)
     
     async def get_models(self) -> List[str]:
         """사용 가능한 모델 목록 조회"""
@@ -53,7 +54,7 @@ class AIEvaluationClient:
             "metadata_level": metadata_level or []
         }
         
-        response = await self.client.post("/analysis", json=payload)
+        response = await self.client.post("/analysis", json=payload, idempotent=True, hedge=True)
         response.raise_for_status()
         return response.json()
 
@@ -1,13 +1,41 @@
+import argparse
 import json
 import os
+import re
 import mysql.connector
 from mysql.connector import Error
 from typing import Dict, List, Any
 import logging
+from collections import Counter
 from datetime import datetime
 from dotenv import load_dotenv
 
 
+# 선택지 응답 편향 집계 대상 벤치마크와 메타데이터 컬럼 (객관식 벤치마크만)
+CHOICE_METADATA_COLUMNS = {
+    'mmlu': ['difficulty', 'business_category', 'subject', 'category', 'knowledge_source'],
+    'mmlu-redux': ['difficulty', 'business_category', 'subject', 'category', 'cultural_context'],
+    'mmlu-pro': ['difficulty', 'business_category', 'subject', 'category', 'complexity', 'interdisciplinary'],
+    'ds-mmlu': ['difficulty', 'business_category', 'subject', 'category', 'industry_relevance'],
+    'hle': ['difficulty', 'business_category', 'category', 'philosophical_domain', 'consensus_level', 'complexity'],
+    'gpqa': ['difficulty', 'business_category', 'subject', 'category']
+}
+CHOICE_LETTERS = 'ABCDEFGHIJ'
+
+# 결과 테이블이 있는 벤치마크 (--backfill 대상)
+RESULT_BENCHMARKS = ['aime', 'mmlu', 'mmlu-redux', 'mmlu-pro', 'math500', 'ds-mmlu', 'hle', 'gpqa']
+
+# 응답 텍스트 통계 (적재 시 한 번만 계산하여 좁은 컬럼에 저장)
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+STEP_PATTERN = re.compile(r"^\s*(?:step\s*\d+|\d+[.)]|[-*\u2022])\s", re.IGNORECASE | re.MULTILINE)
+REFUSAL_PATTERN = re.compile(
+    r"\b(?:i\s+(?:cannot|can't|can not|won't|am unable to|'m unable to)\s+(?:help|answer|assist|provide|comply)"
+    r"|as an ai\b)|답변(?:을|해)?\s*드릴\s*수\s*없|도와\s*드릴\s*수\s*없",
+    re.IGNORECASE
+)
+RESPONSE_LENGTH_BUCKETS = [(128, '<128'), (512, '128-512'), (2048, '512-2k'), (8192, '2k-8k')]
+
+
 class JSONToMySQLMigrator:
     def __init__(self, host = 'localhost', port=3306, user = 'root', password='',database = 'ai_evaluation'):
 
@@ -66,6 +94,34 @@ class JSONToMySQLMigrator:
         }
         return table_mapping.get(benchmark, f"{benchmark}_results")
 
+    @staticmethod
+    def compute_response_stats(response: Any, filtered_resps: Any) -> Dict[str, Any]:
+        """응답 텍스트에서 수치 통계 추출 (길이, 토큰 수, 줄 수, 추론 단계 수, 거부 여부)"""
+        text = str(response or '')
+        tokens = len(TOKEN_PATTERN.findall(text))
+
+        # 번호/글머리/Step 표시 줄 수, 없으면 빈 줄로 구분된 문단 수를 추론 단계로 사용
+        steps = len(STEP_PATTERN.findall(text))
+        if steps == 0:
+            steps = len([block for block in re.split(r"\n\s*\n", text) if block.strip()])
+
+        bucket = '8k+'
+        for upper, label in RESPONSE_LENGTH_BUCKETS:
+            if tokens < upper:
+                bucket = label
+                break
+
+        extracted = str(filtered_resps or '').strip()
+        return {
+            'response_chars': len(text),
+            'response_tokens': tokens,
+            'response_lines': text.count('\n') + 1 if text else 0,
+            'reasoning_steps': min(steps, 32767),
+            'is_refusal': bool(REFUSAL_PATTERN.search(text)),
+            'resps_extracted': bool(extracted) and extracted.lower() not in ('none', '[invalid]', 'null'),
+            'response_length_bucket': bucket
+        }
+
     def prepare_data_for_insert(self, data: Dict[str, Any], benchmark: str, model_name: str) -> tuple:
         """ 데이터를 MySQL INSERT용으로 변환"""
 
@@ -84,6 +140,7 @@ class JSONToMySQLMigrator:
             'business_category': data.get('business', ''), # 오타 유지
             'user_prompt0': data.get('user_prompt0', '')
         }
+        base_data.update(self.compute_response_stats(base_data['response'], base_data['filtered_resps']))
 
         # 벤치마크별 특화 데이터 추가
         if benchmark == 'aime':
@@ -204,7 +261,10 @@ class JSONToMySQLMigrator:
                 _, values = self.prepare_data_for_insert(data, benchmark, model_name)
                 values_list.append(values)
 
+            # autocommit 연결이므로 결과 행과 선택지 집계를 한 트랜잭션으로 묶음
+            self.connection.start_transaction()
             self.cursor.executemany(query, values_list)
+            self.update_choice_counts(benchmark, model_name, columns, values_list)
             self.connection.commit()
             self.logger.info(f"{table_name}에 {len(values_list)}개 레코드 삽입 완료")
 
@@ -216,6 +276,138 @@ class JSONToMySQLMigrator:
             return 0     
 
 
+    @staticmethod
+    def normalize_choice_benchmark(benchmark: str) -> str:
+        """선택지 집계용 벤치마크명 정규화 (ds_mmlu -> ds-mmlu)"""
+        return 'ds-mmlu' if benchmark == 'ds_mmlu' else benchmark
+
+    @staticmethod
+    def normalize_choice(value: Any) -> str:
+        """선택지 문자 정규화 - A~J 한 글자가 아니면 '-' (추출 실패)"""
+        letter = str(value or '').strip().upper()
+        return letter if len(letter) == 1 and letter in CHOICE_LETTERS else '-'
+
+    def update_choice_counts(self, benchmark: str, model_name: str, columns: List[str], values_list: List[List[Any]]):
+        """적재 배치의 (정답, 선택 응답) 개수를 answer_choice_counts에 누적"""
+        benchmark = self.normalize_choice_benchmark(benchmark)
+        if benchmark not in CHOICE_METADATA_COLUMNS:
+            return
+        metadata_columns = [col for col in CHOICE_METADATA_COLUMNS[benchmark] if col in columns]
+
+        counts = Counter()
+        for values in values_list:
+            row = dict(zip(columns, values))
+            answer = self.normalize_choice(row.get('answer'))
+            if answer == '-':
+                continue
+            chosen = self.normalize_choice(row.get('filtered_resps'))
+
+            # metadata_column = '' 은 전체 집계
+            counts[('', '', answer, chosen)] += 1
+            for col in metadata_columns:
+                if row.get(col) is None or row.get(col) == '':
+                    continue
+                counts[(col, str(row[col]), answer, chosen)] += 1
+
+        if not counts:
+            return
+
+        query = """
+        INSERT INTO answer_choice_counts
+            (benchmark, model_name, metadata_column, metadata_value, answer, chosen, cnt)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE cnt = cnt + VALUES(cnt)
+        """
+        self.cursor.executemany(query, [
+            (benchmark, model_name, col, value, answer, chosen, cnt)
+            for (col, value, answer, chosen), cnt in counts.items()
+        ])
+
+    def rebuild_choice_counts(self, benchmark: str):
+        """이미 적재된 결과 테이블로부터 선택지 집계 재계산 (기존 데이터 백필용)"""
+        benchmark = self.normalize_choice_benchmark(benchmark)
+        if benchmark not in CHOICE_METADATA_COLUMNS:
+            self.logger.warning(f"선택지 집계 대상이 아닌 벤치마크: {benchmark}")
+            return
+
+        table_name = self.get_table_name(benchmark)
+        answer_expr = "UPPER(TRIM(answer))"
+        chosen_expr = (
+            "CASE WHEN CHAR_LENGTH(TRIM(filtered_resps)) = 1 "
+            "AND LOCATE(UPPER(TRIM(filtered_resps)), 'ABCDEFGHIJ') > 0 "
+            "THEN UPPER(TRIM(filtered_resps)) ELSE '-' END"
+        )
+        answer_filter = f"CHAR_LENGTH(TRIM(answer)) = 1 AND LOCATE({answer_expr}, 'ABCDEFGHIJ') > 0"
+
+        try:
+            # autocommit 연결이므로 명시적 트랜잭션으로 묶어야 실패 시 DELETE까지 롤백됨
+            self.connection.start_transaction()
+            self.cursor.execute("DELETE FROM answer_choice_counts WHERE benchmark = %s", (benchmark,))
+
+            # 전체 집계('') + 메타데이터 컬럼별 집계
+            groupings = [("''", "''", answer_filter)] + [
+                (f"'{col}'", f"CAST({col} AS CHAR)", f"{answer_filter} AND {col} IS NOT NULL AND {col} <> ''")
+                for col in CHOICE_METADATA_COLUMNS[benchmark]
+            ]
+            for column_literal, value_expr, where_clause in groupings:
+                self.cursor.execute(f"""
+                INSERT INTO answer_choice_counts
+                    (benchmark, model_name, metadata_column, metadata_value, answer, chosen, cnt)
+                SELECT %s, model_name, {column_literal}, {value_expr}, {answer_expr}, {chosen_expr}, COUNT(*)
+                FROM {table_name}
+                WHERE {where_clause}
+                GROUP BY model_name, {value_expr}, {answer_expr}, {chosen_expr}
+                """, (benchmark,))
+
+            self.connection.commit()
+            self.logger.info(f"{benchmark} 선택지 집계 재계산 완료")
+        except Error as e:
+            self.logger.error(f"선택지 집계 재계산 실패 ({benchmark}): {e}")
+            self.connection.rollback()
+
+    def backfill_response_stats(self, benchmark: str, batch_size: int = 1000):
+        """이미 적재된 행의 응답 텍스트 통계 채우기 (response_stats.sql 적용 후 1회 실행)"""
+        table_name = self.get_table_name(benchmark)
+        stat_columns = list(self.compute_response_stats('', '').keys())
+        update_query = (
+            f"UPDATE {table_name} SET "
+            + ', '.join(f"{col} = %s" for col in stat_columns)
+            + " WHERE id = %s"
+        )
+
+        last_id = 0
+        updated = 0
+        read_cursor = self.connection.cursor()
+        try:
+            while True:
+                read_cursor.execute(
+                    f"""SELECT id, response, filtered_resps FROM {table_name}
+                    WHERE id > %s AND response_chars IS NULL ORDER BY id LIMIT %s""",
+                    (last_id, batch_size)
+                )
+                rows = read_cursor.fetchall()
+                if not rows:
+                    break
+
+                values_list = []
+                for row_id, response, filtered_resps in rows:
+                    stats = self.compute_response_stats(response, filtered_resps)
+                    values_list.append([stats[col] for col in stat_columns] + [row_id])
+
+                self.cursor.executemany(update_query, values_list)
+                self.connection.commit()
+                updated += len(values_list)
+                last_id = rows[-1][0]
+
+            self.logger.info(f"{table_name} 응답 통계 백필 완료: {updated}개 행")
+        except Error as e:
+            self.logger.error(f"응답 통계 백필 실패 ({table_name}): {e}")
+            self.connection.rollback()
+        finally:
+            read_cursor.close()
+
+        return updated
+
     def migrate_single_file(self, file_path: str, model_name: str, benchmark_name: str) -> int:
         """단일 JSON 파일 이관"""
         try:
@@ -284,6 +476,13 @@ class JSONToMySQLMigrator:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 JSON -> MySQL 이관")
+    parser.add_argument('--backfill', action='store_true',
+                        help="JSON 이관 없이 이미 적재된 DB의 응답 텍스트 통계와 선택지 집계(answer_choice_counts)만 채움")
+    parser.add_argument('--benchmark', action='append', choices=RESULT_BENCHMARKS,
+                        help="--backfill 대상 벤치마크 (생략 시 전체)")
+    args = parser.parse_args()
+
     # MySQL 연결 정보 (실제 값으로 변경하세요)
     config = {"host":'localhost',
         "port":3306,
@@ -298,6 +497,14 @@ def main():
         return
 
     try:
+        if args.backfill:
+            # 기존 DB 백필 (집계 테이블 도입 전에 적재된 데이터)
+            for benchmark in args.benchmark or RESULT_BENCHMARKS:
+                migrator.backfill_response_stats(benchmark)
+                if benchmark in CHOICE_METADATA_COLUMNS:
+                    migrator.rebuild_choice_counts(benchmark)
+            return
+
         # 데이터 이관
         print("JSON 파일 이관을 시작합니다...")
         migrator.migrate_all_files('/home/kimhc/deep_eval_agent_project/database/data/real_data/model_response')
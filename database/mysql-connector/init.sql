@@ -16,9 +16,18 @@ CREATE TABLE aime_results (
     match_score DECIMAL(3,2) NOT NULL,
     difficulty ENUM('Easy', 'Medium', 'Hard', 'Very Hard', 'Extreme') DEFAULT 'Medium',
     business_category VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_difficulty (difficulty),
     INDEX idx_data_id (data_id)
 );
@@ -42,9 +51,18 @@ CREATE TABLE mmlu_results (
     subject VARCHAR(100),
     category ENUM('STEM', 'Humanities', 'Social Science', 'Other'),
     knowledge_source VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_subject (subject),
     INDEX idx_category (category),
     INDEX idx_knowledge_source (knowledge_source)
@@ -69,9 +87,18 @@ CREATE TABLE mmlu_redux_results (
     subject VARCHAR(100),
     category ENUM('STEM', 'Humanities', 'Social Science', 'Other'),
     cultural_context VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_cultural_context (cultural_context)
 );
 
@@ -95,9 +122,18 @@ CREATE TABLE mmlu_pro_results (
     category ENUM('STEM', 'Humanities', 'Social Science', 'Other'),
     complexity ENUM('Basic', 'Intermediate', 'Advanced'),
     interdisciplinary VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_interdisciplinary (interdisciplinary),
     INDEX idx_complexity (complexity)
 );
@@ -122,9 +158,18 @@ CREATE TABLE math500_results (
     level VARCHAR(50),
     proof_required BOOLEAN,
     theorem_dependency VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_topic (topic),
     INDEX idx_level (level),
     INDEX idx_proof_required (proof_required)
@@ -149,9 +194,18 @@ CREATE TABLE ds_mmlu_results (
     subject VARCHAR(100),
     category VARCHAR(50) DEFAULT 'Semiconductor Engineering',
     industry_relevance VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_subject (subject),
     INDEX idx_industry_relevance (industry_relevance)
 );
@@ -183,9 +237,18 @@ CREATE TABLE hle_results (
     philosophical_domain VARCHAR(50),
     consensus_level VARCHAR(50),
     complexity_breakdown JSON,  -- Dict 메타데이터
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_category (category),
     INDEX idx_philosophical_domain (philosophical_domain),
     INDEX idx_consensus_level (consensus_level)
@@ -267,9 +330,18 @@ CREATE TABLE gpqa_results (
     business_category VARCHAR(50),
     subject VARCHAR(100),
     category VARCHAR(50),
+    response_chars INT,
+    response_tokens INT,
+    response_lines INT,
+    reasoning_steps SMALLINT,
+    is_refusal BOOLEAN,
+    resps_extracted BOOLEAN,
+    response_length_bucket VARCHAR(10),
     user_prompt0 TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_model (model_name),
+    INDEX idx_data_model (data_id, model_name),
+    INDEX idx_response_length_bucket (response_length_bucket),
     INDEX idx_subject (subject),
     INDEX idx_category (category)
 );
@@ -339,4 +411,18 @@ SELECT
     COUNT(*) as total_questions,
     AVG(match_score) as avg_score,
     SUM(CASE WHEN match_score = 1.0 THEN 1 ELSE 0 END) as correct_answers
-FROM gpqa_results GROUP BY model_name;
\ No newline at end of file
+FROM gpqa_results GROUP BY model_name;
+
+-- 9. Answer Choice Counts Table (선택지 응답 편향 분석용 집계)
+-- 적재 시점에 모델 x 벤치마크 x 메타데이터 x 정답 x 선택 응답별 개수를 누적
+-- metadata_column = '' 인 행은 메타데이터 구분 없는 전체 집계, chosen = '-' 는 선택지 추출 실패
+CREATE TABLE answer_choice_counts (
+    benchmark VARCHAR(20) NOT NULL,
+    model_name VARCHAR(50) NOT NULL,
+    metadata_column VARCHAR(50) NOT NULL,
+    metadata_value VARCHAR(100) NOT NULL,
+    answer CHAR(1) NOT NULL,
+    chosen CHAR(1) NOT NULL,
+    cnt INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (benchmark, metadata_column, model_name, metadata_value, answer, chosen)
+);
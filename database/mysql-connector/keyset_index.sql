@@ -0,0 +1,14 @@
+-- keyset_index.sql - 문항 드릴다운 키셋 페이지네이션용 복합 인덱스 추가 마이그레이션
+-- POST /analysis/questions 는 (data_id, model_name, id) 순서로 정렬/탐색하므로 이 인덱스가 있어야 (id는 InnoDB 보조 인덱스에 포함)
+-- 뒤쪽 페이지도 첫 페이지와 같은 속도로 조회됩니다. (init.sql로 새로 생성한 DB에는 이미 포함)
+
+USE ai_evaluation;
+
+ALTER TABLE aime_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE mmlu_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE mmlu_redux_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE mmlu_pro_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE math500_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE ds_mmlu_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE hle_results ADD INDEX idx_data_model (data_id, model_name);
+ALTER TABLE gpqa_results ADD INDEX idx_data_model (data_id, model_name);
@@ -0,0 +1,53 @@
+-- response_stats.sql - 응답 텍스트 통계 컬럼 추가 마이그레이션
+-- 기존 DB에 적용한 뒤 `python json_to_db.py --backfill`로 값을 채웁니다.
+-- (init.sql로 새로 생성한 DB에는 이미 포함되어 있음)
+
+USE ai_evaluation;
+
+ALTER TABLE aime_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE mmlu_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE mmlu_redux_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE mmlu_pro_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE math500_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE ds_mmlu_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE hle_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
+
+ALTER TABLE gpqa_results
+    ADD COLUMN response_chars INT, ADD COLUMN response_tokens INT, ADD COLUMN response_lines INT,
+    ADD COLUMN reasoning_steps SMALLINT, ADD COLUMN is_refusal BOOLEAN, ADD COLUMN resps_extracted BOOLEAN,
+    ADD COLUMN response_length_bucket VARCHAR(10),
+    ADD INDEX idx_response_length_bucket (response_length_bucket);
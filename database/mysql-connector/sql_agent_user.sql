@@ -0,0 +1,15 @@
+-- sql_agent_user.sql - SQL 에이전트(POST /sql) 전용 읽기 계정 생성
+-- api-server는 에이전트 쿼리를 주 DB 계정(MYSQL_USER) 대신 이 계정(MYSQL_SQL_USER, MYSQL_SQL_PASSWORD)으로 실행합니다.
+-- sql_guard 검증을 우회하는 쿼리가 있더라도 결과 테이블 외의 데이터(mysql.user, information_schema 등)는 읽을 수 없도록
+-- 결과 테이블 SELECT 권한만 부여합니다. 비밀번호는 실제 값으로 바꿔 실행하세요.
+
+CREATE USER IF NOT EXISTS 'ai_eval_sql_reader'@'%' IDENTIFIED BY 'change-me';
+
+GRANT SELECT ON ai_evaluation.aime_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.mmlu_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.mmlu_redux_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.mmlu_pro_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.math500_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.ds_mmlu_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.hle_results TO 'ai_eval_sql_reader'@'%';
+GRANT SELECT ON ai_evaluation.gpqa_results TO 'ai_eval_sql_reader'@'%';